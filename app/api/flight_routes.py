@@ -1,13 +1,16 @@
 """
 Endpoints de API relacionados con vuelos
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import time
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Dict, Any, Optional
 from app import schemas
-from app.models import Vuelo, EstadoVuelo
-from app.db import get_db
-from app.services import flight_service, linked_list
+from app.models import Vuelo
+from app.db import get_db, get_async_db
+from app.services import flight_service, async_flight_service
 
 router = APIRouter()
 
@@ -22,10 +25,8 @@ def create_vuelo(vuelo: schemas.VueloCreate, db: Session = Depends(get_db)):
     """
     try:
         vuelo_db = flight_service.create_flight(db, vuelo)
-        if vuelo.estado == EstadoVuelo.EMERGENCIA:
-            linked_list.add_first(db, vuelo_db)
-        else:
-            linked_list.add_last(db, vuelo_db)
+        # Al final del carril de su estado; las emergencias, al principio del suyo (el primero)
+        flight_service.add_flight_to_list(db, vuelo_db)
         
         db.commit()
         return vuelo_db
@@ -35,18 +36,59 @@ def create_vuelo(vuelo: schemas.VueloCreate, db: Session = Depends(get_db)):
             detail=f"Error al crear vuelo: {str(e)}"
         )
 
+@router.post("/vuelos/bulk", response_model=schemas.ImportacionVuelosResponse)
+def create_vuelos_bulk(vuelos: List[schemas.VueloCreate], lista_id: int = 1, db: Session = Depends(get_db)):
+    """
+    CREA MUCHOS VUELOS DE UNA VEZ Y LOS AÑADE A LA LISTA.
+    
+    Los vuelos se validan por lotes (estado conocido, códigos no repetidos ni
+    existentes) y, si todos son válidos, se insertan con una inserción por
+    lotes en una única transacción, al final del carril de su estado.
+    Si alguno no es válido no se inserta ninguno (422 con los errores por fila).
+    """
+    try:
+        start = time.perf_counter()
+        if not flight_service.list_exists(db, lista_id):
+            raise HTTPException(status_code=404, detail="Lista de vuelos no encontrada")
+        
+        valores, errores = flight_service.validate_flights(db, (vuelo.dict() for vuelo in vuelos))
+        if errores:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=[{"fila": fila, "error": motivo} for fila, motivo in errores]
+            )
+        
+        ids = flight_service.bulk_create_flights(db, valores, lista_id)
+        db.commit()
+        segundos = time.perf_counter() - start
+        return {
+            "filas": len(vuelos),
+            "insertados": len(ids),
+            "segundos": segundos,
+            "filas_por_segundo": len(vuelos) / segundos if segundos > 0 else 0.0,
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error en la carga masiva de vuelos: {str(e)}"
+        )
+
 @router.get("/vuelos/total", response_model=Dict[str, int])
 def get_total_flights(lista_id: int = 1, db: Session = Depends(get_db)):
     """
     RETORNA EL NÚMERO TOTAL DE VUELOS EN COLA.
     """
     try:
-        lista = flight_service.get_list_by_id(db, lista_id)
-        if not lista:
+        # Con la lista en memoria se responde sin consultar la BD
+        if not flight_service.list_exists(db, lista_id):
             raise HTTPException(status_code=404, detail="Lista de vuelos no encontrada")
         
-        total = linked_list.get_length(lista)
+        total = flight_service.get_list_length(db, lista_id)
         return {"total": total}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -59,11 +101,10 @@ def get_next_flight(lista_id: int = 1, db: Session = Depends(get_db)):
     RETORNA EL PRIMER VUELO SIN REMOVER.
     """
     try:
-        lista = flight_service.get_list_by_id(db, lista_id)
-        if not lista:
+        if not flight_service.list_exists(db, lista_id):
             raise HTTPException(status_code=404, detail="Lista de vuelos no encontrada")
         
-        vuelo = linked_list.get_first(lista)
+        vuelo = flight_service.get_first_flight_in_order(db, lista_id)
         if not vuelo:
             raise HTTPException(status_code=404, detail="No hay vuelos en la lista")
         
@@ -82,11 +123,10 @@ def get_last_flight(lista_id: int = 1, db: Session = Depends(get_db)):
     RETORNA EL ÚLTIMO VUELO SIN REMOVER.
     """
     try:
-        lista = flight_service.get_list_by_id(db, lista_id)
-        if not lista:
+        if not flight_service.list_exists(db, lista_id):
             raise HTTPException(status_code=404, detail="Lista de vuelos no encontrada")
         
-        vuelo = linked_list.get_last(lista)
+        vuelo = flight_service.get_last_flight_in_order(db, lista_id)
         if not vuelo:
             raise HTTPException(status_code=404, detail="No hay vuelos en la lista")
         
@@ -99,17 +139,53 @@ def get_last_flight(lista_id: int = 1, db: Session = Depends(get_db)):
             detail=f"Error al obtener último vuelo: {str(e)}"
         )
 
+@router.patch("/vuelos/reordenar", response_model=schemas.VueloResponse)
+def reorder_flight(from_pos: int, to_pos: int, lista_id: int = 1, db: Session = Depends(get_db)):
+    """
+    MUEVE EL VUELO DE LA POSICIÓN from_pos A LA POSICIÓN to_pos.
+    
+    El nodo se reenlaza sin sacar el vuelo de la lista y solo se actualiza su
+    clave de orden. La posición destino se acota al carril de prioridad del vuelo.
+    """
+    try:
+        if not flight_service.list_exists(db, lista_id):
+            raise HTTPException(status_code=404, detail="Lista de vuelos no encontrada")
+        
+        vuelo = flight_service.move_flight(db, lista_id, from_pos, to_pos)
+        if not vuelo:
+            raise HTTPException(status_code=404, detail=f"No hay ningún vuelo en la posición {from_pos}")
+        
+        db.commit()
+        return vuelo
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al reordenar vuelo: {str(e)}"
+        )
+
 # Endpoint para obtener todos los vuelos de la base de datos
 @router.get("/vuelos", response_model=List[schemas.VueloResponse])
-def read_vuelos(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+async def read_vuelos(response: Response, skip: int = 0, limit: int = 100, after_id: Optional[int] = None,
+                      db: AsyncSession = Depends(get_async_db)):
     """
     OBTIENE TODOS LOS VUELOS DE LA BASE DE DATOS.
     
     Este endpoint muestra todos los vuelos existentes en la base de datos,
     independientemente de si están asociados a alguna lista o no.
+    
+    Con after_id (0 para la primera página) pagina por clave: devuelve los
+    vuelos con ID mayor que after_id y cuesta lo mismo en cualquier página.
+    Si puede haber más, la cabecera X-Next-After-Id trae el after_id de la siguiente.
     """
     try:
-        vuelos = flight_service.get_all_flights(db, skip, limit)
+        if after_id is None:
+            return await async_flight_service.get_all_flights(db, skip, limit)
+        
+        vuelos = await async_flight_service.get_flights_after(db, after_id, limit)
+        if vuelos and len(vuelos) == limit:
+            response.headers["X-Next-After-Id"] = str(vuelos[-1].id)
         return vuelos
     except Exception as e:
         raise HTTPException(
@@ -117,6 +193,17 @@ def read_vuelos(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
             detail=f"Error al obtener vuelos de la base de datos: {str(e)}"
         )
 
+@router.get("/vuelos/exportar", response_class=StreamingResponse)
+async def export_vuelos(after_id: Optional[int] = None):
+    """
+    EXPORTA TODOS LOS VUELOS COMO NDJSON (UN VUELO JSON POR LÍNEA) POR ORDEN DE ID.
+    
+    Las filas se leen del cursor por bloques mientras se envían, así que la
+    memoria del servidor no depende del tamaño de la tabla. Con after_id se
+    reanuda una exportación interrumpida tras el último ID recibido.
+    """
+    return StreamingResponse(async_flight_service.export_flights_ndjson(after_id), media_type="application/x-ndjson")
+
 @router.get("/vuelos/visualizar", response_model=Dict[str, Any])
 def visualize_flight_list(lista_id: int = 1, db: Session = Depends(get_db)):
     """
@@ -132,14 +219,8 @@ def visualize_flight_list(lista_id: int = 1, db: Session = Depends(get_db)):
         if not lista:
             raise HTTPException(status_code=404, detail=f"Lista con ID {lista_id} no encontrada")
         
-        # Obtener la instancia en memoria de la lista
-        memoria_lista = LinkedListManager.get_list_instance(db, lista_id)
-        
-        # Crear la visualización
-        representacion = memoria_lista.visualize()
-        
-        # Obtener datos adicionales para mostrar
-        vuelos_en_lista = linked_list.get_all_flights(lista)
+        # Representación y vuelos obtenidos bajo el mismo cerrojo de lectura
+        representacion, vuelos_en_lista = LinkedListManager.visualize(db, lista_id)
         
         return {
             "representacion_texto": representacion,
@@ -154,9 +235,9 @@ def visualize_flight_list(lista_id: int = 1, db: Session = Depends(get_db)):
                 } for idx, v in enumerate(vuelos_en_lista)
             ],
             "estructura": {
-                "head": memoria_lista.head.data.codigo if memoria_lista.head else None,
-                "tail": memoria_lista.tail.data.codigo if memoria_lista.tail else None,
-                "size": memoria_lista.size()
+                "head": vuelos_en_lista[0].codigo if vuelos_en_lista else None,
+                "tail": vuelos_en_lista[-1].codigo if vuelos_en_lista else None,
+                "size": len(vuelos_en_lista)
             }
         }
     except HTTPException:
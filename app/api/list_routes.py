@@ -1,23 +1,49 @@
 """
 Endpoints para gestión de listas de vuelos
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from typing import Dict, Any, List
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, Any, List, Literal, Optional, Union
 from app import schemas
-from app.db import get_db
-from app.services import flight_service, linked_list
+from app.db import get_db, get_async_db
+from app.services import flight_service, linked_list, async_flight_service
+from app.services.flight_service import InvalidCursorError
+from app.services.linked_list_manager import BatchOperationError, LinkedListManager
+from app.services.list_feed import CLOSED, RELOAD
 
 router = APIRouter()
 
-@router.get("/listas", response_model=List[schemas.ListaVuelosResponse])
-def get_all_lists(db: Session = Depends(get_db)):
+# El resumen va primero: una lista con vuelos no tiene total ni por_estado
+@router.get("/listas", response_model=Union[List[schemas.ListaVuelosResumen], List[schemas.ListaVuelosResponse]])
+async def get_all_lists(skip: int = 0, limit: int = 100, resumen: bool = False,
+                        db: AsyncSession = Depends(get_async_db)):
     """
-    OBTIENE TODAS LAS LISTAS DE VUELOS.
+    OBTIENE TODAS LAS LISTAS DE VUELOS (PAGINADAS CON skip Y limit).
+    
+    Con resumen=true devuelve en lugar de los vuelos cuántos hay de cada
+    estado en cada lista, calculado con un único GROUP BY.
     """
-    from app.models import ListaVuelos
-    listas = db.query(ListaVuelos).all()
-    return listas
+    try:
+        if resumen:
+            return await async_flight_service.get_list_summaries(db, skip, limit)
+        return await async_flight_service.get_all_lists(db, skip, limit)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al obtener las listas: {str(e)}"
+        )
+
+@router.get("/cache/listas", response_model=Dict[str, Optional[int]])
+def get_cache_stats():
+    """
+    OBTIENE LAS ESTADÍSTICAS DE LA CACHÉ DE LISTAS EN MEMORIA.
+    (LISTAS CARGADAS, MEMORIA ESTIMADA, ACIERTOS, FALLOS Y DESALOJOS)
+    """
+    from app.services.linked_list_manager import LinkedListManager
+    return LinkedListManager.cache_stats()
 
 @router.post("/listas", response_model=schemas.ListaVuelosResponse)
 def create_list(nombre: str = "Lista de vuelos", db: Session = Depends(get_db)):
@@ -34,7 +60,12 @@ def create_list(nombre: str = "Lista de vuelos", db: Session = Depends(get_db)):
 @router.post("/listas/{lista_id}/vuelos/{vuelo_id}/inicio", status_code=status.HTTP_200_OK)
 def add_vuelo_inicio(lista_id: int, vuelo_id: int, db: Session = Depends(get_db)):
     """
-    AÑADE UN VUELO EXISTENTE AL PRINCIPIO DE UNA LISTA.
+    AÑADE UN VUELO EXISTENTE AL PRINCIPIO DEL CARRIL DE SU ESTADO.
+    
+    La lista se mantiene ordenada por prioridad: el vuelo queda delante de
+    los de su carril pero detrás de los de carriles más prioritarios, así que
+    solo queda a la cabeza de la lista si es una emergencia (o no hay vuelos
+    más prioritarios).
     """
     try:
         lista = flight_service.get_list_by_id(db, lista_id)
@@ -47,7 +78,7 @@ def add_vuelo_inicio(lista_id: int, vuelo_id: int, db: Session = Depends(get_db)
         
         nodo = linked_list.add_first(db, lista, vuelo)
         db.commit()
-        return {"mensaje": f"Vuelo {vuelo.codigo} añadido al inicio de la lista"}
+        return {"mensaje": f"Vuelo {vuelo.codigo} añadido al inicio de su carril"}
     except HTTPException:
         raise
     except Exception as e:
@@ -59,7 +90,10 @@ def add_vuelo_inicio(lista_id: int, vuelo_id: int, db: Session = Depends(get_db)
 @router.post("/listas/{lista_id}/vuelos/{vuelo_id}/final", status_code=status.HTTP_200_OK)
 def add_vuelo_final(lista_id: int, vuelo_id: int, db: Session = Depends(get_db)):
     """
-    AÑADE UN VUELO EXISTENTE AL FINAL DE UNA LISTA.
+    AÑADE UN VUELO EXISTENTE AL FINAL DEL CARRIL DE SU ESTADO.
+    
+    El vuelo queda detrás de los de su carril pero delante de los de
+    carriles menos prioritarios.
     """
     try:
         lista = flight_service.get_list_by_id(db, lista_id)
@@ -72,7 +106,7 @@ def add_vuelo_final(lista_id: int, vuelo_id: int, db: Session = Depends(get_db))
         
         nodo = linked_list.add_last(db, lista, vuelo)
         db.commit()
-        return {"mensaje": f"Vuelo {vuelo.codigo} añadido al final de la lista"}
+        return {"mensaje": f"Vuelo {vuelo.codigo} añadido al final de su carril"}
     except HTTPException:
         raise
     except Exception as e:
@@ -81,6 +115,215 @@ def add_vuelo_final(lista_id: int, vuelo_id: int, db: Session = Depends(get_db))
             detail=f"Error al añadir vuelo al final: {str(e)}"
         )
 
+@router.delete("/listas/{lista_id}/vuelos/{vuelo_id}", status_code=status.HTTP_200_OK)
+def remove_vuelo_de_lista(lista_id: int, vuelo_id: int, db: Session = Depends(get_db)):
+    """
+    QUITA UN VUELO DE UNA LISTA (EL VUELO SIGUE EXISTIENDO EN LA BASE DE DATOS).
+    """
+    try:
+        lista = flight_service.get_list_by_id(db, lista_id)
+        if not lista:
+            raise HTTPException(status_code=404, detail="Lista no encontrada")
+        
+        vuelo = linked_list.remove_flight(db, lista, vuelo_id)
+        if not vuelo:
+            raise HTTPException(status_code=404, detail="El vuelo no está en la lista")
+        
+        db.commit()
+        return {"mensaje": f"Vuelo {vuelo.codigo} quitado de la lista"}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al quitar vuelo de la lista: {str(e)}"
+        )
+
+@router.get("/listas/{lista_id}/vuelos", response_model=schemas.VentanaVuelosResponse)
+def get_vuelos_lista(lista_id: int, cursor: Optional[str] = None, limit: int = Query(100, ge=1, le=1000),
+                     direction: Literal["forward", "backward"] = "forward", db: Session = Depends(get_db)):
+    """
+    RECORRE UNA LISTA POR PÁGINAS EN ORDEN, HACIA DELANTE O HACIA ATRÁS.
+    
+    Sin cursor empieza por el principio (forward) o por el final (backward)
+    de la lista; cada respuesta trae en siguiente el cursor de la página
+    siguiente en la misma dirección. Cada página cuesta lo mismo por profunda
+    que sea. Los vuelos de cada página van en el orden de la lista.
+    """
+    try:
+        ventana = flight_service.get_list_window(db, lista_id, cursor, limit, direction == "forward")
+        if ventana is None:
+            raise HTTPException(status_code=404, detail="Lista no encontrada")
+        
+        vuelos, siguiente = ventana
+        return {"vuelos": vuelos, "siguiente": siguiente}
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Cursor no válido: {str(e)}")
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al recorrer la lista: {str(e)}"
+        )
+
+@router.get("/listas/{lista_id}/vuelos/{vuelo_id}/posicion", response_model=Dict[str, int])
+def get_posicion_vuelo(lista_id: int, vuelo_id: int, db: Session = Depends(get_db)):
+    """
+    OBTIENE LA POSICIÓN DE UN VUELO DENTRO DE UNA LISTA.
+    """
+    try:
+        lista = flight_service.get_list_by_id(db, lista_id)
+        if not lista:
+            raise HTTPException(status_code=404, detail="Lista no encontrada")
+        
+        posicion = linked_list.get_position(db, lista, vuelo_id)
+        if posicion < 0:
+            raise HTTPException(status_code=404, detail="El vuelo no está en la lista")
+        
+        return {"posicion": posicion}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al obtener posición del vuelo: {str(e)}"
+        )
+
+@router.patch("/listas/{lista_id}/vuelos/{vuelo_id}/mover", response_model=schemas.VueloResponse)
+def mover_vuelo(lista_id: int, vuelo_id: int, antes_de: Optional[int] = None, db: Session = Depends(get_db)):
+    """
+    MUEVE UN VUELO JUSTO ANTES DEL VUELO antes_de (O AL FINAL DE SU CARRIL SI SE OMITE).
+    
+    Si antes_de pertenece a otro carril de prioridad, el vuelo queda en el
+    extremo de su carril más próximo a él.
+    """
+    try:
+        if not flight_service.list_exists(db, lista_id):
+            raise HTTPException(status_code=404, detail="Lista no encontrada")
+        
+        vuelo = flight_service.move_flight_before(db, lista_id, vuelo_id, antes_de)
+        if not vuelo:
+            raise HTTPException(status_code=404, detail="El vuelo o el vuelo de referencia no está en la lista")
+        
+        db.commit()
+        return vuelo
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al mover vuelo: {str(e)}"
+        )
+
+@router.post("/listas/{lista_id}/operaciones", response_model=schemas.OperacionesListaResponse)
+def aplicar_operaciones(lista_id: int, operaciones: List[schemas.OperacionLista], db: Session = Depends(get_db)):
+    """
+    APLICA EN ORDEN UN LOTE DE OPERACIONES SOBRE UNA LISTA, TODAS O NINGUNA.
+
+    Operaciones: add_first y add_last (vuelo_id), insert_at (vuelo_id,
+    position), remove_at (position) y move (from_pos, to_pos), con la misma
+    semántica que sus endpoints individuales. Se aplican bajo un único
+    cerrojo y en una única transacción: si alguna falla (422 con su índice)
+    no se aplica ninguna, ni en la BD ni en la lista en memoria.
+    """
+    try:
+        if not flight_service.list_exists(db, lista_id):
+            raise HTTPException(status_code=404, detail="Lista no encontrada")
+
+        vuelos = flight_service.apply_list_operations(db, lista_id, [operacion.dict() for operacion in operaciones])
+        total = flight_service.get_list_length(db, lista_id)
+        db.commit()
+        return {"total": total, "vuelos": vuelos}
+    except BatchOperationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=[{"operacion": e.index, "op": e.op, "error": e.reason}]
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al aplicar las operaciones: {str(e)}"
+        )
+
+@router.get("/listas/{lista_id}/cambios", response_model=schemas.CambiosListaResponse)
+def get_cambios_lista(lista_id: int, desde: Optional[int] = None, epoca: Optional[str] = None,
+                      db: Session = Depends(get_db)):
+    """
+    OBTIENE LOS CAMBIOS DE UNA LISTA POSTERIORES A LA SECUENCIA desde.
+    
+    Para clientes que sincronizan sin WebSocket: devuelve los mismos eventos
+    que /listas/{lista_id}/eventos y la secuencia (seq) y época (epoca) que
+    se pasan en la siguiente petición. Si desde es demasiado antiguo, hubo
+    una recarga o la época no coincide, devuelve resincronizar=true con la
+    lista completa en vuelos.
+    """
+    try:
+        cambios = flight_service.get_list_changes(db, lista_id, desde, epoca)
+        if cambios is None:
+            raise HTTPException(status_code=404, detail="Lista no encontrada")
+        return cambios
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al obtener los cambios de la lista: {str(e)}"
+        )
+
+@router.websocket("/listas/{lista_id}/eventos")
+async def eventos_lista(websocket: WebSocket, lista_id: int):
+    """
+    ENVÍA LOS CAMBIOS DE UNA LISTA EN CUANTO SE CONFIRMAN.
+    
+    Primero envía la lista completa ({"tipo": "instantanea", "seq", "vuelos"})
+    y después un evento por cambio con su número de secuencia: insertado
+    (posicion, vuelo), eliminado (id, posicion), movido (id, desde, hasta) y
+    actualizado (vuelo, desde, hasta). Cuando los cambios no se pueden
+    describir uno a uno (altas masivas, priorización, transacciones deshechas)
+    vuelve a enviar la lista completa. Si la lista no existe cierra con 4404.
+    """
+    await websocket.accept()
+    subscription = LinkedListManager.subscribe(lista_id, asyncio.get_running_loop())
+    
+    async def wait_disconnect():
+        # Lo único que envía el cliente es el cierre; despierta al bucle de envío
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+        LinkedListManager.unsubscribe(subscription)
+    
+    receiver = asyncio.create_task(wait_disconnect())
+    try:
+        snapshot = await run_in_threadpool(flight_service.get_list_snapshot, lista_id)
+        if snapshot is None:
+            await websocket.close(code=4404, reason="Lista no encontrada")
+            return
+        seq, text = snapshot
+        await websocket.send_text(text)
+        
+        while True:
+            event_seq, message = await subscription.get()
+            if message == CLOSED:
+                break
+            if message == RELOAD:
+                if event_seq <= seq:
+                    # La instantánea ya enviada es posterior
+                    continue
+                snapshot = await run_in_threadpool(flight_service.get_list_snapshot, lista_id)
+                if snapshot is None:
+                    await websocket.close(code=4404, reason="Lista no encontrada")
+                    break
+                seq, text = snapshot
+                await websocket.send_text(text)
+            elif event_seq > seq:
+                # Los anteriores ya estaban en la instantánea
+                await websocket.send_text(message)
+    finally:
+        receiver.cancel()
+        LinkedListManager.unsubscribe(subscription)
+
 @router.post("/listas/{lista_id}/priorizar")
 def priorizar_vuelos(lista_id: int, db: Session = Depends(get_db)):
     """
@@ -1,2 +1,2 @@
-from app.db.session import get_db, SessionLocal
+from app.db.session import get_db, SessionLocal, get_async_db, AsyncSessionLocal
 from app.db.config import create_tables
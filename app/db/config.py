@@ -1,14 +1,146 @@
-from sqlalchemy import create_engine
+import os
+from typing import Any, Dict, Mapping
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from app.models.Base import Base
 
+# Las variables de un fichero .env se suman a las del entorno (sin sobrescribirlas)
+load_dotenv()
+
+# Perfiles de motor: pragmas de SQLite que se aplican a cada conexión nueva
+# y tamaño del pool. Lo que no aparece conserva el valor por defecto
+PROFILES: Dict[str, Dict[str, Any]] = {
+    # Diario DELETE y synchronous=FULL: un escritor bloquea a los lectores
+    # y cada commit hace fsync del diario y de la BD
+    "default": {},
+    # WAL: los lectores leen la última versión confirmada mientras otro
+    # escribe; con synchronous=NORMAL solo se hace fsync en los checkpoints.
+    # Un corte de luz puede perder las últimas transacciones, no corromper la BD
+    "throughput": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 256 * 1024 * 1024,
+        "cache_size": -64 * 1024,  # negativo: en KiB (64 MiB por conexión)
+        "busy_timeout": 5000,      # ms que se espera un cerrojo antes de "database is locked"
+        "pool_size": 10,
+        "max_overflow": 20,
+    },
+}
+
+# Variable de entorno que sobrescribe cada ajuste del perfil
+SETTING_VARIABLES = {
+    "journal_mode": "SQLITE_JOURNAL_MODE",
+    "synchronous": "SQLITE_SYNCHRONOUS",
+    "mmap_size": "SQLITE_MMAP_SIZE",
+    "cache_size": "SQLITE_CACHE_SIZE",
+    "busy_timeout": "SQLITE_BUSY_TIMEOUT",
+    "pool_size": "DB_POOL_SIZE",
+    "max_overflow": "DB_MAX_OVERFLOW",
+}
+JOURNAL_MODES = ("DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF")
+SYNCHRONOUS_MODES = ("OFF", "NORMAL", "FULL", "EXTRA")
+PRAGMAS = ("journal_mode", "synchronous", "mmap_size", "cache_size", "busy_timeout")
+
+def load_settings(environ: Mapping[str, str] = os.environ) -> Dict[str, Any]:
+    """
+    Ajustes del motor: el perfil DB_PROFILE (default si no se indica) con
+    los valores que sobrescriban las variables de SETTING_VARIABLES.
+    Lanza ValueError si el perfil o algún valor no es válido.
+    """
+    profile = environ.get("DB_PROFILE", "default").strip().lower()
+    if profile not in PROFILES:
+        raise ValueError(f"DB_PROFILE no válido: {profile} (perfiles: {', '.join(PROFILES)})")
+    settings = dict(PROFILES[profile])
+
+    for setting, variable in SETTING_VARIABLES.items():
+        value = environ.get(variable, "").strip()
+        if not value:
+            continue
+        if setting in ("journal_mode", "synchronous"):
+            value = value.upper()
+            allowed = JOURNAL_MODES if setting == "journal_mode" else SYNCHRONOUS_MODES
+            if value not in allowed:
+                raise ValueError(f"{variable} no válido: {value} (valores: {', '.join(allowed)})")
+        else:
+            try:
+                value = int(value)
+            except ValueError:
+                raise ValueError(f"{variable} debe ser un número entero: {value}")
+        settings[setting] = value
+    return settings
+
+def set_sqlite_pragmas(engine: Engine, settings: Dict[str, Any]) -> None:
+    """Aplica los pragmas de settings a cada conexión que abra el motor (síncrono o el de un AsyncEngine)"""
+    pragmas = [(name, settings[name]) for name in PRAGMAS if settings.get(name) is not None]
+    if not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas:
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+def pool_options(settings: Dict[str, Any]) -> Dict[str, int]:
+    """Argumentos del pool de conexiones que fija el perfil"""
+    return {name: settings[name] for name in ("pool_size", "max_overflow") if settings.get(name) is not None}
+
+def make_engine(url: str, settings: Dict[str, Any]) -> Engine:
+    """Crea un motor síncrono de SQLite con los ajustes indicados"""
+    engine = create_engine(url, connect_args={"check_same_thread": False}, **pool_options(settings))
+    set_sqlite_pragmas(engine, settings)
+    return engine
+
+def make_async_engine(url: str, settings: Dict[str, Any]) -> AsyncEngine:
+    """Crea un motor asíncrono (aiosqlite) con los ajustes indicados"""
+    engine = create_async_engine(url, **pool_options(settings))
+    set_sqlite_pragmas(engine.sync_engine, settings)
+    return engine
+
+# Ajustes del motor leídos del entorno
+DB_SETTINGS = load_settings()
+
 # Configura la URL de la base de datos
-SQLALCHEMY_DATABASE_URL = "sqlite:///./airport.db"
+SQLALCHEMY_DATABASE_URL = os.environ.get("DATABASE_URL", "sqlite:///./airport.db")
 
 # Crea el motor de la base de datos
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
+engine = make_engine(SQLALCHEMY_DATABASE_URL, DB_SETTINGS)
+
+# La misma BD con el driver asíncrono (aiosqlite) para los endpoints async:
+# mientras esperan a SQLite no ocupan un hilo del pool de FastAPI
+SQLALCHEMY_ASYNC_DATABASE_URL = SQLALCHEMY_DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://", 1)
+async_engine = make_async_engine(SQLALCHEMY_ASYNC_DATABASE_URL, DB_SETTINGS)
+
+# Columnas añadidas a los modelos después de la primera versión, con el DDL
+# que las añade a una BD creada antes (create_all no altera tablas existentes)
+ADDED_COLUMNS: Dict[str, Dict[str, str]] = {
+    "vuelos": {"orden": "FLOAT"},
+    "listas_vuelos": {"version": "INTEGER NOT NULL DEFAULT 0"},
+}
+
+def add_missing_columns(bind: Engine) -> None:
+    """Añade a las tablas existentes las columnas de ADDED_COLUMNS que les falten"""
+    inspector = inspect(bind)
+    with bind.begin() as connection:
+        for table, columns in ADDED_COLUMNS.items():
+            if not inspector.has_table(table):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table)}
+            for name, ddl in columns.items():
+                if name not in existing:
+                    connection.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}")
 
 # Función para crear todas las tablas
 def create_tables():
     Base.metadata.create_all(bind=engine)
+    # Las columnas nuevas van antes que los índices, que pueden usarlas
+    add_missing_columns(engine)
+    # create_all no añade a una tabla existente los índices definidos después
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
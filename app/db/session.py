@@ -1,13 +1,28 @@
 from sqlalchemy.orm import sessionmaker
-from app.db.config import engine
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from app.db.config import engine, async_engine
+from app.repositories.unit_of_work import unit_of_work
 
-# Crea una SessionLocal para manejar las sesiones de la base de datos
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Crea una SessionLocal para manejar las sesiones de la base de datos.
+# Los vuelos de las listas en memoria sobreviven a la sesión que los cargó,
+# así que no se expiran al confirmar (evita recargarlos y DetachedInstanceError)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
-# Función para obtener una sesión de base de datos
+# Función para obtener una sesión de base de datos: cada petición es una
+# unidad de trabajo con un único commit al final (rollback si falla)
 def get_db():
     db = SessionLocal()
     try:
-        yield db
+        with unit_of_work(db):
+            yield db
     finally:
         db.close()
+
+# Sesiones asíncronas para los endpoints de solo lectura (async def)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# Función para obtener una sesión asíncrona: solo lee, así que no abre
+# una unidad de trabajo; al cerrarla se devuelve la conexión al pool
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
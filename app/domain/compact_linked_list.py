@@ -0,0 +1,336 @@
+"""
+Implementación compacta de la lista doblemente enlazada
+
+En lugar de un objeto Node por elemento, los enlaces prev/next se guardan
+en columnas array('i') indexadas por slot y los datos en una lista de
+referencias. Los slots liberados se encadenan en una free-list para
+reutilizarlos, de modo que la memoria por vuelo queda en unas decenas de bytes.
+"""
+from array import array
+from typing import TypeVar, Generic, Optional, List, Iterator, Dict, Tuple
+from app.models import Vuelo
+from app.domain.memory_linked_list import MemoryLinkedList, FlightKey
+
+T = TypeVar('T', bound=Vuelo)
+
+# Marca de "sin enlace" en las columnas prev/next
+NIL = -1
+
+class CompactLinkedList(Generic[T]):
+    """
+    Lista doblemente enlazada respaldada por arrays
+
+    Expone la misma API que MemoryLinkedList. Los nodos son slots
+    (enteros) y no objetos, por lo que no hay atributos head/tail de
+    tipo Node: se usan get_first/get_last.
+    """
+    def __init__(self):
+        self._next = array('i')
+        self._prev = array('i')
+        self._data: List[Optional[T]] = []
+        self._head = NIL
+        self._tail = NIL
+        self._free = NIL
+        self._size = 0
+        # Índice hash clave -> slot para localizar vuelos en O(1)
+        self._index: Dict[FlightKey, int] = {}
+
+    # --- Gestión de slots ---
+
+    def _alloc(self, data: T) -> int:
+        """Obtiene un slot libre (de la free-list o ampliando los arrays)"""
+        if self._free != NIL:
+            slot = self._free
+            self._free = self._next[slot]
+            self._data[slot] = data
+            self._next[slot] = NIL
+            self._prev[slot] = NIL
+        else:
+            slot = len(self._data)
+            self._data.append(data)
+            self._next.append(NIL)
+            self._prev.append(NIL)
+
+        for key in MemoryLinkedList._keys_of(data):
+            self._index[key] = slot
+        return slot
+
+    def _release(self, slot: int) -> T:
+        """Devuelve un slot ya desenlazado a la free-list"""
+        data = self._data[slot]
+        for key in MemoryLinkedList._keys_of(data):
+            if self._index.get(key) == slot:
+                del self._index[key]
+
+        self._data[slot] = None
+        self._prev[slot] = NIL
+        self._next[slot] = self._free
+        self._free = slot
+        return data
+
+    def _link_before(self, slot: int, successor: int) -> None:
+        """Enlaza un slot antes de successor (o al final si es NIL)"""
+        if successor == NIL:
+            self._prev[slot] = self._tail
+            if self._tail != NIL:
+                self._next[self._tail] = slot
+            else:
+                self._head = slot
+            self._tail = slot
+        else:
+            predecessor = self._prev[successor]
+            self._prev[slot] = predecessor
+            self._next[slot] = successor
+            if predecessor != NIL:
+                self._next[predecessor] = slot
+            else:
+                self._head = slot
+            self._prev[successor] = slot
+        self._size += 1
+
+    def _detach(self, slot: int) -> None:
+        """Saca un slot de la cadena prev/next en O(1) sin liberarlo"""
+        predecessor = self._prev[slot]
+        successor = self._next[slot]
+        if predecessor != NIL:
+            self._next[predecessor] = successor
+        else:
+            self._head = successor
+        if successor != NIL:
+            self._prev[successor] = predecessor
+        else:
+            self._tail = predecessor
+        self._prev[slot] = NIL
+        self._next[slot] = NIL
+        self._size -= 1
+
+    def _unlink_slot(self, slot: int) -> T:
+        """Desenlaza un slot de la lista en O(1) y lo libera"""
+        self._detach(slot)
+        return self._release(slot)
+
+    def _slot_at(self, position: int) -> int:
+        """Devuelve el slot de una posición recorriendo desde el extremo más cercano"""
+        if position < 0 or position >= self._size:
+            return NIL
+
+        if position <= self._size // 2:
+            slot = self._head
+            for _ in range(position):
+                slot = self._next[slot]
+        else:
+            slot = self._tail
+            for _ in range(self._size - 1 - position):
+                slot = self._prev[slot]
+        return slot
+
+    # --- API pública (misma que MemoryLinkedList) ---
+
+    def size(self) -> int:
+        return self._size
+
+    def is_empty(self) -> bool:
+        return self._size == 0
+
+    def add_first(self, data: T) -> None:
+        """Añade un elemento al inicio de la lista"""
+        self._link_before(self._alloc(data), self._head)
+
+    def add_last(self, data: T) -> None:
+        """Añade un elemento al final de la lista"""
+        self._link_before(self._alloc(data), NIL)
+
+    def insert_at(self, position: int, data: T) -> None:
+        """Inserta un elemento en una posición específica"""
+        if position <= 0:
+            self.add_first(data)
+            return
+
+        if position >= self._size:
+            self.add_last(data)
+            return
+
+        self._link_before(self._alloc(data), self._slot_at(position))
+
+    def remove_first(self) -> Optional[T]:
+        """Elimina y devuelve el primer elemento"""
+        if self.is_empty():
+            return None
+        return self._unlink_slot(self._head)
+
+    def remove_last(self) -> Optional[T]:
+        """Elimina y devuelve el último elemento"""
+        if self.is_empty():
+            return None
+        return self._unlink_slot(self._tail)
+
+    def remove_at(self, position: int) -> Optional[T]:
+        """Elimina y devuelve el elemento en una posición específica"""
+        if position < 0 or self.is_empty():
+            return None
+
+        if position >= self._size - 1:
+            return self.remove_last()
+
+        return self._unlink_slot(self._slot_at(position))
+
+    def move(self, from_pos: int, to_pos: int) -> Optional[T]:
+        """
+        Mueve el elemento de from_pos para que quede en to_pos (acotada a la
+        lista) reenlazando su slot. Devuelve el elemento movido.
+        """
+        if from_pos < 0 or from_pos >= self._size:
+            return None
+
+        to_pos = min(max(to_pos, 0), self._size - 1)
+        slot = self._slot_at(from_pos)
+        if to_pos != from_pos:
+            # Al sacar el slot, los que van detrás suben una posición
+            successor = self._slot_at(to_pos + 1 if to_pos > from_pos else to_pos)
+            self._detach(slot)
+            self._link_before(slot, successor)
+        return self._data[slot]
+
+    def move_before(self, key: FlightKey, anchor: Optional[FlightKey]) -> bool:
+        """
+        Mueve el vuelo con esa clave justo antes del vuelo anchor (al final si
+        es None) en O(1). Devuelve False si alguno no está.
+        """
+        slot = self._index.get(key, NIL)
+        successor = self._index.get(anchor, NIL) if anchor is not None else NIL
+        if slot == NIL or (anchor is not None and successor == NIL):
+            return False
+
+        if successor != slot:
+            self._detach(slot)
+            self._link_before(slot, successor)
+        return True
+
+    def get_first(self) -> Optional[T]:
+        """Devuelve el primer elemento sin eliminarlo"""
+        return self._data[self._head] if self._head != NIL else None
+
+    def get_last(self) -> Optional[T]:
+        """Devuelve el último elemento sin eliminarlo"""
+        return self._data[self._tail] if self._tail != NIL else None
+
+    def get_at(self, position: int) -> Optional[T]:
+        """Devuelve el elemento en una posición específica sin eliminarlo"""
+        slot = self._slot_at(position)
+        return self._data[slot] if slot != NIL else None
+
+    def get_range(self, position: int, count: int) -> List[T]:
+        """Devuelve hasta count elementos a partir de una posición"""
+        elements = []
+        slot = self._slot_at(position) if count > 0 else NIL
+        while slot != NIL and len(elements) < count:
+            elements.append(self._data[slot])
+            slot = self._next[slot]
+        return elements
+
+    def walk(self, start: Optional[FlightKey], count: int, forward: bool = True) -> List[T]:
+        """
+        Devuelve hasta count elementos desde el vuelo con clave start (incluido)
+        siguiendo _next, o _prev si no es forward; sin start empieza en la
+        cabeza (o en la cola). O(count); [] si start no está.
+        """
+        if start is None:
+            slot = self._head if forward else self._tail
+        else:
+            slot = self._index.get(start, NIL)
+        links = self._next if forward else self._prev
+        elements = []
+        while slot != NIL and len(elements) < count:
+            elements.append(self._data[slot])
+            slot = links[slot]
+        return elements
+
+    def get_all(self) -> List[T]:
+        """Retorna todos los elementos de la lista"""
+        return list(self)
+
+    def __iter__(self) -> Iterator[T]:
+        """Permite iterar sobre los elementos de la lista"""
+        slot = self._head
+        while slot != NIL:
+            yield self._data[slot]
+            slot = self._next[slot]
+
+    # --- Acceso por clave ---
+
+    def contains(self, key: FlightKey) -> bool:
+        """Indica si un vuelo (por id o código) está en la lista, en O(1)"""
+        return key in self._index
+
+    def find(self, key: FlightKey) -> Optional[T]:
+        """Devuelve el vuelo con esa clave (id o código) sin recorrer la lista"""
+        slot = self._index.get(key)
+        return self._data[slot] if slot is not None else None
+
+    def remove(self, key: FlightKey) -> Optional[T]:
+        """Elimina y devuelve el vuelo con esa clave (id o código) en O(1)"""
+        slot = self._index.get(key)
+        return self._unlink_slot(slot) if slot is not None else None
+
+    def neighbors(self, key: FlightKey) -> Tuple[Optional[T], Optional[T]]:
+        """Devuelve los elementos anterior y siguiente al vuelo con esa clave"""
+        slot = self._index.get(key)
+        if slot is None:
+            return None, None
+        predecessor = self._prev[slot]
+        successor = self._next[slot]
+        return (self._data[predecessor] if predecessor != NIL else None,
+                self._data[successor] if successor != NIL else None)
+
+    def replace(self, key: FlightKey, data: T) -> bool:
+        """Sustituye los datos del slot con esa clave sin moverlo"""
+        slot = self._index.get(key)
+        if slot is None:
+            return False
+
+        for old_key in MemoryLinkedList._keys_of(self._data[slot]):
+            if self._index.get(old_key) == slot:
+                del self._index[old_key]
+        self._data[slot] = data
+        for new_key in MemoryLinkedList._keys_of(data):
+            self._index[new_key] = slot
+        return True
+
+    def position_of(self, key: FlightKey) -> int:
+        """Devuelve la posición del vuelo con esa clave, o -1 si no está"""
+        slot = self._index.get(key)
+        if slot is None:
+            return -1
+
+        position = 0
+        slot = self._prev[slot]
+        while slot != NIL:
+            position += 1
+            slot = self._prev[slot]
+        return position
+
+    def visualize(self) -> str:
+        """
+        Genera una representación visual de la lista enlazada.
+        """
+        if self.is_empty():
+            return "[Lista vacía]"
+
+        result = []
+        result.append(f"Lista (tamaño: {self._size})")
+        result.append("HEAD")
+
+        slot = self._head
+        position = 0
+        while slot != NIL:
+            prev_arrow = "←" if self._prev[slot] != NIL else "×"
+            next_arrow = "→" if self._next[slot] != NIL else "×"
+
+            vuelo = self._data[slot]
+            result.append(f"{position}: {prev_arrow} [{vuelo.codigo}: {vuelo.estado.name}] {next_arrow}")
+
+            slot = self._next[slot]
+            position += 1
+
+        result.append("TAIL")
+        return "\n".join(result)
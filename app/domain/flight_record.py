@@ -0,0 +1,76 @@
+"""
+Copia inmutable de los datos de un vuelo para las listas en memoria
+
+Las listas guardan FlightRecord en lugar de instancias ORM: no dependen de
+ninguna sesión (no hay instancias desligadas ni recargas), ocupan menos y
+leer sus atributos no pasa por la instrumentación de SQLAlchemy.
+"""
+from datetime import datetime
+from typing import Any, Dict, Optional
+from app.models import Vuelo, EstadoVuelo
+
+# Asignación que salta el __setattr__ inmutable (solo al construir)
+_set_attr = object.__setattr__
+
+class FrozenSlots:
+    """
+    Base de los valores inmutables con __slots__: los atributos se fijan al
+    construirlos y replace() devuelve una copia con cambios
+    """
+    __slots__ = ()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} es inmutable; usa replace()")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} es inmutable")
+
+    @classmethod
+    def from_values(cls, values: Dict[str, Any]):
+        """Crea el valor a partir de sus atributos por nombre (p. ej. una fila de la BD)"""
+        instance = object.__new__(cls)
+        for name in cls.__slots__:
+            _set_attr(instance, name, values[name])
+        return instance
+
+    def replace(self, **changes: Any):
+        """Devuelve una copia con esos atributos cambiados"""
+        copy = object.__new__(type(self))
+        for name in self.__slots__:
+            _set_attr(copy, name, changes[name] if name in changes else getattr(self, name))
+        return copy
+
+
+class FlightRecord(FrozenSlots):
+    """
+    Datos de un vuelo (mismos atributos que las columnas de Vuelo).
+    Los esquemas de respuesta lo serializan igual que un Vuelo.
+    """
+    __slots__ = ("id", "codigo", "origen", "destino", "hora", "aerolinea",
+                 "puerta_embarque", "estado", "lista_vuelos_id", "orden")
+
+    def __init__(self, id: int, codigo: Optional[str], origen: Optional[str], destino: Optional[str],
+                 hora: Optional[datetime], aerolinea: Optional[str], puerta_embarque: Optional[str],
+                 estado: EstadoVuelo, lista_vuelos_id: Optional[int], orden: Optional[float]):
+        _set_attr(self, "id", id)
+        _set_attr(self, "codigo", codigo)
+        _set_attr(self, "origen", origen)
+        _set_attr(self, "destino", destino)
+        _set_attr(self, "hora", hora)
+        _set_attr(self, "aerolinea", aerolinea)
+        _set_attr(self, "puerta_embarque", puerta_embarque)
+        _set_attr(self, "estado", estado)
+        _set_attr(self, "lista_vuelos_id", lista_vuelos_id)
+        _set_attr(self, "orden", orden)
+
+    @classmethod
+    def of(cls, vuelo: Vuelo) -> "FlightRecord":
+        """Copia los datos de un vuelo (instancia ORM u otro registro)"""
+        return cls(*(getattr(vuelo, name) for name in cls.__slots__))
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Valores de los atributos por nombre"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return f"FlightRecord(id={self.id}, codigo='{self.codigo}', estado='{self.estado.name}')"
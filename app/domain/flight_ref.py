@@ -0,0 +1,28 @@
+"""
+Referencia ligera a un vuelo para las listas en memoria con nodos por ID
+"""
+from typing import Optional
+from app.models import Vuelo, EstadoVuelo
+from app.domain.flight_record import FrozenSlots, _set_attr
+
+class FlightRef(FrozenSlots):
+    """
+    Lo mínimo de un vuelo que necesita la lista para ordenarlo: su ID (clave
+    del índice), el estado (carril) y la clave de orden. Sin código la lista
+    solo se indexa por ID: los códigos se buscan en la BD. El resto de datos
+    se cargan de la BD solo cuando se leen.
+    """
+    __slots__ = ("id", "estado", "orden")
+
+    def __init__(self, id: int, estado: EstadoVuelo, orden: Optional[float]):
+        _set_attr(self, "id", id)
+        _set_attr(self, "estado", estado)
+        _set_attr(self, "orden", orden)
+
+    @classmethod
+    def of(cls, vuelo: Vuelo) -> "FlightRef":
+        """Crea la referencia de un vuelo"""
+        return cls(vuelo.id, vuelo.estado, vuelo.orden)
+
+    def __repr__(self) -> str:
+        return f"FlightRef(id={self.id})"
@@ -10,6 +10,8 @@ class Node(Generic[T]):
     """
     Nodo para lista doblemente enlazada implementado en memoria
     """
+    __slots__ = ('data', 'next', 'prev')
+    
     def __init__(self, data: T):
         self.data = data
         self.next: Optional[Node[T]] = None
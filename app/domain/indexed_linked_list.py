@@ -0,0 +1,254 @@
+"""
+Implementación en memoria de una lista doblemente enlazada indexada
+
+Además de los enlaces prev/next, cada nodo forma parte de un árbol
+(treap implícito) aumentado con el tamaño de cada subárbol. Así las
+operaciones por posición (get_at, insert_at, remove_at) son O(log n)
+esperado en lugar de recorrer la lista desde head.
+"""
+import random
+from typing import TypeVar, Optional, Tuple
+from app.models import Vuelo
+from app.domain.in_memory_node import Node
+from app.domain.memory_linked_list import MemoryLinkedList, FlightKey
+
+T = TypeVar('T', bound=Vuelo)
+
+class IndexedNode(Node[T]):
+    """
+    Nodo de la lista que además es nodo del árbol de estadísticos de orden
+    """
+    __slots__ = ('left', 'right', 'parent', 'priority', 'count')
+
+    def __init__(self, data: T):
+        super().__init__(data)
+        self.left: Optional[IndexedNode[T]] = None
+        self.right: Optional[IndexedNode[T]] = None
+        self.parent: Optional[IndexedNode[T]] = None
+        self.priority = random.random()
+        self.count = 1
+
+
+def _count(node: Optional[IndexedNode]) -> int:
+    return node.count if node else 0
+
+
+class IndexedLinkedList(MemoryLinkedList[T]):
+    """
+    Lista doblemente enlazada con acceso por posición en O(log n)
+
+    Expone la misma API que MemoryLinkedList. El recorrido secuencial
+    (get_all, __iter__, visualize) sigue usando los enlaces prev/next.
+    """
+    def __init__(self):
+        super().__init__()
+        self._root: Optional[IndexedNode[T]] = None
+
+    # --- Operaciones internas del árbol ---
+
+    def _node_at(self, position: int) -> Optional[IndexedNode[T]]:
+        """Devuelve el nodo en una posición descendiendo por el árbol"""
+        if position < 0 or position >= self._size:
+            return None
+
+        current = self._root
+        while current:
+            left_size = _count(current.left)
+            if position < left_size:
+                current = current.left
+            elif position == left_size:
+                return current
+            else:
+                position -= left_size + 1
+                current = current.right
+        return None
+
+    def _index_of(self, node: IndexedNode[T]) -> int:
+        """Calcula la posición de un nodo subiendo hasta la raíz"""
+        index = _count(node.left)
+        current = node
+        while current.parent:
+            if current.parent.right is current:
+                index += _count(current.parent.left) + 1
+            current = current.parent
+        return index
+
+    def _rotate_up(self, node: IndexedNode[T]) -> None:
+        """Rota un nodo por encima de su padre manteniendo los tamaños"""
+        parent = node.parent
+        grandparent = parent.parent
+
+        if parent.left is node:
+            moved = node.right
+            parent.left = moved
+            node.right = parent
+        else:
+            moved = node.left
+            parent.right = moved
+            node.left = parent
+
+        if moved:
+            moved.parent = parent
+        parent.parent = node
+        node.parent = grandparent
+
+        if grandparent is None:
+            self._root = node
+        elif grandparent.left is parent:
+            grandparent.left = node
+        else:
+            grandparent.right = node
+
+        parent.count = 1 + _count(parent.left) + _count(parent.right)
+        node.count = 1 + _count(node.left) + _count(node.right)
+
+    def _insert_before(self, new_node: IndexedNode[T], successor: Optional[IndexedNode[T]]) -> None:
+        """
+        Inserta un nodo antes de successor (o al final si es None),
+        tanto en la cadena prev/next como en el árbol
+        """
+        # Enlazar en la lista
+        if successor is None:
+            new_node.prev = self.tail
+            if self.tail:
+                self.tail.next = new_node
+            else:
+                self.head = new_node
+            self.tail = new_node
+        else:
+            new_node.prev = successor.prev
+            new_node.next = successor
+            if successor.prev:
+                successor.prev.next = new_node
+            else:
+                self.head = new_node
+            successor.prev = new_node
+
+        # Colgar como hoja: el predecesor en orden nunca tiene hijo derecho
+        if self._root is None:
+            self._root = new_node
+        elif successor is not None and successor.left is None:
+            successor.left = new_node
+            new_node.parent = successor
+        else:
+            predecessor = new_node.prev
+            predecessor.right = new_node
+            new_node.parent = predecessor
+
+        current = new_node.parent
+        while current:
+            current.count += 1
+            current = current.parent
+
+        # Restaurar la propiedad de heap sobre las prioridades
+        while new_node.parent and new_node.priority > new_node.parent.priority:
+            self._rotate_up(new_node)
+
+        self._size += 1
+        self._register(new_node)
+
+    def _unlink_node(self, node: IndexedNode[T]) -> T:
+        """Elimina un nodo de la cadena prev/next y del árbol"""
+        # Bajar el nodo hasta que tenga como máximo un hijo
+        while node.left and node.right:
+            if node.left.priority > node.right.priority:
+                self._rotate_up(node.left)
+            else:
+                self._rotate_up(node.right)
+
+        child = node.left or node.right
+        parent = node.parent
+        if child:
+            child.parent = parent
+        if parent is None:
+            self._root = child
+        elif parent.left is node:
+            parent.left = child
+        else:
+            parent.right = child
+
+        current = parent
+        while current:
+            current.count -= 1
+            current = current.parent
+
+        # Desenlazar de la lista
+        if node.prev:
+            node.prev.next = node.next
+        else:
+            self.head = node.next
+        if node.next:
+            node.next.prev = node.prev
+        else:
+            self.tail = node.prev
+
+        node.prev = node.next = None
+        node.left = node.right = node.parent = None
+        node.count = 1
+        self._size -= 1
+        self._unregister(node)
+        return node.data
+
+    def _move_node(self, node: IndexedNode[T], successor: Optional[IndexedNode[T]]) -> None:
+        """Reubica un nodo antes de successor reutilizándolo, en O(log n)"""
+        self._unlink_node(node)
+        self._insert_before(node, successor)
+
+    def _nodes_at(self, first: int, second: int) -> Tuple[Optional[IndexedNode[T]], Optional[IndexedNode[T]]]:
+        """Devuelve los nodos de dos posiciones descendiendo por el árbol"""
+        return self._node_at(first), self._node_at(second)
+
+    # --- API pública (misma que MemoryLinkedList) ---
+
+    def add_first(self, data: T) -> None:
+        """Añade un elemento al inicio de la lista"""
+        self._insert_before(IndexedNode(data), self.head)
+
+    def add_last(self, data: T) -> None:
+        """Añade un elemento al final de la lista"""
+        self._insert_before(IndexedNode(data), None)
+
+    def insert_at(self, position: int, data: T) -> None:
+        """Inserta un elemento en una posición específica en O(log n)"""
+        if position <= 0:
+            self.add_first(data)
+            return
+
+        if position >= self._size:
+            self.add_last(data)
+            return
+
+        self._insert_before(IndexedNode(data), self._node_at(position))
+
+    def remove_first(self) -> Optional[T]:
+        """Elimina y devuelve el primer elemento"""
+        if self.is_empty():
+            return None
+        return self._unlink_node(self.head)
+
+    def remove_last(self) -> Optional[T]:
+        """Elimina y devuelve el último elemento"""
+        if self.is_empty():
+            return None
+        return self._unlink_node(self.tail)
+
+    def remove_at(self, position: int) -> Optional[T]:
+        """Elimina y devuelve el elemento en una posición específica en O(log n)"""
+        if position < 0 or self.is_empty():
+            return None
+
+        if position >= self._size - 1:
+            return self.remove_last()
+
+        node = self._node_at(position)
+        return self._unlink_node(node) if node else None
+
+    def get_at(self, position: int) -> Optional[T]:
+        """Devuelve el elemento en una posición específica en O(log n)"""
+        node = self._node_at(position)
+        return node.data if node else None
+
+    def position_of(self, key: FlightKey) -> int:
+        """Devuelve la posición del vuelo con esa clave en O(log n), o -1 si no está"""
+        node = self._index.get(key)
+        return self._index_of(node) if node else -1
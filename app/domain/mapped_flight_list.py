@@ -0,0 +1,232 @@
+"""
+Instantánea binaria de una lista de vuelos, legible con mmap
+
+Formato (little-endian):
+    cabecera   HEADER: magia, versión del formato, lista_id, versión de la
+               lista (-1 si no se conoce), número de vuelos y desplazamientos
+               de las tres secciones siguientes
+    registros  un registro de RECORD bytes por vuelo, ordenados por ID para
+               poder buscarlos por bisección
+    orden      array uint32 con el índice del registro de cada posición de la lista
+    cadenas    tabla de cadenas UTF-8 sin separadores; los registros guardan
+               (desplazamiento, longitud) y las cadenas repetidas se guardan una vez
+
+El fichero se escribe en uno temporal y se renombra, así que un lector que
+ya lo tenga mapeado sigue viendo la versión anterior completa.
+"""
+import mmap
+import os
+import struct
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from app.models import Vuelo, EstadoVuelo
+from app.domain.flight_record import FlightRecord
+
+MAGIC = b"AIRLIST\x00"
+FORMAT_VERSION = 1
+
+# magia, formato, lista_id, versión, vuelos, desplazamientos de registros, orden y cadenas
+HEADER = struct.Struct("<8sIqqQQQQ")
+# id, lista_vuelos_id, orden, hora (µs desde EPOCH), estado y cinco cadenas (desplazamiento, longitud)
+RECORD = struct.Struct("<qqdqB" + "IH" * 5)
+ORDER_ITEM = "I"
+
+NULL_INT = -2**63
+NULL_STRING = 0xFFFFFFFF
+EPOCH = datetime(1970, 1, 1)
+
+STRING_FIELDS = ("codigo", "origen", "destino", "aerolinea", "puerta_embarque")
+_STATUSES = list(EstadoVuelo)
+_STATUS_CODE = {estado: i for i, estado in enumerate(_STATUSES)}
+
+
+def write_snapshot(path: str, lista_id: int, version: Optional[int],
+                   flights: Iterable[Union[Vuelo, FlightRecord]]) -> int:
+    """
+    Escribe la instantánea binaria de una lista (en el orden recibido)
+    de forma atómica. Devuelve el número de vuelos escritos.
+    """
+    flights = list(flights)
+    strings = bytearray()
+    string_refs: Dict[str, Tuple[int, int]] = {}
+
+    def intern(value: Optional[str]) -> Tuple[int, int]:
+        if value is None:
+            return NULL_STRING, 0
+        ref = string_refs.get(value)
+        if ref is None:
+            encoded = value.encode("utf-8")
+            ref = string_refs[value] = (len(strings), len(encoded))
+            strings.extend(encoded)
+        return ref
+
+    # Registros por ID; el array de orden conserva el orden de la lista
+    by_id = sorted(range(len(flights)), key=lambda i: flights[i].id)
+    record_index = [0] * len(flights)
+    records = bytearray(RECORD.size * len(flights))
+    for index, position in enumerate(by_id):
+        vuelo = flights[position]
+        record_index[position] = index
+        refs: List[int] = []
+        for field in STRING_FIELDS:
+            refs.extend(intern(getattr(vuelo, field)))
+        RECORD.pack_into(
+            records, index * RECORD.size,
+            vuelo.id,
+            vuelo.lista_vuelos_id if vuelo.lista_vuelos_id is not None else NULL_INT,
+            vuelo.orden if vuelo.orden is not None else float("nan"),
+            (vuelo.hora - EPOCH) // timedelta(microseconds=1) if vuelo.hora else NULL_INT,
+            _STATUS_CODE[vuelo.estado],
+            *refs,
+        )
+
+    order = struct.pack(f"<{len(flights)}{ORDER_ITEM}", *record_index)
+    records_offset = HEADER.size
+    order_offset = records_offset + len(records)
+    strings_offset = order_offset + len(order)
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, lista_id, version if version is not None else -1,
+                         len(flights), records_offset, order_offset, strings_offset)
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as snapshot:
+        snapshot.write(header)
+        snapshot.write(records)
+        snapshot.write(order)
+        snapshot.write(strings)
+        snapshot.flush()
+        os.fsync(snapshot.fileno())
+    os.replace(tmp_path, path)
+    return len(flights)
+
+
+class MappedFlightList:
+    """
+    Lista de vuelos de solo lectura servida directamente desde una instantánea mapeada
+
+    Expone la parte de lectura de la API de MemoryLinkedList. No carga los
+    vuelos en memoria: cada acceso decodifica el registro del fichero
+    mapeado y devuelve un FlightRecord. get_at es O(1) y find por ID es O(log n).
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, format_version, self.lista_id, version, self._size,
+         self._records_offset, order_offset, self._strings_offset) = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or format_version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"{path} no es una instantánea de lista válida")
+
+        self.version = version if version >= 0 else None
+        self._view = memoryview(self._map)
+        self._order = self._view[order_offset:order_offset + 4 * self._size].cast(ORDER_ITEM)
+
+    def close(self) -> None:
+        """Libera el mapeo (los vuelos ya devueltos siguen siendo válidos)"""
+        if getattr(self, "_order", None) is not None:
+            self._order.release()
+            self._view.release()
+            self._order = None
+        if not self._map.closed:
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "MappedFlightList":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    # --- Decodificación ---
+
+    def _string(self, offset: int, length: int) -> Optional[str]:
+        if offset == NULL_STRING:
+            return None
+        start = self._strings_offset + offset
+        return str(self._view[start:start + length], "utf-8")
+
+    def _record(self, index: int) -> Tuple[Any, ...]:
+        return RECORD.unpack_from(self._map, self._records_offset + index * RECORD.size)
+
+    def _row(self, index: int) -> Dict[str, Any]:
+        """Valores de un registro con los nombres de los atributos de Vuelo"""
+        flight_id, lista_id, orden, hora, estado, *refs = self._record(index)
+        row = {
+            "id": flight_id,
+            "lista_vuelos_id": lista_id if lista_id != NULL_INT else None,
+            "orden": orden if orden == orden else None,
+            "hora": EPOCH + timedelta(microseconds=hora) if hora != NULL_INT else None,
+            "estado": _STATUSES[estado],
+        }
+        for i, field in enumerate(STRING_FIELDS):
+            row[field] = self._string(refs[2 * i], refs[2 * i + 1])
+        return row
+
+    def _flight(self, index: int) -> FlightRecord:
+        return FlightRecord.from_values(self._row(index))
+
+    def _index_of_id(self, flight_id: int) -> int:
+        """Índice del registro con ese ID (bisección), o -1"""
+        low, high = 0, self._size
+        while low < high:
+            middle = (low + high) // 2
+            current = struct.unpack_from("<q", self._map, self._records_offset + middle * RECORD.size)[0]
+            if current < flight_id:
+                low = middle + 1
+            elif current > flight_id:
+                high = middle
+            else:
+                return middle
+        return -1
+
+    # --- API de lectura ---
+
+    def size(self) -> int:
+        return self._size
+
+    def is_empty(self) -> bool:
+        return self._size == 0
+
+    def get_at(self, position: int) -> Optional[FlightRecord]:
+        """Devuelve el vuelo en una posición en O(1)"""
+        if position < 0 or position >= self._size:
+            return None
+        return self._flight(self._order[position])
+
+    def get_first(self) -> Optional[FlightRecord]:
+        return self.get_at(0)
+
+    def get_last(self) -> Optional[FlightRecord]:
+        return self.get_at(self._size - 1)
+
+    def get_range(self, position: int, count: int) -> List[FlightRecord]:
+        """Devuelve hasta count vuelos a partir de una posición"""
+        if position < 0 or count <= 0:
+            return []
+        return [self._flight(index) for index in self._order[position:position + count]]
+
+    def get_all(self) -> List[FlightRecord]:
+        return list(self)
+
+    def __iter__(self) -> Iterator[FlightRecord]:
+        for index in self._order:
+            yield self._flight(index)
+
+    def rows(self) -> Iterator[Dict[str, Any]]:
+        """Valores de cada vuelo en el orden de la lista, sin construir los registros"""
+        for index in self._order:
+            yield self._row(index)
+
+    def find(self, key: Union[int, str]) -> Optional[FlightRecord]:
+        """Busca un vuelo por ID en O(log n) o por código recorriendo los registros"""
+        if isinstance(key, int):
+            index = self._index_of_id(key)
+            return self._flight(index) if index >= 0 else None
+
+        for index in range(self._size):
+            if self._string(*self._record(index)[5:7]) == key:
+                return self._flight(index)
+        return None
+
+    def contains(self, key: Union[int, str]) -> bool:
+        return self.find(key) is not None
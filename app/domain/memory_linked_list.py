@@ -1,12 +1,15 @@
 """
 Implementación en memoria de una lista doblemente enlazada
 """
-from typing import TypeVar, Generic, Optional, List, Iterator
+from typing import TypeVar, Generic, Optional, List, Iterator, Dict, Union, Tuple
 from app.models import Vuelo
 from app.domain.in_memory_node import Node
 
 T = TypeVar('T', bound=Vuelo)
 
+# Clave de búsqueda de un vuelo en la lista: su id (int) o su código (str)
+FlightKey = Union[int, str]
+
 class MemoryLinkedList(Generic[T]):
     """
     Lista doblemente enlazada implementada en memoria
@@ -15,6 +18,8 @@ class MemoryLinkedList(Generic[T]):
         self.head: Optional[Node[T]] = None
         self.tail: Optional[Node[T]] = None
         self._size = 0
+        # Índice hash clave -> nodo para localizar vuelos en O(1)
+        self._index: Dict[FlightKey, Node[T]] = {}
     
     def size(self) -> int:
         return self._size
@@ -35,6 +40,7 @@ class MemoryLinkedList(Generic[T]):
             self.head = new_node
         
         self._size += 1
+        self._register(new_node)
     
     def add_last(self, data: T) -> None:
         """Añade un elemento al final de la lista"""
@@ -49,6 +55,7 @@ class MemoryLinkedList(Generic[T]):
             self.tail = new_node
         
         self._size += 1
+        self._register(new_node)
     
     def insert_at(self, position: int, data: T) -> None:
         """Inserta un elemento en una posición específica"""
@@ -80,6 +87,7 @@ class MemoryLinkedList(Generic[T]):
         current.prev = new_node
         
         self._size += 1
+        self._register(new_node)
     
     def remove_first(self) -> Optional[T]:
         """Elimina y devuelve el primer elemento"""
@@ -97,6 +105,7 @@ class MemoryLinkedList(Generic[T]):
                 self.head.prev = None
         
         self._size -= 1
+        self._unregister(removed_node)
         return removed_node.data if removed_node else None
     
     def remove_last(self) -> Optional[T]:
@@ -115,6 +124,7 @@ class MemoryLinkedList(Generic[T]):
                 self.tail.next = None
         
         self._size -= 1
+        self._unregister(removed_node)
         return removed_node.data if removed_node else None
     
     def remove_at(self, position: int) -> Optional[T]:
@@ -144,8 +154,160 @@ class MemoryLinkedList(Generic[T]):
             current.next.prev = current.prev
         
         self._size -= 1
+        self._unregister(current)
         return current.data
     
+    def _register(self, node: Node[T]) -> None:
+        """Añade las claves del vuelo del nodo al índice"""
+        for key in self._keys_of(node.data):
+            self._index[key] = node
+    
+    def _unregister(self, node: Node[T]) -> None:
+        """Quita las claves del vuelo del nodo del índice"""
+        for key in self._keys_of(node.data):
+            # Solo si apunta a este nodo (puede haber duplicados del mismo vuelo)
+            if self._index.get(key) is node:
+                del self._index[key]
+    
+    @staticmethod
+    def _keys_of(data: T) -> List[FlightKey]:
+        """Claves por las que se indexa un vuelo: id y código"""
+        return [key for key in (getattr(data, "id", None), getattr(data, "codigo", None))
+                if key is not None]
+    
+    def _detach(self, node: Node[T]) -> None:
+        """Saca un nodo de la cadena prev/next sin quitarlo del índice"""
+        if node.prev:
+            node.prev.next = node.next
+        else:
+            self.head = node.next
+        if node.next:
+            node.next.prev = node.prev
+        else:
+            self.tail = node.prev
+        
+        node.prev = None
+        node.next = None
+    
+    def _unlink_node(self, node: Node[T]) -> T:
+        """Desenlaza un nodo conocido de la lista en O(1)"""
+        self._detach(node)
+        self._size -= 1
+        self._unregister(node)
+        return node.data
+    
+    def _move_node(self, node: Node[T], successor: Optional[Node[T]]) -> None:
+        """Reenlaza un nodo de la lista antes de successor (o al final si es None) en O(1)"""
+        self._detach(node)
+        if successor is None:
+            node.prev = self.tail
+            if self.tail:
+                self.tail.next = node
+            else:
+                self.head = node
+            self.tail = node
+        else:
+            node.prev = successor.prev
+            node.next = successor
+            if successor.prev:
+                successor.prev.next = node
+            else:
+                self.head = node
+            successor.prev = node
+    
+    def _nodes_at(self, first: int, second: int) -> Tuple[Optional[Node[T]], Optional[Node[T]]]:
+        """Devuelve los nodos de dos posiciones con un único recorrido desde head"""
+        found: Dict[int, Node[T]] = {}
+        current = self.head
+        for position in range(max(first, second) + 1):
+            if current is None:
+                break
+            if position == first or position == second:
+                found[position] = current
+            current = current.next
+        return found.get(first), found.get(second)
+    
+    def move(self, from_pos: int, to_pos: int) -> Optional[T]:
+        """
+        Mueve el elemento de from_pos para que quede en to_pos (acotada a la
+        lista) reenlazando su nodo, sin crear ni destruir nodos. Localiza los
+        dos nodos en un único recorrido. Devuelve el elemento movido.
+        """
+        if from_pos < 0 or from_pos >= self._size:
+            return None
+        
+        to_pos = min(max(to_pos, 0), self._size - 1)
+        # Al sacar el nodo, los que van detrás suben una posición
+        successor_pos = to_pos + 1 if to_pos > from_pos else to_pos
+        node, successor = self._nodes_at(from_pos, successor_pos)
+        if to_pos != from_pos:
+            self._move_node(node, successor)
+        return node.data
+    
+    def move_before(self, key: FlightKey, anchor: Optional[FlightKey]) -> bool:
+        """
+        Mueve el vuelo con esa clave justo antes del vuelo anchor (al final si
+        es None) en O(1) gracias al índice. Devuelve False si alguno no está.
+        """
+        node = self._index.get(key)
+        successor = self._index.get(anchor) if anchor is not None else None
+        if node is None or (anchor is not None and successor is None):
+            return False
+        
+        if successor is not node:
+            self._move_node(node, successor)
+        return True
+    
+    def contains(self, key: FlightKey) -> bool:
+        """Indica si un vuelo (por id o código) está en la lista, en O(1)"""
+        return key in self._index
+    
+    def find(self, key: FlightKey) -> Optional[T]:
+        """Devuelve el vuelo con esa clave (id o código) sin recorrer la lista"""
+        node = self._index.get(key)
+        return node.data if node else None
+    
+    def remove(self, key: FlightKey) -> Optional[T]:
+        """Elimina y devuelve el vuelo con esa clave (id o código) en O(1)"""
+        node = self._index.get(key)
+        return self._unlink_node(node) if node else None
+    
+    def neighbors(self, key: FlightKey) -> Tuple[Optional[T], Optional[T]]:
+        """Devuelve los elementos anterior y siguiente al vuelo con esa clave"""
+        node = self._index.get(key)
+        if node is None:
+            return None, None
+        return (node.prev.data if node.prev else None,
+                node.next.data if node.next else None)
+    
+    def replace(self, key: FlightKey, data: T) -> bool:
+        """Sustituye los datos del nodo con esa clave sin moverlo"""
+        node = self._index.get(key)
+        if node is None:
+            return False
+        
+        self._unregister(node)
+        node.data = data
+        self._register(node)
+        return True
+    
+    def position_of(self, key: FlightKey) -> int:
+        """
+        Devuelve la posición del vuelo con esa clave, o -1 si no está.
+        El nodo se localiza en O(1); contar su posición requiere recorrer
+        los enlaces prev hasta head.
+        """
+        node = self._index.get(key)
+        if node is None:
+            return -1
+        
+        position = 0
+        current = node.prev
+        while current:
+            position += 1
+            current = current.prev
+        return position
+    
     def get_first(self) -> Optional[T]:
         """Devuelve el primer elemento sin eliminarlo"""
         return self.head.data if self.head else None
@@ -166,6 +328,45 @@ class MemoryLinkedList(Generic[T]):
         
         return current.data if current else None
     
+    def _node_at(self, position: int) -> Optional[Node[T]]:
+        """Devuelve el nodo en una posición recorriendo desde head"""
+        if position < 0 or position >= self._size:
+            return None
+        
+        current = self.head
+        for _ in range(position):
+            current = current.next
+        return current
+    
+    def get_range(self, position: int, count: int) -> List[T]:
+        """
+        Devuelve hasta count elementos a partir de una posición: localiza el
+        primero una vez y sigue los enlaces next
+        """
+        elements = []
+        current = self._node_at(position) if count > 0 else None
+        while current and len(elements) < count:
+            elements.append(current.data)
+            current = current.next
+        return elements
+    
+    def walk(self, start: Optional[FlightKey], count: int, forward: bool = True) -> List[T]:
+        """
+        Devuelve hasta count elementos desde el vuelo con clave start (incluido)
+        siguiendo los enlaces next, o prev si no es forward. Sin start empieza
+        en head (o en tail). El nodo de partida se localiza con el índice, así
+        que cuesta O(count) sea cual sea su posición; [] si start no está.
+        """
+        if start is None:
+            current = self.head if forward else self.tail
+        else:
+            current = self._index.get(start)
+        elements = []
+        while current and len(elements) < count:
+            elements.append(current.data)
+            current = current.next if forward else current.prev
+        return elements
+    
     def get_all(self) -> List[T]:
         """Retorna todos los elementos de la lista"""
         elements = []
@@ -0,0 +1,342 @@
+"""
+Lista de vuelos organizada en carriles de prioridad
+
+La lista se compone de una sublista por carril (emergencia, embarque,
+programado, otros) concatenadas lógicamente. El orden por prioridad es
+un invariante de la estructura: un cambio de estado mueve un único nodo
+entre carriles y no hace falta reconstruir la lista.
+"""
+from typing import TypeVar, Generic, Optional, List, Iterator, Dict, Tuple, Type
+from app.models import Vuelo, EstadoVuelo
+from app.domain.memory_linked_list import MemoryLinkedList, FlightKey
+
+T = TypeVar('T', bound=Vuelo)
+
+# Carriles en orden de prioridad
+LANES = ("emergencia", "embarque", "programado", "otros")
+
+_LANE_BY_STATUS = {
+    EstadoVuelo.EMERGENCIA: "emergencia",
+    EstadoVuelo.EMBARQUE: "embarque",
+    EstadoVuelo.PROGRAMADO: "programado",
+}
+
+def lane_for(vuelo: Vuelo) -> str:
+    """Devuelve el carril que corresponde al estado de un vuelo"""
+    return _LANE_BY_STATUS.get(vuelo.estado, "otros")
+
+def lane_for_status(estado: EstadoVuelo) -> str:
+    """Devuelve el carril que corresponde a un estado"""
+    return _LANE_BY_STATUS.get(estado, "otros")
+
+def lane_statuses(lane: str) -> List[EstadoVuelo]:
+    """Devuelve los estados que pertenecen a un carril"""
+    return [estado for estado in EstadoVuelo if _LANE_BY_STATUS.get(estado, "otros") == lane]
+
+def visualize_flights(flights: List[Vuelo]) -> str:
+    """
+    Representación visual de una lista enlazada a partir de sus vuelos en orden
+    (p. ej. los ya cargados de la BD de una lista con nodos por ID).
+    """
+    if not flights:
+        return "[Lista vacía]"
+
+    size = len(flights)
+    result = []
+    result.append(f"Lista (tamaño: {size})")
+    result.append("HEAD")
+
+    for position, vuelo in enumerate(flights):
+        prev_arrow = "←" if position > 0 else "×"
+        next_arrow = "→" if position < size - 1 else "×"
+        result.append(f"{position}: {prev_arrow} [{vuelo.codigo}: {vuelo.estado.name}] {next_arrow}")
+
+    result.append("TAIL")
+    return "\n".join(result)
+
+
+class PriorityLaneList(Generic[T]):
+    """
+    Lista doblemente enlazada particionada por carriles de prioridad
+
+    Expone la misma API que MemoryLinkedList con posiciones globales.
+    Las inserciones se acotan al carril del vuelo: add_first/add_last
+    lo colocan al principio/final de su carril e insert_at ajusta la
+    posición a los límites del carril.
+    """
+    def __init__(self, list_class: Type[MemoryLinkedList] = MemoryLinkedList):
+        self._lanes: Dict[str, MemoryLinkedList[T]] = {lane: list_class() for lane in LANES}
+        # False si algún vuelo quedó en un carril que ya no corresponde a su estado
+        self._consistent = True
+
+    # --- Navegación entre carriles ---
+
+    def _lane_at(self, position: int) -> Tuple[Optional[MemoryLinkedList[T]], int]:
+        """Devuelve el carril que contiene una posición global y la posición local"""
+        for lane in self._lanes.values():
+            if position < lane.size():
+                return lane, position
+            position -= lane.size()
+        return None, 0
+
+    def _offset_of(self, lane_name: str) -> int:
+        """Posición global en la que empieza un carril"""
+        offset = 0
+        for name, lane in self._lanes.items():
+            if name == lane_name:
+                break
+            offset += lane.size()
+        return offset
+
+    def _lane_containing(self, key: FlightKey) -> Optional[str]:
+        """Nombre del carril que contiene un vuelo, o None"""
+        for name, lane in self._lanes.items():
+            if lane.contains(key):
+                return name
+        return None
+
+    def _first_lane(self) -> Optional[MemoryLinkedList[T]]:
+        for lane in self._lanes.values():
+            if not lane.is_empty():
+                return lane
+        return None
+
+    def _last_lane(self) -> Optional[MemoryLinkedList[T]]:
+        for lane in reversed(list(self._lanes.values())):
+            if not lane.is_empty():
+                return lane
+        return None
+
+    # --- API de lista ---
+
+    def size(self) -> int:
+        return sum(lane.size() for lane in self._lanes.values())
+
+    def is_empty(self) -> bool:
+        return self.size() == 0
+
+    def lane_counts(self) -> Dict[str, int]:
+        """Número de vuelos por carril en O(1)"""
+        return {name: lane.size() for name, lane in self._lanes.items()}
+
+    def add_first(self, data: T) -> None:
+        """Añade un vuelo al inicio de su carril"""
+        self._lanes[lane_for(data)].add_first(data)
+
+    def add_last(self, data: T) -> None:
+        """Añade un vuelo al final de su carril"""
+        self._lanes[lane_for(data)].add_last(data)
+
+    def insert_at(self, position: int, data: T) -> None:
+        """Inserta un vuelo en una posición, acotada a los límites de su carril"""
+        lane_name = lane_for(data)
+        local = position - self._offset_of(lane_name)
+        lane = self._lanes[lane_name]
+        lane.insert_at(min(max(local, 0), lane.size()), data)
+
+    def remove_first(self) -> Optional[T]:
+        """Elimina y devuelve el primer vuelo"""
+        lane = self._first_lane()
+        return lane.remove_first() if lane else None
+
+    def remove_last(self) -> Optional[T]:
+        """Elimina y devuelve el último vuelo"""
+        lane = self._last_lane()
+        return lane.remove_last() if lane else None
+
+    def remove_at(self, position: int) -> Optional[T]:
+        """Elimina y devuelve el vuelo en una posición global"""
+        if position < 0 or self.is_empty():
+            return None
+
+        if position >= self.size() - 1:
+            return self.remove_last()
+
+        lane, local = self._lane_at(position)
+        return lane.remove_at(local) if lane else None
+
+    def move(self, from_pos: int, to_pos: int) -> Optional[T]:
+        """
+        Mueve el vuelo de una posición global a otra, acotada a los límites
+        de su carril. Devuelve el vuelo movido o None si la posición no existe.
+        """
+        if from_pos < 0:
+            return None
+        lane, local = self._lane_at(from_pos)
+        if lane is None:
+            return None
+        offset = from_pos - local
+        return lane.move(local, min(max(to_pos - offset, 0), lane.size() - 1))
+
+    def move_before(self, key: FlightKey, anchor: Optional[FlightKey]) -> bool:
+        """
+        Mueve un vuelo justo antes de anchor (al final de su carril si es None).
+        Si anchor está en otro carril, el vuelo queda en el extremo de su
+        carril más cercano a él. Devuelve False si alguno no está en la lista.
+        """
+        lane_name = self._lane_containing(key)
+        if lane_name is None:
+            return False
+        lane = self._lanes[lane_name]
+        if anchor is None:
+            return lane.move_before(key, None)
+
+        anchor_lane = self._lane_containing(anchor)
+        if anchor_lane is None:
+            return False
+        if anchor_lane == lane_name:
+            return lane.move_before(key, anchor)
+        if LANES.index(anchor_lane) < LANES.index(lane_name):
+            return lane.move_before(key, lane.get_first().id)
+        return lane.move_before(key, None)
+
+    def get_first(self) -> Optional[T]:
+        lane = self._first_lane()
+        return lane.get_first() if lane else None
+
+    def get_last(self) -> Optional[T]:
+        lane = self._last_lane()
+        return lane.get_last() if lane else None
+
+    def get_at(self, position: int) -> Optional[T]:
+        if position < 0:
+            return None
+        lane, local = self._lane_at(position)
+        return lane.get_at(local) if lane else None
+
+    def get_range(self, position: int, count: int) -> List[T]:
+        """Devuelve hasta count vuelos a partir de una posición global, saltando carriles enteros"""
+        elements: List[T] = []
+        if position < 0:
+            return elements
+        for lane in self._lanes.values():
+            if len(elements) >= count:
+                break
+            if position >= lane.size():
+                position -= lane.size()
+                continue
+            elements.extend(lane.get_range(position, count - len(elements)))
+            position = 0
+        return elements
+
+    def walk(self, start: Optional[FlightKey], count: int, forward: bool = True) -> List[T]:
+        """Recorre hasta count vuelos desde start (incluido) hacia delante o hacia atrás, pasando de carril en carril"""
+        names = list(self._lanes) if forward else list(reversed(self._lanes))
+        if start is None:
+            first = 0
+        else:
+            lane_name = self._lane_containing(start)
+            if lane_name is None:
+                return []
+            first = names.index(lane_name)
+        elements = self._lanes[names[first]].walk(start, count, forward)
+        for name in names[first + 1:]:
+            if len(elements) >= count:
+                break
+            elements.extend(self._lanes[name].walk(None, count - len(elements), forward))
+        return elements
+
+    def get_all(self) -> List[T]:
+        elements = []
+        for lane in self._lanes.values():
+            elements.extend(lane.get_all())
+        return elements
+
+    def __iter__(self) -> Iterator[T]:
+        for lane in self._lanes.values():
+            yield from lane
+
+    # --- Acceso por clave ---
+
+    def contains(self, key: FlightKey) -> bool:
+        return self._lane_containing(key) is not None
+
+    def find(self, key: FlightKey) -> Optional[T]:
+        lane_name = self._lane_containing(key)
+        return self._lanes[lane_name].find(key) if lane_name else None
+
+    def remove(self, key: FlightKey) -> Optional[T]:
+        lane_name = self._lane_containing(key)
+        return self._lanes[lane_name].remove(key) if lane_name else None
+
+    def position_of(self, key: FlightKey) -> int:
+        lane_name = self._lane_containing(key)
+        if lane_name is None:
+            return -1
+        return self._offset_of(lane_name) + self._lanes[lane_name].position_of(key)
+
+    def lane_name_of(self, key: FlightKey) -> Optional[str]:
+        """Nombre del carril que contiene un vuelo, o None"""
+        return self._lane_containing(key)
+
+    def lane_items(self, lane_name: str) -> List[T]:
+        """Vuelos de un carril en orden"""
+        return self._lanes[lane_name].get_all()
+
+    def lane_last(self, lane_name: str) -> Optional[T]:
+        """Último vuelo de un carril, o None si está vacío"""
+        return self._lanes[lane_name].get_last()
+
+    def neighbors(self, key: FlightKey) -> Tuple[Optional[T], Optional[T]]:
+        """Vuelos anterior y siguiente dentro del carril de un vuelo"""
+        lane_name = self._lane_containing(key)
+        if lane_name is None:
+            return None, None
+        return self._lanes[lane_name].neighbors(key)
+
+    # --- Cambios de estado ---
+
+    def relocate(self, data: T) -> bool:
+        """
+        Mueve un vuelo al final del carril de su estado actual.
+        Si ya está en ese carril solo se actualizan sus datos.
+        Devuelve False si el vuelo no está en la lista.
+        """
+        current = self._lane_containing(data.id)
+        if current is None:
+            return False
+
+        target = lane_for(data)
+        if current == target:
+            self._lanes[current].replace(data.id, data)
+        else:
+            self._lanes[current].remove(data.id)
+            self._lanes[target].add_last(data)
+        return True
+
+    def update_in_place(self, data: T) -> bool:
+        """
+        Actualiza los datos de un vuelo sin moverlo de su carril.
+        Si su estado ya no corresponde al carril, la lista queda pendiente de priorizar.
+        """
+        current = self._lane_containing(data.id)
+        if current is None:
+            return False
+
+        self._lanes[current].replace(data.id, data)
+        if lane_for(data) != current:
+            self._consistent = False
+        return True
+
+    def is_prioritized(self) -> bool:
+        return self._consistent
+
+    def prioritize(self) -> Dict[str, int]:
+        """
+        Reubica los vuelos cuyo estado no corresponde a su carril.
+        No hace nada si los carriles ya son consistentes.
+        """
+        if not self._consistent:
+            for name, lane in self._lanes.items():
+                misplaced = [v for v in lane if lane_for(v) != name]
+                for v in misplaced:
+                    lane.remove(v.id)
+                    self._lanes[lane_for(v)].add_last(v)
+            self._consistent = True
+        return self.lane_counts()
+
+    def visualize(self) -> str:
+        """
+        Genera una representación visual de la lista enlazada.
+        """
+        return visualize_flights(self.get_all())
@@ -6,6 +6,8 @@ class ListaVuelos(Base):
     __tablename__ = "listas_vuelos"
     id = Column(Integer, primary_key=True, index=True)
     nombre = Column(String(50), default="Lista de vuelos")
+    # Se incrementa en cada cambio de la lista; permite a cada proceso saber si su caché quedó obsoleta
+    version = Column(Integer, nullable=False, default=0)
     # Relación con vuelos (un vuelo pertenece a una lista)
     vuelos = relationship("Vuelo", back_populates="lista_vuelos")
     
@@ -1,5 +1,5 @@
 import enum
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum, Float, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.models.EstadoVuelo import EstadoVuelo
@@ -11,14 +11,22 @@ class Vuelo(Base):
     codigo = Column(String(10), unique=True, index=True)
     origen = Column(String(50))
     destino = Column(String(50))
-    hora = Column(DateTime, default=datetime.utcnow)
+    hora = Column(DateTime, default=datetime.utcnow, index=True)
     aerolinea = Column(String(50), nullable=True)
     puerta_embarque = Column(String(10), nullable=True)
-    estado = Column(Enum(EstadoVuelo), default=EstadoVuelo.PROGRAMADO)
+    estado = Column(Enum(EstadoVuelo), default=EstadoVuelo.PROGRAMADO, index=True)
 
     # Relación con la lista de vuelos
     lista_vuelos_id = Column(Integer, ForeignKey("listas_vuelos.id"), nullable=True)
     lista_vuelos = relationship("ListaVuelos", back_populates="vuelos")
+    # Clave de orden dentro de la lista (dispersa, permite insertar sin renumerar)
+    orden = Column(Float, nullable=True)
+    
+    __table_args__ = (
+        Index("ix_vuelos_lista_orden", "lista_vuelos_id", "orden"),
+        # Vuelos de una lista por carril (p. ej. la mayor clave de orden de un carril)
+        Index("ix_vuelos_lista_estado", "lista_vuelos_id", "estado"),
+    )
     
     def __init__(self, codigo, origen, destino, hora=None, aerolinea=None, 
                  puerta_embarque=None, estado="programado"):
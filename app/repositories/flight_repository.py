@@ -1,9 +1,15 @@
 """
 Repositorio para operaciones con vuelos en la base de datos
 """
-from typing import List, Optional
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Set
+from sqlalchemy import func, insert, select, update
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models import Vuelo, ListaVuelos, EstadoVuelo
+from app.repositories.unit_of_work import save
+
+# Máximo de IDs por consulta IN (SQLite limita el número de parámetros)
+IN_CHUNK = 500
 
 class FlightRepository:
     """
@@ -16,6 +22,18 @@ class FlightRepository:
         """Obtiene todos los vuelos con paginación"""
         return self.db.query(Vuelo).order_by(Vuelo.id).offset(skip).limit(limit).all()
     
+    def get_page_after(self, after_id: int, limit: int = 100) -> List[Vuelo]:
+        """
+        Obtiene hasta limit vuelos con ID mayor que after_id (paginación por
+        clave): recorre el índice de la clave primaria desde after_id, así que
+        cuesta lo mismo en cualquier página, a diferencia de OFFSET
+        """
+        return (self.db.query(Vuelo)
+                .filter(Vuelo.id > after_id)
+                .order_by(Vuelo.id)
+                .limit(limit)
+                .all())
+    
     def get_by_id(self, flight_id: int) -> Optional[Vuelo]:
         """Obtiene un vuelo por su ID"""
         return self.db.query(Vuelo).filter(Vuelo.id == flight_id).first()
@@ -24,28 +42,182 @@ class FlightRepository:
         """Obtiene un vuelo por su código"""
         return self.db.query(Vuelo).filter(Vuelo.codigo == code).first()
     
-    def create(self, flight: Vuelo) -> Vuelo:
-        """Crea un nuevo vuelo"""
+    def create(self, flight: Vuelo, immediate: bool = False) -> Vuelo:
+        """Crea un nuevo vuelo (dentro de una unidad de trabajo solo hace flush para obtener su ID)"""
         self.db.add(flight)
-        self.db.commit()
-        self.db.refresh(flight)
+        save(self.db, flight, flush=True, immediate=immediate)
         return flight
     
-    def update(self, flight: Vuelo) -> Vuelo:
+    def create_many(self, values: List[Dict[str, Any]], immediate: bool = False) -> List[int]:
+        """
+        Inserta muchos vuelos con un INSERT por lotes (executemany con
+        RETURNING), sin crear instancias ORM. Todas las filas deben tener
+        las mismas columnas. Devuelve los IDs en el orden de las filas.
+        """
+        if not values:
+            return []
+        result = self.db.execute(insert(Vuelo).returning(Vuelo.id, sort_by_parameter_order=True), values)
+        flight_ids = list(result.scalars())
+        save(self.db, immediate=immediate)
+        return flight_ids
+    
+    def get_existing_codes(self, codes: Iterable[str]) -> Set[str]:
+        """Devuelve cuáles de esos códigos ya tienen un vuelo, con consultas IN (...) de hasta IN_CHUNK"""
+        codes = list(codes)
+        existing = set()
+        for start in range(0, len(codes), IN_CHUNK):
+            chunk = codes[start:start + IN_CHUNK]
+            existing.update(self.db.scalars(select(Vuelo.codigo).where(Vuelo.codigo.in_(chunk))))
+        return existing
+    
+    def update(self, flight: Vuelo, immediate: bool = False) -> Vuelo:
         """Actualiza un vuelo existente"""
-        self.db.commit()
-        self.db.refresh(flight)
+        save(self.db, flight, immediate=immediate)
         return flight
     
-    def delete(self, flight: Vuelo) -> None:
+    def delete(self, flight: Vuelo, immediate: bool = False) -> None:
         """Elimina un vuelo"""
         self.db.delete(flight)
-        self.db.commit()
+        save(self.db, immediate=immediate)
     
     def get_flights_by_list_id(self, list_id: int) -> List[Vuelo]:
-        """Obtiene todos los vuelos asociados a una lista"""
-        return self.db.query(Vuelo).filter(Vuelo.lista_vuelos_id == list_id).all()
+        """Obtiene todos los vuelos asociados a una lista en su orden persistido"""
+        return (self.db.query(Vuelo)
+                .filter(Vuelo.lista_vuelos_id == list_id)
+                .order_by(Vuelo.orden.asc().nulls_last(), Vuelo.id)
+                .all())
+    
+    def get_unassigned(self) -> List[Vuelo]:
+        """Obtiene los vuelos que no pertenecen a ninguna lista"""
+        return self.db.query(Vuelo).filter(Vuelo.lista_vuelos_id.is_(None)).all()
+    
+    def get_flight_keys_by_list_id(self, list_id: int) -> List[Any]:
+        """
+        Obtiene solo (id, estado, orden) de los vuelos de una lista, en el
+        mismo orden que get_flights_by_list_id y sin crear instancias ORM
+        """
+        return (self.db.query(Vuelo.id, Vuelo.estado, Vuelo.orden)
+                .filter(Vuelo.lista_vuelos_id == list_id)
+                .order_by(Vuelo.orden.asc().nulls_last(), Vuelo.id)
+                .all())
+    
+    def get_values_by_ids(self, flight_ids: Iterable[int]) -> List[Dict[str, Any]]:
+        """
+        Obtiene los valores de las columnas de varios vuelos con consultas
+        IN (...) de hasta IN_CHUNK IDs, sin crear instancias ORM ni ligarlos a la sesión.
+        El orden del resultado no está definido.
+        """
+        flight_ids = list(flight_ids)
+        values = []
+        for start in range(0, len(flight_ids), IN_CHUNK):
+            chunk = flight_ids[start:start + IN_CHUNK]
+            rows = self.db.execute(select(Vuelo.__table__).where(Vuelo.id.in_(chunk)))
+            values.extend(dict(row._mapping) for row in rows)
+        return values
+    
+    def get_values_by_list_id(self, list_id: int) -> List[Dict[str, Any]]:
+        """
+        Obtiene los valores de las columnas de todos los vuelos de una lista,
+        en el mismo orden que get_flights_by_list_id y sin instancias ORM
+        """
+        rows = self.db.execute(
+            select(Vuelo.__table__)
+            .where(Vuelo.lista_vuelos_id == list_id)
+            .order_by(Vuelo.orden.asc().nulls_last(), Vuelo.id)
+        )
+        return [dict(row._mapping) for row in rows]
+    
+    def get_max_position(self, list_id: int, statuses: List[EstadoVuelo]) -> Optional[float]:
+        """Obtiene la mayor clave de orden de los vuelos de una lista con esos estados"""
+        return (self.db.query(func.max(Vuelo.orden))
+                .filter(Vuelo.lista_vuelos_id == list_id, Vuelo.estado.in_(statuses))
+                .scalar())
+    
+    def update_positions(self, positions: Dict[int, Optional[float]], immediate: bool = False) -> None:
+        """Actualiza en bloque la clave de orden de varios vuelos"""
+        if not positions:
+            return
+        self.db.execute(
+            update(Vuelo),
+            [{"id": flight_id, "orden": orden} for flight_id, orden in positions.items()]
+        )
+        save(self.db, immediate=immediate)
     
     def get_flights_by_status(self, status: EstadoVuelo) -> List[Vuelo]:
         """Obtiene todos los vuelos con un estado específico"""
         return self.db.query(Vuelo).filter(Vuelo.estado == status).all()
+
+
+class AsyncFlightRepository:
+    """
+    Variante asíncrona (AsyncSession) de las lecturas de FlightRepository,
+    con las mismas consultas, para los endpoints async. Las escrituras siguen
+    en FlightRepository: van dentro de la unidad de trabajo de la petición
+    y junto a la lista en memoria.
+    """
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def get_all(self, skip: int = 0, limit: int = 100) -> List[Vuelo]:
+        """Obtiene todos los vuelos con paginación"""
+        result = await self.db.scalars(select(Vuelo).order_by(Vuelo.id).offset(skip).limit(limit))
+        return list(result)
+    
+    async def get_page_after(self, after_id: int, limit: int = 100) -> List[Vuelo]:
+        """Obtiene hasta limit vuelos con ID mayor que after_id (paginación por clave)"""
+        result = await self.db.scalars(
+            select(Vuelo).where(Vuelo.id > after_id).order_by(Vuelo.id).limit(limit)
+        )
+        return list(result)
+    
+    async def iter_values(self, after_id: Optional[int] = None,
+                          batch_size: int = 1000) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Recorre los valores de las columnas de todos los vuelos por orden de ID
+        leyendo el cursor de batch_size en batch_size filas, sin cargar la tabla en memoria
+        """
+        statement = select(Vuelo.__table__).order_by(Vuelo.id)
+        if after_id is not None:
+            statement = statement.where(Vuelo.id > after_id)
+        result = await self.db.stream(statement.execution_options(yield_per=batch_size))
+        async for row in result:
+            yield dict(row._mapping)
+    
+    async def get_by_id(self, flight_id: int) -> Optional[Vuelo]:
+        """Obtiene un vuelo por su ID"""
+        return await self.db.scalar(select(Vuelo).where(Vuelo.id == flight_id))
+    
+    async def get_by_code(self, code: str) -> Optional[Vuelo]:
+        """Obtiene un vuelo por su código"""
+        return await self.db.scalar(select(Vuelo).where(Vuelo.codigo == code).limit(1))
+    
+    async def get_flights_by_list_id(self, list_id: int) -> List[Vuelo]:
+        """Obtiene todos los vuelos asociados a una lista en su orden persistido"""
+        result = await self.db.scalars(
+            select(Vuelo)
+            .where(Vuelo.lista_vuelos_id == list_id)
+            .order_by(Vuelo.orden.asc().nulls_last(), Vuelo.id)
+        )
+        return list(result)
+    
+    async def count_by_status(self, list_ids: List[int]) -> Dict[int, Dict[EstadoVuelo, int]]:
+        """
+        Cuenta los vuelos de cada lista por estado con un solo GROUP BY, que
+        se resuelve con el índice (lista_vuelos_id, estado) sin leer las filas
+        """
+        counts: Dict[int, Dict[EstadoVuelo, int]] = {list_id: {} for list_id in list_ids}
+        for start in range(0, len(list_ids), IN_CHUNK):
+            chunk = list_ids[start:start + IN_CHUNK]
+            rows = await self.db.execute(
+                select(Vuelo.lista_vuelos_id, Vuelo.estado, func.count())
+                .where(Vuelo.lista_vuelos_id.in_(chunk))
+                .group_by(Vuelo.lista_vuelos_id, Vuelo.estado)
+            )
+            for list_id, estado, count in rows:
+                counts[list_id][estado] = count
+        return counts
+    
+    async def get_flights_by_status(self, status: EstadoVuelo) -> List[Vuelo]:
+        """Obtiene todos los vuelos con un estado específico"""
+        result = await self.db.scalars(select(Vuelo).where(Vuelo.estado == status))
+        return list(result)
@@ -1,6 +1,9 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from app.models import ListaVuelos
+from app.repositories.unit_of_work import save
 
 
 
@@ -19,20 +22,64 @@ class ListRepository:
         """Obtiene una lista por su ID"""
         return self.db.query(ListaVuelos).filter(ListaVuelos.id == list_id).first()
     
-    def create(self, lista: ListaVuelos) -> ListaVuelos:
-        """Crea una nueva lista de vuelos"""
+    def get_version(self, list_id: int) -> Optional[int]:
+        """Obtiene solo la versión de una lista (consulta de una fila y una columna)"""
+        return self.db.query(ListaVuelos.version).filter(ListaVuelos.id == list_id).scalar()
+    
+    def bump_version(self, list_id: int, expected: Optional[int] = None, immediate: bool = False) -> bool:
+        """
+        Incrementa la versión de una lista.
+        Con expected solo la incrementa si la versión actual coincide;
+        devuelve False si no se actualizó ninguna fila.
+        """
+        stmt = update(ListaVuelos).where(ListaVuelos.id == list_id)
+        if expected is not None:
+            stmt = stmt.where(ListaVuelos.version == expected)
+        result = self.db.execute(stmt.values(version=ListaVuelos.version + 1))
+        save(self.db, immediate=immediate)
+        return result.rowcount > 0
+    
+    def create(self, lista: ListaVuelos, immediate: bool = False) -> ListaVuelos:
+        """Crea una nueva lista de vuelos (dentro de una unidad de trabajo solo hace flush para obtener su ID)"""
         self.db.add(lista)
-        self.db.commit()
-        self.db.refresh(lista)
+        save(self.db, lista, flush=True, immediate=immediate)
         return lista
     
-    def update(self, lista: ListaVuelos) -> ListaVuelos:
+    def update(self, lista: ListaVuelos, immediate: bool = False) -> ListaVuelos:
         """Actualiza una lista existente"""
-        self.db.commit()
-        self.db.refresh(lista)
+        save(self.db, lista, immediate=immediate)
         return lista
     
-    def delete(self, lista: ListaVuelos) -> None:
+    def delete(self, lista: ListaVuelos, immediate: bool = False) -> None:
         """Elimina una lista"""
         self.db.delete(lista)
-        self.db.commit()
\ No newline at end of file
+        save(self.db, immediate=immediate)
+
+
+class AsyncListRepository:
+    """
+    Variante asíncrona (AsyncSession) de las lecturas de ListRepository
+    """
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def get_all(self, skip: int = 0, limit: Optional[int] = 100,
+                      with_flights: bool = False) -> List[ListaVuelos]:
+        """
+        Obtiene todas las listas de vuelos. Una sesión asíncrona no puede cargar
+        relaciones al acceder a ellas, así que con with_flights los vuelos de
+        todas las listas se cargan aquí con una sola consulta IN (selectinload)
+        """
+        statement = select(ListaVuelos).order_by(ListaVuelos.id).offset(skip).limit(limit)
+        if with_flights:
+            statement = statement.options(selectinload(ListaVuelos.vuelos))
+        result = await self.db.scalars(statement)
+        return list(result)
+    
+    async def get_by_id(self, list_id: int) -> Optional[ListaVuelos]:
+        """Obtiene una lista por su ID"""
+        return await self.db.scalar(select(ListaVuelos).where(ListaVuelos.id == list_id))
+    
+    async def get_version(self, list_id: int) -> Optional[int]:
+        """Obtiene solo la versión de una lista"""
+        return await self.db.scalar(select(ListaVuelos.version).where(ListaVuelos.id == list_id))
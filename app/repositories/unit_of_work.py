@@ -0,0 +1,86 @@
+"""
+Unidad de trabajo por petición
+
+Dentro de una unidad de trabajo los repositorios no confirman cada
+operación: los cambios se envían a la BD cuando una consulta los necesita
+(autoflush) y se confirman con un único commit al final de la petición.
+Fuera de ella los repositorios siguen confirmando en cada método.
+"""
+from contextlib import contextmanager
+from typing import Callable, Iterator
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+_ACTIVE = "unit_of_work"
+_ON_ROLLBACK = "unit_of_work_on_rollback"
+_ON_COMMIT = "unit_of_work_on_commit"
+
+def is_active(db: Session) -> bool:
+    """Indica si la sesión está dentro de una unidad de trabajo"""
+    return db.info.get(_ACTIVE, False)
+
+@contextmanager
+def unit_of_work(db: Session) -> Iterator[Session]:
+    """
+    Agrupa las escrituras de los repositorios en un único commit al salir.
+    Si se produce una excepción se deshace todo. Anidada no hace nada:
+    confirma la unidad de trabajo más externa.
+    """
+    if is_active(db):
+        yield db
+        return
+
+    previous_autoflush = db.autoflush
+    db.info[_ACTIVE] = True
+    # Las consultas de la petición deben ver sus propios cambios pendientes
+    db.autoflush = True
+    try:
+        yield db
+        db.commit()
+    except BaseException:
+        db.rollback()
+        raise
+    finally:
+        db.info[_ACTIVE] = False
+        db.autoflush = previous_autoflush
+
+def save(db: Session, *instances: object, flush: bool = False, immediate: bool = False) -> None:
+    """
+    Cierra una operación de escritura de un repositorio.
+
+    Fuera de una unidad de trabajo, o con immediate=True, confirma la
+    transacción (incluido todo lo pendiente) y refresca las instancias.
+    Dentro solo hace flush si se pide, p. ej. para obtener claves generadas.
+    """
+    if immediate or not is_active(db):
+        db.commit()
+        for instance in instances:
+            db.refresh(instance)
+    elif flush:
+        db.flush()
+
+def on_rollback(db: Session, callback: Callable[[], None]) -> None:
+    """Registra una función que se llama si la transacción en curso se deshace"""
+    db.info.setdefault(_ON_ROLLBACK, []).append(callback)
+
+def on_commit(db: Session, callback: Callable[[], None]) -> None:
+    """
+    Ejecuta una función cuando se confirme la transacción en curso.
+    Fuera de una unidad de trabajo cada repositorio ya ha confirmado, así que se ejecuta en el acto.
+    """
+    if is_active(db):
+        db.info.setdefault(_ON_COMMIT, []).append(callback)
+    else:
+        callback()
+
+@event.listens_for(Session, "after_commit")
+def _run_commit_callbacks(db: Session) -> None:
+    db.info.pop(_ON_ROLLBACK, None)
+    for callback in db.info.pop(_ON_COMMIT, []):
+        callback()
+
+@event.listens_for(Session, "after_soft_rollback")
+def _run_rollback_callbacks(db: Session, previous_transaction) -> None:
+    db.info.pop(_ON_COMMIT, None)
+    for callback in db.info.pop(_ON_ROLLBACK, []):
+        callback()
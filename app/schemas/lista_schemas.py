@@ -1,5 +1,6 @@
-from pydantic import BaseModel
-from typing import List
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Literal, Optional, Union
+from typing_extensions import Annotated
 from app.schemas.vuelo_schemas import VueloResponse
 
 class ListaVuelosBase(BaseModel):
@@ -11,3 +12,56 @@ class ListaVuelosResponse(ListaVuelosBase):
 
     class Config:
         orm_mode = True
+
+class ListaVuelosResumen(ListaVuelosBase):
+    id: int
+    total: int
+    # Vuelos de la lista por estado (todos los estados, también los que tienen 0)
+    por_estado: Dict[str, int]
+
+# Operaciones de POST /listas/{lista_id}/operaciones; "op" indica de cuál se trata
+class OperacionAnadir(BaseModel):
+    op: Literal["add_first", "add_last"]
+    vuelo_id: int
+
+class OperacionInsertar(BaseModel):
+    op: Literal["insert_at"]
+    vuelo_id: int
+    position: int
+
+class OperacionExtraer(BaseModel):
+    op: Literal["remove_at"]
+    position: int
+
+class OperacionMover(BaseModel):
+    op: Literal["move"]
+    from_pos: int
+    to_pos: int
+
+OperacionLista = Annotated[
+    Union[OperacionAnadir, OperacionInsertar, OperacionExtraer, OperacionMover],
+    Field(discriminator="op"),
+]
+
+class OperacionesListaResponse(BaseModel):
+    # Vuelos en la lista tras aplicar el lote
+    total: int
+    # Vuelo afectado por cada operación, en el mismo orden
+    vuelos: List[VueloResponse]
+
+class CambiosListaResponse(BaseModel):
+    # Proceso que numera las secuencias: se devuelve tal cual en la siguiente petición
+    epoca: str
+    # Secuencia del último cambio incluido: el "desde" de la siguiente petición
+    seq: int
+    # Si es true, cambios viene vacío y vuelos trae la lista completa
+    resincronizar: bool
+    # Eventos posteriores a "desde", en orden (los mismos que WS /listas/{id}/eventos)
+    cambios: List[Dict[str, Any]]
+    vuelos: Optional[List[VueloResponse]] = None
+
+class VentanaVuelosResponse(BaseModel):
+    # Vuelos de la página en el orden de la lista
+    vuelos: List[VueloResponse]
+    # Cursor de la página siguiente en la misma dirección, o None si no hay más
+    siguiente: Optional[str] = None
@@ -37,3 +37,9 @@ class VueloResponse(VueloBase):
                 "lista_vuelos_id": 1
             }
         }
+
+class ImportacionVuelosResponse(BaseModel):
+    filas: int
+    insertados: int
+    segundos: float
+    filas_por_segundo: float
@@ -0,0 +1,109 @@
+"""
+Servicio de lecturas asíncronas de vuelos y listas (endpoints async def)
+
+Mientras la consulta espera a SQLite la corrutina cede el bucle de eventos,
+así que estas lecturas no ocupan un hilo del pool de FastAPI y un solo
+worker atiende muchas más conexiones simultáneas. Las operaciones sobre
+las listas en memoria (LinkedListManager) siguen en FlightService.
+"""
+from typing import Any, AsyncIterator, Dict, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import Vuelo, ListaVuelos, EstadoVuelo
+from app.repositories.flight_repository import AsyncFlightRepository
+from app.repositories.list_repository import AsyncListRepository
+from app.services.flight_json import encode, flight_values_payload
+
+# Filas leídas del cursor (y líneas enviadas) en cada paso de la exportación NDJSON
+EXPORT_BATCH_SIZE = 1000
+
+def _flight_json_line(values: Dict[str, Any]) -> str:
+    """Una línea NDJSON con los mismos campos que VueloResponse"""
+    return encode(flight_values_payload(values)) + "\n"
+
+class AsyncFlightService:
+    """
+    Servicio asíncrono para las lecturas de vuelos y listas desde la BD
+    """
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.flight_repo = AsyncFlightRepository(db)
+        self.list_repo = AsyncListRepository(db)
+
+    async def get_all_flights(self, skip: int = 0, limit: int = 100) -> List[Vuelo]:
+        """
+        Obtiene todos los vuelos de la base de datos.
+        """
+        return await self.flight_repo.get_all(skip, limit)
+
+    async def get_flights_after(self, after_id: int, limit: int = 100) -> List[Vuelo]:
+        """
+        Obtiene la página de vuelos siguiente a after_id (paginación por clave).
+        """
+        return await self.flight_repo.get_page_after(after_id, limit)
+
+    async def iter_flights_ndjson(self, after_id: Optional[int] = None) -> AsyncIterator[str]:
+        """
+        Genera todos los vuelos como NDJSON por orden de ID, en bloques de
+        EXPORT_BATCH_SIZE líneas leídas del cursor: la memoria no depende
+        del tamaño de la tabla.
+        """
+        lines = []
+        async for values in self.flight_repo.iter_values(after_id, EXPORT_BATCH_SIZE):
+            lines.append(_flight_json_line(values))
+            if len(lines) >= EXPORT_BATCH_SIZE:
+                yield "".join(lines)
+                lines = []
+        if lines:
+            yield "".join(lines)
+
+    async def get_all_lists(self, skip: int = 0, limit: int = 100) -> List[ListaVuelos]:
+        """
+        Obtiene las listas con sus vuelos, con paginación. Los vuelos de todas
+        las listas de la página se cargan con una sola consulta.
+        """
+        return await self.list_repo.get_all(skip, limit, with_flights=True)
+    
+    async def get_list_summaries(self, skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Obtiene las listas con el número de vuelos de cada estado, sin cargar los vuelos.
+        """
+        listas = await self.list_repo.get_all(skip, limit)
+        counts = await self.flight_repo.count_by_status([lista.id for lista in listas])
+        summaries = []
+        for lista in listas:
+            por_estado = {estado.value: counts[lista.id].get(estado, 0) for estado in EstadoVuelo}
+            summaries.append({
+                "id": lista.id,
+                "nombre": lista.nombre,
+                "total": sum(por_estado.values()),
+                "por_estado": por_estado,
+            })
+        return summaries
+
+
+# Funciones de nivel de módulo con la misma forma que las de flight_service
+async def get_all_flights(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[Vuelo]:
+    service = AsyncFlightService(db)
+    return await service.get_all_flights(skip, limit)
+
+async def get_flights_after(db: AsyncSession, after_id: int, limit: int = 100) -> List[Vuelo]:
+    service = AsyncFlightService(db)
+    return await service.get_flights_after(after_id, limit)
+
+async def export_flights_ndjson(after_id: Optional[int] = None) -> AsyncIterator[str]:
+    """
+    Exportación NDJSON con su propia sesión asíncrona: el generador se consume
+    mientras se envía la respuesta, cuando la sesión de la petición ya puede estar cerrada.
+    """
+    from app.db import AsyncSessionLocal
+    async with AsyncSessionLocal() as db:
+        async for chunk in AsyncFlightService(db).iter_flights_ndjson(after_id):
+            yield chunk
+
+async def get_all_lists(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[ListaVuelos]:
+    service = AsyncFlightService(db)
+    return await service.get_all_lists(skip, limit)
+
+async def get_list_summaries(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+    service = AsyncFlightService(db)
+    return await service.get_list_summaries(skip, limit)
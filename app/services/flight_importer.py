@@ -0,0 +1,64 @@
+"""
+Importación masiva de vuelos desde ficheros CSV o JSONL
+
+CSV: una cabecera con los campos de VueloCreate (codigo, origen, destino,
+hora, aerolinea, puerta_embarque, estado); las celdas vacías cuentan como
+no indicadas. JSONL: un objeto JSON por línea con esos mismos campos.
+
+Las filas se validan por lotes y las válidas se insertan en una única
+transacción con una inserción por lotes; las inválidas se informan y se omiten.
+"""
+import csv
+import json
+import os
+import time
+from typing import Any, Dict, Iterator
+from sqlalchemy.orm import Session
+from app.repositories.unit_of_work import unit_of_work
+from app.services.flight_service import FlightService
+
+def read_rows(path: str) -> Iterator[Dict[str, Any]]:
+    """Lee las filas de un fichero .csv o .jsonl (según su extensión)"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        with open(path, newline="", encoding="utf-8") as source:
+            for row in csv.DictReader(source):
+                # Las celdas vacías (o que faltan) se omiten para que se apliquen los valores por defecto
+                yield {field: value.strip() for field, value in row.items()
+                       if field and isinstance(value, str) and value.strip()}
+    elif extension in (".jsonl", ".ndjson"):
+        with open(path, encoding="utf-8") as source:
+            for number, line in enumerate(source, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"{path}, línea {number}: JSON no válido ({e.msg})")
+    else:
+        raise ValueError(f"Formato no soportado: {extension or path} (se admite .csv o .jsonl)")
+
+def import_flights(db: Session, path: str, lista_id: int = 1, dry_run: bool = False) -> Dict[str, Any]:
+    """
+    Valida e importa los vuelos de un fichero en la lista indicada.
+    Con dry_run solo se validan. Devuelve un resumen con las filas leídas,
+    los vuelos insertados, los errores (fila, motivo), los segundos y las filas por segundo.
+    """
+    service = FlightService(db)
+    start = time.perf_counter()
+    with unit_of_work(db):
+        if not service.list_exists(lista_id):
+            raise ValueError(f"Lista con ID {lista_id} no encontrada")
+
+        flights, errors = service.validate_flights(read_rows(path))
+        flight_ids = service.bulk_create_flights(flights, lista_id) if flights and not dry_run else []
+    elapsed = time.perf_counter() - start
+
+    rows = len(flights) + len(errors)
+    return {
+        "filas": rows,
+        "insertados": len(flight_ids),
+        "errores": errors,
+        "segundos": elapsed,
+        "filas_por_segundo": rows / elapsed if elapsed > 0 else 0.0,
+    }
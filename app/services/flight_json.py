@@ -0,0 +1,34 @@
+"""
+Serialización JSON de vuelos compartida por la exportación NDJSON y los
+eventos de las listas, para que ambas den los mismos campos y formatos
+que VueloResponse
+"""
+import enum
+import json
+from datetime import datetime
+from typing import Any, Dict, Mapping, Union
+from app import schemas
+from app.models import Vuelo
+from app.domain.flight_record import FlightRecord
+
+# Campos de un vuelo en la API (los de VueloResponse)
+FLIGHT_FIELDS = tuple(schemas.VueloResponse.model_fields)
+
+def json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    raise TypeError(f"{type(value).__name__} no es serializable")
+
+def encode(message: Any) -> str:
+    """Serializa un mensaje que puede contener fechas y estados"""
+    return json.dumps(message, ensure_ascii=False, default=json_default)
+
+def flight_payload(vuelo: Union[Vuelo, FlightRecord]) -> Dict[str, Any]:
+    """Campos de la API de un vuelo o registro de vuelo"""
+    return {field: getattr(vuelo, field) for field in FLIGHT_FIELDS}
+
+def flight_values_payload(values: Mapping[str, Any]) -> Dict[str, Any]:
+    """Campos de la API de un vuelo leído como fila de columnas"""
+    return {field: values[field] for field in FLIGHT_FIELDS}
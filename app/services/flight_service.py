@@ -1,13 +1,67 @@
 """
 Lógica de negocio relacionada con vuelos
 """
-from typing import List, Optional, Dict, Any
+import base64
+import binascii
+from datetime import datetime
+from itertools import islice
+from typing import List, Optional, Dict, Any, Iterable, Tuple, Union
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
 from app import schemas
 from app.models import Vuelo, EstadoVuelo, ListaVuelos
+from app.domain.flight_record import FlightRecord
 from app.repositories.flight_repository import FlightRepository
 from app.repositories.list_repository import ListRepository
-from app.services.linked_list_manager import LinkedListManager
+from app.services.linked_list_manager import LinkedListManager, BatchOperationError
+
+# Filas que se validan juntas (una consulta de códigos existentes por lote)
+BULK_BATCH_SIZE = 1000
+
+def _flight_values(row: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Valida una fila con VueloCreate y devuelve los valores de las columnas
+    del vuelo. A diferencia de Vuelo(), un estado desconocido es un error.
+    """
+    data = schemas.VueloCreate(**row)
+    try:
+        estado = EstadoVuelo[data.estado.upper()]
+    except KeyError:
+        raise ValueError(f"estado desconocido: {data.estado}")
+    return {
+        "codigo": data.codigo,
+        "origen": data.origen,
+        "destino": data.destino,
+        "hora": data.hora or datetime.utcnow(),
+        "aerolinea": data.aerolinea,
+        "puerta_embarque": data.puerta_embarque,
+        "estado": estado,
+    }
+
+def _describe_error(error: Exception) -> str:
+    if isinstance(error, ValidationError):
+        return "; ".join(f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}"
+                         for err in error.errors())
+    return str(error)
+
+class InvalidCursorError(ValueError):
+    """Un cursor de GET /listas/{id}/vuelos mal formado o cuyos vuelos ya no están en la lista"""
+
+def _encode_cursor(next_id: Optional[int], last_id: int) -> str:
+    """
+    Cursor opaco de la página siguiente: el vuelo por el que sigue el recorrido
+    y, por si ese sale de la lista, el último vuelo devuelto
+    """
+    text = f"{'' if next_id is None else next_id}:{last_id}"
+    return base64.urlsafe_b64encode(text.encode()).decode().rstrip("=")
+
+def _decode_cursor(cursor: str) -> Tuple[Optional[int], int]:
+    try:
+        text = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        next_id, last_id = text.split(":")
+        return (int(next_id) if next_id else None), int(last_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursorError("cursor mal formado")
 
 class FlightService:
     """
@@ -64,6 +118,53 @@ class FlightService:
             print(f"Error al añadir vuelo a la lista: {e}")
             raise
     
+    def validate_flights(self, rows: Iterable[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Tuple[int, str]]]:
+        """
+        Valida filas de vuelos en lotes de BULK_BATCH_SIZE: esquema, estado y
+        códigos repetidos (en las propias filas o ya existentes en la BD).
+        Devuelve los valores de las filas válidas y los errores como
+        (número de fila empezando en 1, motivo).
+        """
+        valid: List[Dict[str, Any]] = []
+        errors: List[Tuple[int, str]] = []
+        seen = set()
+        numbered = enumerate(rows, 1)
+        while True:
+            batch = list(islice(numbered, BULK_BATCH_SIZE))
+            if not batch:
+                break
+            
+            candidates = []
+            for number, row in batch:
+                try:
+                    values = _flight_values(row)
+                except (ValidationError, ValueError, TypeError) as e:
+                    errors.append((number, _describe_error(e)))
+                    continue
+                if values["codigo"] in seen:
+                    errors.append((number, f"código {values['codigo']} repetido en la importación"))
+                    continue
+                seen.add(values["codigo"])
+                candidates.append((number, values))
+            
+            existing = self.flight_repo.get_existing_codes(values["codigo"] for _, values in candidates)
+            for number, values in candidates:
+                if values["codigo"] in existing:
+                    errors.append((number, f"ya existe un vuelo con código {values['codigo']}"))
+                else:
+                    valid.append(values)
+        errors.sort()
+        return valid, errors
+    
+    def bulk_create_flights(self, flights: List[Dict[str, Any]], lista_id: int = 1) -> List[int]:
+        """
+        Crea vuelos ya validados (validate_flights) con una inserción por
+        lotes y los añade al final del carril de su estado en la lista.
+        """
+        if not self.list_repo.get_by_id(lista_id):
+            raise ValueError(f"Lista con ID {lista_id} no encontrada")
+        return LinkedListManager.add_last_many(self.db, lista_id, flights)
+    
     def update_flight_status(self, flight_id: int, new_status: EstadoVuelo, reorder: bool = True) -> Optional[Vuelo]:
         """
         Actualiza el estado de un vuelo y lo reordena en la lista si es necesario.
@@ -79,21 +180,29 @@ class FlightService:
             
             # Actualizar estado
             vuelo.estado = new_status
-            self.flight_repo.update(vuelo)
             
-            # Si hay que reordenar y el estado ha cambiado
-            if reorder and old_status != new_status and vuelo.lista_vuelos_id:
-                # Limpiar la caché para que se reconstruya con la nueva prioridad
-                LinkedListManager.clear_cache(vuelo.lista_vuelos_id)
-                
-                # Obtener nueva instancia con priorización actualizada
-                LinkedListManager.prioritize(self.db, vuelo.lista_vuelos_id)
+            # Si el estado ha cambiado, mover el vuelo al carril de su nuevo estado
+            if old_status != new_status and vuelo.lista_vuelos_id:
+                LinkedListManager.update_flight(self.db, vuelo.lista_vuelos_id, vuelo, reorder)
+            
+            self.flight_repo.update(vuelo)
             
             return vuelo
         except Exception as e:
             print(f"Error al actualizar estado: {e}")
             raise
     
+    def delete_flight(self, vuelo: Vuelo) -> None:
+        """
+        Elimina un vuelo de la base de datos y de la lista en memoria que lo contenga.
+        """
+        lista_id = vuelo.lista_vuelos_id
+        if lista_id:
+            LinkedListManager.discard_flight(lista_id, vuelo.id, self.db)
+        self.flight_repo.delete(vuelo)
+        if lista_id:
+            LinkedListManager.mark_changed(self.db, lista_id)
+    
     def get_all_flights(self, skip: int = 0, limit: int = 100) -> List[Vuelo]:
         """
         Obtiene todos los vuelos de la base de datos.
@@ -112,11 +221,110 @@ class FlightService:
         """
         return self.flight_repo.get_flights_by_list_id(list_id)
     
-    def get_all_flights_in_order(self, list_id: int) -> List[Vuelo]:
+    def get_all_flights_in_order(self, list_id: int) -> List[FlightRecord]:
         """
         Obtiene todos los vuelos de una lista en su orden priorizado.
         """
         return LinkedListManager.get_all(self.db, list_id)
+    
+    def move_flight(self, list_id: int, from_pos: int, to_pos: int) -> Optional[FlightRecord]:
+        """
+        Mueve el vuelo de una posición a otra dentro de su carril sin sacarlo de la lista.
+        """
+        return LinkedListManager.move(self.db, list_id, from_pos, to_pos)
+    
+    def move_flight_before(self, list_id: int, flight_id: int, anchor_id: Optional[int]) -> Optional[FlightRecord]:
+        """
+        Mueve un vuelo justo antes de otro (o al final de su carril) sin sacarlo de la lista.
+        """
+        return LinkedListManager.move_before(self.db, list_id, flight_id, anchor_id)
+    
+    def apply_list_operations(self, list_id: int,
+                              operations: List[Dict[str, Any]]) -> List[Union[Vuelo, FlightRecord]]:
+        """
+        Aplica en orden un lote de operaciones (add_first, add_last, insert_at,
+        remove_at, move) sobre una lista, todas o ninguna. Las de añadir
+        indican el vuelo por "vuelo_id". Lanza BatchOperationError con el
+        índice de la primera que no se puede aplicar.
+        """
+        resolved = []
+        for index, operation in enumerate(operations):
+            operation = dict(operation)
+            vuelo_id = operation.pop("vuelo_id", None)
+            if vuelo_id is not None:
+                vuelo = self.flight_repo.get_by_id(vuelo_id)
+                if vuelo is None:
+                    raise BatchOperationError(index, operation["op"], f"vuelo con ID {vuelo_id} no encontrado")
+                operation["vuelo"] = vuelo
+            resolved.append(operation)
+        return LinkedListManager.apply_operations(self.db, list_id, resolved)
+    
+    def list_exists(self, list_id: int) -> bool:
+        """
+        Indica si existe una lista de vuelos; si está en memoria no consulta la BD.
+        """
+        return LinkedListManager.has_list(self.db, list_id)
+    
+    def get_list_snapshot(self, list_id: int) -> Optional[Tuple[int, str]]:
+        """
+        Obtiene la lista completa serializada para un suscriptor de sus cambios
+        y la secuencia del último cambio que incluye, o None si no existe.
+        """
+        if not self.list_exists(list_id):
+            return None
+        return LinkedListManager.feed_snapshot(self.db, list_id)
+    
+    def get_list_changes(self, list_id: int, since: Optional[int],
+                         epoch: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Obtiene los cambios de una lista posteriores a la secuencia since, o
+        la lista completa si el cliente debe resincronizarse. None si no existe.
+        """
+        if not self.list_exists(list_id):
+            return None
+        return LinkedListManager.changes_since(self.db, list_id, since, epoch)
+    
+    def get_list_window(self, list_id: int, cursor: Optional[str], limit: int,
+                        forward: bool = True) -> Optional[Tuple[List[FlightRecord], Optional[str]]]:
+        """
+        Obtiene una página de la lista en orden recorriéndola desde el cursor
+        hacia delante o hacia atrás, y el cursor de la página siguiente (None
+        si no hay más). Cuesta O(limit) sea cual sea la profundidad de la
+        página. None si la lista no existe.
+        """
+        if not self.list_exists(list_id):
+            return None
+        start = _decode_cursor(cursor) if cursor else None
+        # Un vuelo de más indica si hay otra página y por dónde empieza
+        flights = LinkedListManager.walk(self.db, list_id, start, limit + 1, forward)
+        if flights is None:
+            raise InvalidCursorError("los vuelos del cursor ya no están en la lista")
+        page = flights[:limit]
+        next_cursor = None
+        if page and len(flights) > limit:
+            next_cursor = _encode_cursor(flights[limit].id, page[-1].id)
+        if not forward:
+            # La página se devuelve en el orden de la lista
+            page.reverse()
+        return page, next_cursor
+    
+    def get_list_length(self, list_id: int) -> int:
+        """
+        Obtiene el número de vuelos de una lista desde su copia en memoria.
+        """
+        return LinkedListManager.size(self.db, list_id)
+    
+    def get_first_flight_in_order(self, list_id: int) -> Optional[FlightRecord]:
+        """
+        Obtiene el primer vuelo de una lista en su orden priorizado.
+        """
+        return LinkedListManager.get_first(self.db, list_id)
+    
+    def get_last_flight_in_order(self, list_id: int) -> Optional[FlightRecord]:
+        """
+        Obtiene el último vuelo de una lista en su orden priorizado.
+        """
+        return LinkedListManager.get_last(self.db, list_id)
 
 # Funciones de nivel de módulo para mantener compatibilidad con el código existente
 def get_flight(db: Session, flight_id: int) -> Optional[Vuelo]:
@@ -135,14 +343,38 @@ def add_flight_to_list(db: Session, vuelo: Vuelo, lista_id: int = 1) -> Vuelo:
     service = FlightService(db)
     return service.add_flight_to_list(vuelo, lista_id)
 
+def validate_flights(db: Session, rows: Iterable[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Tuple[int, str]]]:
+    service = FlightService(db)
+    return service.validate_flights(rows)
+
+def bulk_create_flights(db: Session, flights: List[Dict[str, Any]], lista_id: int = 1) -> List[int]:
+    service = FlightService(db)
+    return service.bulk_create_flights(flights, lista_id)
+
 def update_flight_status(db: Session, flight_id: int, new_status: EstadoVuelo, reorder: bool = True) -> Optional[Vuelo]:
     service = FlightService(db)
     return service.update_flight_status(flight_id, new_status, reorder)
 
+def delete_flight(db: Session, vuelo: Vuelo) -> None:
+    service = FlightService(db)
+    return service.delete_flight(vuelo)
+
 def get_all_flights(db: Session, skip: int = 0, limit: int = 100) -> List[Vuelo]:
     service = FlightService(db)
     return service.get_all_flights(skip, limit)
 
+def get_list_snapshot(list_id: int) -> Optional[Tuple[int, str]]:
+    """
+    Instantánea de una lista con su propia sesión: la pide un WebSocket,
+    que no tiene la sesión por petición de get_db.
+    """
+    from app.db import SessionLocal
+    db = SessionLocal()
+    try:
+        return FlightService(db).get_list_snapshot(list_id)
+    finally:
+        db.close()
+
 def get_list_by_id(db: Session, list_id: int) -> Optional[ListaVuelos]:
     service = FlightService(db)
     return service.get_list_by_id(list_id)
@@ -150,3 +382,42 @@ def get_list_by_id(db: Session, list_id: int) -> Optional[ListaVuelos]:
 def get_all_flights_for_list(db: Session, list_id: int) -> List[Vuelo]:
     service = FlightService(db)
     return service.get_all_flights_for_list(list_id)
+
+def move_flight(db: Session, list_id: int, from_pos: int, to_pos: int) -> Optional[FlightRecord]:
+    service = FlightService(db)
+    return service.move_flight(list_id, from_pos, to_pos)
+
+def move_flight_before(db: Session, list_id: int, flight_id: int, anchor_id: Optional[int]) -> Optional[FlightRecord]:
+    service = FlightService(db)
+    return service.move_flight_before(list_id, flight_id, anchor_id)
+
+def apply_list_operations(db: Session, list_id: int,
+                          operations: List[Dict[str, Any]]) -> List[Union[Vuelo, FlightRecord]]:
+    service = FlightService(db)
+    return service.apply_list_operations(list_id, operations)
+
+def get_list_changes(db: Session, list_id: int, since: Optional[int],
+                     epoch: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    service = FlightService(db)
+    return service.get_list_changes(list_id, since, epoch)
+
+def get_list_window(db: Session, list_id: int, cursor: Optional[str], limit: int,
+                    forward: bool = True) -> Optional[Tuple[List[FlightRecord], Optional[str]]]:
+    service = FlightService(db)
+    return service.get_list_window(list_id, cursor, limit, forward)
+
+def list_exists(db: Session, list_id: int) -> bool:
+    service = FlightService(db)
+    return service.list_exists(list_id)
+
+def get_list_length(db: Session, list_id: int) -> int:
+    service = FlightService(db)
+    return service.get_list_length(list_id)
+
+def get_first_flight_in_order(db: Session, list_id: int) -> Optional[FlightRecord]:
+    service = FlightService(db)
+    return service.get_first_flight_in_order(list_id)
+
+def get_last_flight_in_order(db: Session, list_id: int) -> Optional[FlightRecord]:
+    service = FlightService(db)
+    return service.get_last_flight_in_order(list_id)
@@ -5,6 +5,7 @@ Adaptador para el LinkedListManager
 from typing import List, Optional, Dict
 from sqlalchemy.orm import Session
 from app.models import Vuelo, ListaVuelos
+from app.domain.flight_record import FlightRecord
 from app.services.linked_list_manager import LinkedListManager
 
 # Funciones adaptadoras para mantener compatibilidad con el código existente
@@ -20,7 +21,7 @@ def get_length(lista: ListaVuelos) -> int:
     finally:
         db.close()
 
-def get_first(lista: ListaVuelos) -> Optional[Vuelo]:
+def get_first(lista: ListaVuelos) -> Optional[FlightRecord]:
     """
     Obtiene el primer vuelo sin eliminarlo.
     """
@@ -31,7 +32,7 @@ def get_first(lista: ListaVuelos) -> Optional[Vuelo]:
     finally:
         db.close()
 
-def get_last(lista: ListaVuelos) -> Optional[Vuelo]:
+def get_last(lista: ListaVuelos) -> Optional[FlightRecord]:
     """
     Obtiene el último vuelo sin eliminarlo.
     """
@@ -42,7 +43,7 @@ def get_last(lista: ListaVuelos) -> Optional[Vuelo]:
     finally:
         db.close()
 
-def get_all_flights(lista: ListaVuelos) -> List[Vuelo]:
+def get_all_flights(lista: ListaVuelos) -> List[FlightRecord]:
     """
     Recorre toda la lista y devuelve todos los vuelos.
     """
@@ -55,19 +56,19 @@ def get_all_flights(lista: ListaVuelos) -> List[Vuelo]:
 
 def add_first(db: Session, lista: ListaVuelos, vuelo: Vuelo) -> Vuelo:
     """
-    Añade un vuelo al principio de la lista.
+    Añade un vuelo al principio del carril de su estado.
     """
     return LinkedListManager.add_first(db, lista.id, vuelo)
 
 def add_last(db: Session, lista: ListaVuelos, vuelo: Vuelo) -> Vuelo:
     """
-    Añade un vuelo al final de la lista.
+    Añade un vuelo al final del carril de su estado.
     """
     return LinkedListManager.add_last(db, lista.id, vuelo)
 
 def add_at_position(db: Session, lista: ListaVuelos, vuelo: Vuelo, position: int) -> Vuelo:
     """
-    Inserta un vuelo en una posición específica.
+    Inserta un vuelo en una posición específica, acotada a su carril.
     """
     return LinkedListManager.insert_at(db, lista.id, vuelo, position)
 
@@ -77,6 +78,18 @@ def remove_at_position(db: Session, lista: ListaVuelos, position: int) -> Option
     """
     return LinkedListManager.remove_at(db, lista.id, position)
 
+def remove_flight(db: Session, lista: ListaVuelos, vuelo_id: int) -> Optional[Vuelo]:
+    """
+    Quita un vuelo concreto de la lista.
+    """
+    return LinkedListManager.remove_flight(db, lista.id, vuelo_id)
+
+def get_position(db: Session, lista: ListaVuelos, vuelo_id: int) -> int:
+    """
+    Obtiene la posición de un vuelo en la lista (-1 si no está).
+    """
+    return LinkedListManager.position_of(db, lista.id, vuelo_id)
+
 def prioritize_flights(db: Session, lista: ListaVuelos) -> Dict:
     """
     Reorganiza la lista según la prioridad del estado de los vuelos.
@@ -97,23 +110,13 @@ def rebuild_list_from_db(db: Session, lista: ListaVuelos, vuelos: List[Vuelo]) -
     LinkedListManager.clear_cache(lista.id)
     return LinkedListManager.get_list_instance(db, lista.id)
 
-def reorder_flight(db: Session, lista: ListaVuelos, from_pos: int, to_pos: int) -> Optional[Vuelo]:
+def reorder_flight(db: Session, lista: ListaVuelos, from_pos: int, to_pos: int) -> Optional[FlightRecord]:
     """
-    Reordena un vuelo de una posición a otra.
+    Reordena un vuelo de una posición a otra (el vuelo queda delante del que
+    ocupaba to_pos). Reenlaza el nodo en un solo paso con LinkedListManager.move.
     """
-    # Obtener el vuelo a mover
-    vuelo = LinkedListManager.get_at(db, lista.id, from_pos)
-    if not vuelo:
-        return None
-    
-    # Eliminarlo de la posición actual
-    LinkedListManager.remove_at(db, lista.id, from_pos)
-    
-    # Ajustar la posición destino si es necesaria
+    # to_pos cuenta el vuelo aún en from_pos; move recibe la posición final
     if to_pos > from_pos:
         to_pos -= 1
     
-    # Insertar en la nueva posición
-    LinkedListManager.insert_at(db, lista.id, vuelo, to_pos)
-    
-    return vuelo
+    return LinkedListManager.move(db, lista.id, from_pos, to_pos)
@@ -1,181 +1,1004 @@
 """
 Gestor de lista enlazada que conecta la implementación en memoria con los datos persistentes
 """
-from typing import Dict, List, Optional
+import asyncio
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type, Union
 from sqlalchemy.orm import Session
-from app.models import Vuelo, ListaVuelos, EstadoVuelo
+from app.models import Vuelo
 from app.domain.memory_linked_list import MemoryLinkedList
+from app.domain.mapped_flight_list import MappedFlightList
+from app.domain.flight_record import FlightRecord
+from app.domain.flight_ref import FlightRef
+from app.domain.priority_lane_list import PriorityLaneList, lane_for, lane_for_status, lane_statuses, visualize_flights
 from app.repositories.flight_repository import FlightRepository
 from app.repositories.list_repository import ListRepository
+from app.repositories.unit_of_work import on_commit, on_rollback
+from app.services.flight_json import encode, flight_payload
+from app.services.list_feed import RELOAD, ListFeed, Subscription
+from app.services.list_changes import ChangeLog
+from app.services.list_cache import (ListCache, FlightCache,
+                                     ESTIMATED_BYTES_PER_FLIGHT, ESTIMATED_BYTES_PER_REF)
+from app.services.list_journal import ListJournal, flight_to_record
+from app.services.rw_lock import ReadWriteLock
+
+# Separación entre claves de orden consecutivas; deja hueco para insertar
+# entre dos vuelos sin renumerar
+POSITION_GAP = 1024.0
+
+# Lo que guarda cada nodo: los datos del vuelo o solo su referencia (nodos por ID).
+# Ambos son inmutables: para cambiar un vuelo se sustituye su entrada
+ListEntry = Union[FlightRecord, FlightRef]
+
+class BatchOperationError(ValueError):
+    """Una operación de LinkedListManager.apply_operations que no se pudo aplicar"""
+    def __init__(self, index: int, op: str, reason: str):
+        super().__init__(f"Operación {index} ({op}): {reason}")
+        self.index = index
+        self.op = op
+        self.reason = reason
 
 class LinkedListManager:
     """
     Gestiona la lista doblemente enlazada en memoria y su sincronización con la base de datos
     """
-    # Almacén en memoria de listas enlazadas - clave: lista_id, valor: instancia MemoryLinkedList
-    _lists_cache: Dict[int, MemoryLinkedList[Vuelo]] = {}
+    # Almacén en memoria de listas enlazadas (LRU acotada) - clave: lista_id, valor: instancia PriorityLaneList
+    _lists_cache: ListCache[PriorityLaneList[ListEntry]] = ListCache()
+    # Implementación usada para los carriles de las nuevas listas en memoria
+    # (MemoryLinkedList: O(n) por posición, IndexedLinkedList: O(log n) por posición)
+    list_class: Type[MemoryLinkedList] = MemoryLinkedList
+    # Un cerrojo de lectores/escritor por lista: lecturas concurrentes, escrituras exclusivas
+    _locks: Dict[int, ReadWriteLock] = {}
+    _locks_guard = threading.Lock()
+    # Evita que dos hilos carguen a la vez una lista que no está en caché
+    _load_guard = threading.Lock()
+    # Versión de la BD con la que está construida cada lista cacheada y última comprobación.
+    # Con varios procesos (workers) cada uno tiene su caché; la versión indica si otro la cambió
+    _versions: Dict[int, int] = {}
+    _checked_at: Dict[int, float] = {}
+    # Segundos entre comprobaciones de la versión de una misma lista (0: en cada acceso)
+    version_check_interval: float = 0.0
+    # Segundos durante los que las lecturas sirven la copia cacheada sin comprobar su
+    # versión ni abrir conexión a la BD (0: desactivado). Las escrituras de este proceso
+    # la mantienen al día; es lo que puede tardar en verse un cambio de otro proceso
+    read_staleness: float = 0.0
+    # Diario de operaciones para recuperar las listas al reiniciar (desactivado por defecto)
+    _journal: Optional[ListJournal] = None
+    # Nodos por ID: los nodos guardan un FlightRef (sin código, índice solo por ID) y los vuelos se cargan de la BD
+    # al leerlos, por páginas; los leídos recientemente se guardan en _hot_flights
+    lazy_nodes: bool = False
+    _hot_flights: FlightCache[FlightRecord] = FlightCache()
+    # Suscriptores a los cambios de cada lista y número de secuencia del
+    # último cambio de cada una (avanza con el cerrojo de escritura tomado)
+    _feed: ListFeed = ListFeed()
+    _seq: Dict[int, int] = {}
+    _discarded_at: Dict[int, int] = {}
+    # Últimos cambios de las listas que sincronizan los clientes sin WebSocket.
+    # Las secuencias son de este proceso: epoch las distingue de las de otro
+    _changes: ChangeLog = ChangeLog()
+    epoch: str = uuid.uuid4().hex[:12]
+    
+    @classmethod
+    def _lock_for(cls, lista_id: int) -> ReadWriteLock:
+        """Devuelve el cerrojo de lectores/escritor de una lista (lo crea si no existe)"""
+        with cls._locks_guard:
+            lock = cls._locks.get(lista_id)
+            if lock is None:
+                lock = cls._locks[lista_id] = ReadWriteLock()
+            return lock
+    
+    @classmethod
+    def use_list_implementation(cls, list_class: Type[MemoryLinkedList]) -> None:
+        """
+        Selecciona la implementación de lista en memoria a utilizar.
+        Limpia la caché para que las listas se reconstruyan con la nueva implementación.
+        """
+        cls.list_class = list_class
+        cls.clear_cache()
+    
+    @classmethod
+    def use_lazy_nodes(cls, enabled: bool = True, hot_flights: int = 1024) -> None:
+        """
+        Activa o desactiva los nodos por ID. Con ellos cada nodo guarda solo
+        un FlightRef (ID, estado y clave de orden), la lista se indexa solo
+        por ID y las lecturas cargan de la BD únicamente los vuelos pedidos,
+        con una consulta IN por página; hot_flights es el tamaño de la caché
+        de vuelos ya cargados.
+        Limpia la caché para que las listas se reconstruyan en el nuevo modo.
+        """
+        cls.lazy_nodes = enabled
+        cls._hot_flights.configure(hot_flights)
+        cls._hot_flights.clear()
+        cls._lists_cache.bytes_per_flight = ESTIMATED_BYTES_PER_REF if enabled else ESTIMATED_BYTES_PER_FLIGHT
+        cls.clear_cache()
+    
+    @classmethod
+    def _new_list(cls) -> PriorityLaneList[ListEntry]:
+        """Crea una lista vacía por carriles con la implementación configurada"""
+        return PriorityLaneList(cls.list_class)
+    
+    @classmethod
+    def _entry_for(cls, vuelo: Union[Vuelo, FlightRecord]) -> ListEntry:
+        """Lo que se guarda en el nodo de un vuelo según el modo de la caché"""
+        if cls.lazy_nodes:
+            return FlightRef.of(vuelo)
+        return vuelo if isinstance(vuelo, FlightRecord) else FlightRecord.of(vuelo)
+    
+    @classmethod
+    def _hydrate(cls, db: Session, entries: Iterable[ListEntry]) -> List[FlightRecord]:
+        """
+        Convierte las entradas de una lista en registros de vuelo. Con nodos
+        por ID carga los que no estén en _hot_flights con una consulta
+        IN (...); los que ya no existan en la BD se omiten.
+        """
+        entries = list(entries)
+        if not cls.lazy_nodes:
+            return entries
+        
+        ids = [entry.id for entry in entries]
+        flights = cls._hot_flights.get_many(ids)
+        missing = [flight_id for flight_id in ids if flight_id not in flights]
+        if missing:
+            loaded = {values["id"]: FlightRecord.from_values(values)
+                      for values in FlightRepository(db).get_values_by_ids(missing)}
+            cls._hot_flights.put_many(loaded)
+            flights.update(loaded)
+        return [flights[flight_id] for flight_id in ids if flight_id in flights]
+    
+    @classmethod
+    def _hydrate_one(cls, db: Session, entry: Optional[ListEntry]) -> Optional[FlightRecord]:
+        if entry is None:
+            return None
+        flights = cls._hydrate(db, [entry])
+        return flights[0] if flights else None
     
     @classmethod
-    def get_list_instance(cls, db: Session, lista_id: int) -> MemoryLinkedList[Vuelo]:
+    def get_list_instance(cls, db: Session, lista_id: int) -> PriorityLaneList[ListEntry]:
         """
         Obtiene una instancia de lista enlazada en memoria para una lista específica
         Si no existe, la crea y la llena con los vuelos de la base de datos
         """
-        # Si ya está en caché, devolverla
+        # Si ya está en caché y nadie la ha cambiado en la BD, devolverla
+        memory_list = cls._lists_cache.get(lista_id)
+        if memory_list is not None and cls._is_current(db, lista_id):
+            return memory_list
+        
+        with cls._load_guard:
+            # Otro hilo pudo cargarla mientras se esperaba
+            memory_list = cls._lists_cache.peek(lista_id)
+            if memory_list is not None and cls._is_current(db, lista_id):
+                return memory_list
+            return cls._load_list(db, lista_id)
+    
+    @classmethod
+    def _list_for_read(cls, db: Session, lista_id: int) -> PriorityLaneList[ListEntry]:
+        """
+        Lista para una lectura: la copia cacheada sin tocar la BD si su versión
+        se comprobó hace menos de read_staleness segundos; si no, get_list_instance
+        """
+        checked_at = cls._checked_at.get(lista_id, float("-inf"))
+        if time.monotonic() - checked_at < cls.read_staleness:
+            memory_list = cls._lists_cache.get(lista_id)
+            if memory_list is not None:
+                return memory_list
+        return cls.get_list_instance(db, lista_id)
+    
+    @classmethod
+    def has_list(cls, db: Session, lista_id: int) -> bool:
+        """Indica si una lista existe; si está en caché no consulta la BD"""
         if lista_id in cls._lists_cache:
-            return cls._lists_cache[lista_id]
+            return True
+        return ListRepository(db).get_version(lista_id) is not None
+    
+    @classmethod
+    def _is_current(cls, db: Session, lista_id: int) -> bool:
+        """
+        Indica si la lista cacheada sigue en la versión de la BD.
+        Consulta solo la columna version, y como mucho cada version_check_interval segundos.
+        """
+        now = time.monotonic()
+        if now - cls._checked_at.get(lista_id, float("-inf")) < cls.version_check_interval:
+            return True
+        
+        if ListRepository(db).get_version(lista_id) != cls._versions.get(lista_id):
+            return False
+        cls._checked_at[lista_id] = now
+        return True
+    
+    @classmethod
+    def mark_changed(cls, db: Session, lista_id: int) -> None:
+        """
+        Incrementa la versión de una lista tras modificarla para que los demás
+        procesos reconstruyan su copia. Si la versión de la BD no era la de
+        nuestra copia, otro proceso también la cambió y la copia se descarta.
+        """
+        # Si la transacción se deshace, la copia en memoria ya no coincide con la BD
+        on_rollback(db, lambda: cls._discard_list(lista_id))
         
-        # Si no, crear una nueva lista y llenarla con los vuelos de la BD
+        list_repo = ListRepository(db)
+        expected = cls._versions.get(lista_id) if lista_id in cls._lists_cache else None
+        if expected is not None and list_repo.bump_version(lista_id, expected):
+            # La BD tenía nuestra versión: la copia sigue al día con este cambio
+            cls._versions[lista_id] = expected + 1
+            cls._checked_at[lista_id] = time.monotonic()
+            return
+        
+        list_repo.bump_version(lista_id)
+        cls.clear_cache(lista_id)
+    
+    @classmethod
+    def _load_list(cls, db: Session, lista_id: int) -> PriorityLaneList[ListEntry]:
+        """Construye la lista en memoria a partir de la BD y la guarda en caché"""
         list_repo = ListRepository(db)
         flight_repo = FlightRepository(db)
         
-        lista_db = list_repo.get_by_id(lista_id)
-        if not lista_db:
+        # La versión se lee antes que los vuelos: si cambian mientras tanto,
+        # la próxima comprobación detecta la diferencia y se vuelve a cargar
+        version = list_repo.get_version(lista_id)
+        if version is None:
             raise ValueError(f"Lista con ID {lista_id} no encontrada")
         
         # Crear lista en memoria
-        memory_list = MemoryLinkedList[Vuelo]()
-        
-        # Obtener vuelos ordenados por prioridad
-        vuelos = flight_repo.get_flights_by_list_id(lista_id)
-        
-        # Ordenar vuelos por prioridad
-        vuelos_por_prioridad = {
-            "emergencia": [],
-            "embarque": [],
-            "programado": [],
-            "otros": []
-        }
-        
-        for v in vuelos:
-            if v.estado == EstadoVuelo.EMERGENCIA:
-                vuelos_por_prioridad["emergencia"].append(v)
-            elif v.estado == EstadoVuelo.EMBARQUE:
-                vuelos_por_prioridad["embarque"].append(v)
-            elif v.estado == EstadoVuelo.PROGRAMADO:
-                vuelos_por_prioridad["programado"].append(v)
-            else:
-                vuelos_por_prioridad["otros"].append(v)
-        
-        # Añadir vuelos a la lista en orden de prioridad
-        for v in vuelos_por_prioridad["emergencia"]:
-            memory_list.add_last(v)
-        for v in vuelos_por_prioridad["embarque"]:
-            memory_list.add_last(v)
-        for v in vuelos_por_prioridad["programado"]:
-            memory_list.add_last(v)
-        for v in vuelos_por_prioridad["otros"]:
-            memory_list.add_last(v)
+        memory_list = cls._new_list()
+        
+        # Una sola consulta ordenada por la clave de orden persistida; cada vuelo
+        # se coloca al final del carril de su estado, conservando el orden guardado.
+        # Se leen las columnas sin crear instancias ORM; con nodos por ID, solo
+        # las que necesita la lista
+        if cls.lazy_nodes:
+            entries = [FlightRef(*row) for row in flight_repo.get_flight_keys_by_list_id(lista_id)]
+            cls._hot_flights.discard(entry.id for entry in entries)
+        else:
+            entries = [FlightRecord.from_values(values) for values in flight_repo.get_values_by_list_id(lista_id)]
+        
+        unranked_lanes = set()
+        for entry in entries:
+            memory_list.add_last(entry)
+            if entry.orden is None:
+                unranked_lanes.add(lane_for(entry))
+        
+        # Vuelos sin clave de orden (datos anteriores): se numeran una vez
+        for lane in unranked_lanes:
+            cls._renumber_lane(db, lista_id, memory_list, lane)
+        
+        # El diario no refleja esta versión: se parte de una instantánea nueva
+        if cls._journal is not None and cls._journal.version_of(lista_id) != version:
+            cls._journal.write_snapshot(lista_id, version, cls._snapshot_flights(db, lista_id, memory_list))
         
         # Guardar en caché
-        cls._lists_cache[lista_id] = memory_list
+        cls._versions[lista_id] = version
+        cls._checked_at[lista_id] = time.monotonic()
+        cls._lists_cache.put(lista_id, memory_list)
         return memory_list
     
+    @classmethod
+    def _snapshot_flights(cls, db: Session, lista_id: int,
+                          memory_list: PriorityLaneList[ListEntry]) -> Iterable[FlightRecord]:
+        """Vuelos completos de una lista en su orden, para escribir su instantánea"""
+        if not cls.lazy_nodes:
+            return memory_list
+        by_id = {values["id"]: values for values in FlightRepository(db).get_values_by_list_id(lista_id)}
+        return [FlightRecord.from_values(by_id[entry.id]) for entry in memory_list if entry.id in by_id]
+    
     @classmethod
     def clear_cache(cls, lista_id: Optional[int] = None):
         """
         Limpia la caché de listas enlazadas
-        Si se proporciona lista_id, solo limpia esa lista específica
+        Si se proporciona lista_id, solo limpia esa lista específica.
+        La caché de vuelos cargados se vacía siempre: puede tener datos
+        leídos en una transacción que se ha deshecho.
         """
         if lista_id is not None:
-            if lista_id in cls._lists_cache:
-                del cls._lists_cache[lista_id]
+            cls._lists_cache.pop(lista_id)
         else:
             cls._lists_cache.clear()
+        cls._hot_flights.clear()
     
     @classmethod
-    def add_first(cls, db: Session, lista_id: int, vuelo: Vuelo) -> Vuelo:
-        """Añade un vuelo al principio de la lista"""
-        # Asegurar que el vuelo esté en la BD y asociado a la lista
+    def _discard_list(cls, lista_id: int) -> None:
+        """
+        Descarta la copia en memoria de una lista tras deshacer una transacción
+        y avisa a sus suscriptores para que la recarguen. Cada cambio de la
+        transacción registra esta llamada: solo avisa la primera.
+        """
+        with cls._lock_for(lista_id).write_locked():
+            cls.clear_cache(lista_id)
+            if cls._seq.get(lista_id, 0) != cls._discarded_at.get(lista_id):
+                cls._emit_reload(lista_id)
+                cls._discarded_at[lista_id] = cls._seq[lista_id]
+    
+    @classmethod
+    def configure_cache(cls, max_lists: Optional[int] = None, max_bytes: Optional[int] = None) -> None:
+        """
+        Establece los límites de la caché de listas: número máximo de listas y
+        presupuesto aproximado de memoria en bytes (None desactiva el límite)
+        """
+        cls._lists_cache.configure(max_lists=max_lists, max_bytes=max_bytes)
+    
+    @classmethod
+    def add_eviction_callback(cls, callback: Callable[[int, PriorityLaneList[ListEntry]], None]) -> None:
+        """Registra una función que se llama con (lista_id, lista) al desalojar una lista de la caché"""
+        cls._lists_cache.add_eviction_callback(callback)
+    
+    @classmethod
+    def cache_stats(cls) -> Dict[str, Optional[int]]:
+        """Devuelve los contadores de aciertos, fallos y desalojos de la caché"""
+        return cls._lists_cache.stats()
+    
+    @classmethod
+    def enable_journal(cls, directory: str, snapshot_every: int = 10_000) -> None:
+        """
+        Activa el diario de operaciones en un directorio. Cada lista se
+        compacta en una instantánea cada snapshot_every operaciones.
+        """
+        if cls._journal is not None:
+            cls._journal.close()
+        cls._journal = ListJournal(directory, snapshot_every)
+    
+    @classmethod
+    def _record(cls, db: Session, lista_id: int, entry: Dict[str, Any]) -> None:
+        """Añade una entrada al diario cuando se confirme la transacción"""
+        if cls._journal is not None:
+            on_commit(db, lambda: cls._append_to_journal(lista_id, entry))
+    
+    @classmethod
+    def _append_to_journal(cls, lista_id: int, entry: Dict[str, Any]) -> None:
+        journal = cls._journal
+        if journal is None:
+            return
+        journal.append(lista_id, entry, cls._versions.get(lista_id))
+        if journal.needs_snapshot(lista_id):
+            # Sin esperar: quien anota puede tener el cerrojo de otra lista
+            cls.snapshot(lista_id, blocking=False)
+    
+    @classmethod
+    def _watched(cls, lista_id: int) -> bool:
+        """Indica si alguien sigue los cambios de la lista (solo entonces se calculan sus posiciones)"""
+        return cls._feed.has_subscribers(lista_id) or cls._changes.is_tracked(lista_id)
+    
+    @classmethod
+    def _emit(cls, db: Session, lista_id: int, build_event: Callable[[], Dict[str, Any]]) -> None:
+        """
+        Anota un cambio de la lista, con su cerrojo de escritura tomado:
+        avanza su secuencia y, si alguien la sigue, guarda el evento de
+        build_event en el registro de cambios y, si tiene suscriptores, lo
+        serializa una vez y lo difunde al confirmar la transacción.
+        Si la copia en memoria se descartó (mark_changed) hay que recargarla.
+        """
+        if lista_id not in cls._lists_cache:
+            cls._emit_reload(lista_id, db)
+            return
+        seq = cls._seq[lista_id] = cls._seq.get(lista_id, 0) + 1
+        if not cls._watched(lista_id):
+            return
+        event = {"seq": seq, **build_event()}
+        # El registro sigue a la lista en memoria, como las lecturas: si la
+        # transacción se deshace, _discard_list anota una recarga detrás
+        cls._changes.append(lista_id, seq, event)
+        if cls._feed.has_subscribers(lista_id):
+            message = encode(event)
+            on_commit(db, lambda: cls._feed.publish(lista_id, seq, message))
+    
+    @classmethod
+    def _emit_reload(cls, lista_id: int, db: Optional[Session] = None) -> None:
+        """
+        Anota un cambio que no se describe evento a evento (con el cerrojo de
+        escritura tomado): quien siga la lista debe recargarla entera. Los
+        suscriptores reciben el aviso al confirmar la transacción si se
+        indica db, o en el acto si no
+        """
+        seq = cls._seq[lista_id] = cls._seq.get(lista_id, 0) + 1
+        cls._changes.append(lista_id, seq, {"seq": seq, "tipo": RELOAD})
+        if db is None:
+            cls._feed.reload(lista_id, seq)
+        elif cls._feed.has_subscribers(lista_id):
+            on_commit(db, lambda: cls._feed.reload(lista_id, seq))
+    
+    @classmethod
+    def subscribe(cls, lista_id: int, loop: asyncio.AbstractEventLoop) -> Subscription:
+        """Empieza a recibir los eventos de una lista en el bucle de eventos loop"""
+        return cls._feed.subscribe(lista_id, loop)
+    
+    @classmethod
+    def unsubscribe(cls, subscription: Subscription) -> None:
+        """Deja de recibir eventos y despierta a quien espera en subscription.get() con CLOSED"""
+        cls._feed.unsubscribe(subscription)
+        cls._feed.close(subscription)
+    
+    @classmethod
+    def feed_snapshot(cls, db: Session, lista_id: int) -> Tuple[int, str]:
+        """
+        La lista completa serializada para un suscriptor y la secuencia del
+        último cambio que incluye; los eventos hasta esa secuencia sobran.
+        Se serializa una vez por versión de la lista para todos los suscriptores.
+        """
+        with cls._lock_for(lista_id).read_locked():
+            memory_list = cls._list_for_read(db, lista_id)
+            seq = cls._seq.get(lista_id, 0)
+            text = cls._feed.snapshot(lista_id, (seq, cls._versions.get(lista_id)), lambda: encode({
+                "tipo": "instantanea",
+                "seq": seq,
+                "vuelos": [flight_payload(vuelo) for vuelo in cls._hydrate(db, memory_list.get_all())],
+            }))
+        return seq, text
+    
+    @classmethod
+    def changes_since(cls, db: Session, lista_id: int, since: Optional[int],
+                      epoch: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Cambios de una lista posteriores a la secuencia since, para clientes
+        que sincronizan sin WebSocket. Si no se pueden dar (primera petición,
+        since ya salió del registro, hubo una recarga o epoch es de otro
+        proceso) devuelve resincronizar=True con la lista completa, y el
+        registro empieza a guardar los cambios de la lista si no lo hacía.
+        """
+        with cls._lock_for(lista_id).read_locked():
+            memory_list = cls._list_for_read(db, lista_id)
+            seq = cls._seq.get(lista_id, 0)
+            changes = None
+            if since is not None and epoch == cls.epoch:
+                changes = cls._changes.since(lista_id, since, seq)
+            if changes is not None:
+                return {"epoca": cls.epoch, "seq": seq, "resincronizar": False, "cambios": changes}
+            # Con el cerrojo de lectura no hay escritores: no se pierde ningún cambio posterior a seq
+            cls._changes.track(lista_id, seq)
+            return {"epoca": cls.epoch, "seq": seq, "resincronizar": True, "cambios": [],
+                    "vuelos": cls._hydrate(db, memory_list.get_all())}
+    
+    @classmethod
+    def snapshot(cls, lista_id: int, blocking: bool = True) -> bool:
+        """
+        Escribe la instantánea de una lista cacheada y vacía su diario.
+        Sin blocking no espera al cerrojo de la lista (se reintentará en la siguiente entrada).
+        Con nodos por ID la lista no tiene los datos de los vuelos: la
+        instantánea se compacta a partir de la anterior y del diario.
+        """
+        memory_list = cls._lists_cache.peek(lista_id)
+        if cls._journal is None or memory_list is None:
+            return False
+        if cls.lazy_nodes:
+            return cls._journal.compact(lista_id)
+        
+        lock = cls._lock_for(lista_id)
+        if not lock.acquire_read(blocking):
+            return False
+        try:
+            cls._journal.write_snapshot(lista_id, cls._versions.get(lista_id), memory_list)
+        finally:
+            lock.release_read()
+        return True
+    
+    @classmethod
+    def snapshot_all(cls) -> int:
+        """Escribe la instantánea de todas las listas cacheadas (p. ej. al apagar)"""
+        return sum(1 for lista_id in cls._lists_cache if cls.snapshot(lista_id))
+    
+    @classmethod
+    def open_snapshot(cls, lista_id: int) -> Optional[MappedFlightList]:
+        """
+        Abre la última instantánea de una lista como lista de solo lectura
+        mapeada en memoria (sin cargar sus vuelos), p. ej. para una réplica
+        de lectura. No incluye las operaciones anotadas después en el diario.
+        El llamador debe cerrarla.
+        """
+        path = cls._journal.snapshot_path(lista_id) if cls._journal is not None else None
+        return MappedFlightList(path) if path else None
+    
+    @classmethod
+    def recover_from_journal(cls, db: Session) -> int:
+        """
+        Carga en caché las listas del diario (instantánea + operaciones
+        posteriores) sin consultar sus vuelos en la BD. Solo se usa una lista
+        si su versión coincide con la de la BD; si no, se cargará desde la BD
+        cuando se pida. Devuelve el número de listas recuperadas.
+        """
+        if cls._journal is None:
+            return 0
+        
+        list_repo = ListRepository(db)
+        recovered = 0
+        for lista_id in cls._journal.list_ids():
+            result = cls._journal.recover(lista_id)
+            if result is None:
+                continue
+            version, flights = result
+            if version is None or version != list_repo.get_version(lista_id):
+                continue
+            
+            memory_list = cls._new_list()
+            for vuelo in flights:
+                memory_list.add_last(cls._entry_for(vuelo))
+            cls._versions[lista_id] = version
+            cls._checked_at[lista_id] = time.monotonic()
+            cls._lists_cache.put(lista_id, memory_list)
+            recovered += 1
+        return recovered
+    
+    @classmethod
+    def _place(cls, db: Session, lista_id: int, vuelo: Vuelo,
+               insert: Callable[[PriorityLaneList[ListEntry], ListEntry], None]) -> PriorityLaneList[ListEntry]:
+        """
+        Coloca un vuelo en la lista en memoria con la operación indicada y
+        persiste la relación y su clave de orden en la BD
+        """
         flight_repo = FlightRepository(db)
+        memory_list = cls.get_list_instance(db, lista_id)
         
-        # Establecer la relación en la BD
+        # Establecer la relación con la lista
+        previous_id = vuelo.lista_vuelos_id
         vuelo.lista_vuelos_id = lista_id
+        
+        # Añadir a la lista en memoria (si ya estaba, se reubica)
+        previous_position = memory_list.position_of(vuelo.id) if cls._watched(lista_id) else -1
+        memory_list.remove(vuelo.id)
+        insert(memory_list, cls._entry_for(vuelo))
+        cls._hot_flights.discard([vuelo.id])
+        
+        # Persistir la relación y la posición en la BD
+        vuelo.orden = cls._assign_position(db, lista_id, memory_list, vuelo.id)
         flight_repo.update(vuelo)
         
-        # Añadir a la lista en memoria
-        memory_list = cls.get_list_instance(db, lista_id)
-        memory_list.add_first(vuelo)
+        cls.mark_changed(db, lista_id)
+        cls._record(db, lista_id, {"op": "upsert", "vuelo": flight_to_record(vuelo)})
+        if previous_position >= 0:
+            cls._emit(db, lista_id, lambda: {"tipo": "movido", "id": vuelo.id, "desde": previous_position,
+                                             "hasta": memory_list.position_of(vuelo.id)})
+        else:
+            cls._emit(db, lista_id, lambda: {"tipo": "insertado", "posicion": memory_list.position_of(vuelo.id),
+                                             "vuelo": flight_payload(vuelo)})
+        # La baja en el diario y el evento de la lista anterior los anota discard_flight
+        if previous_id and previous_id != lista_id:
+            cls.mark_changed(db, previous_id)
+        
+        return memory_list
+    
+    @classmethod
+    def _leave_previous_list(cls, db: Session, vuelo: Vuelo, lista_id: int) -> None:
+        """
+        Si el vuelo estaba en otra lista, lo quita de su copia en memoria y
+        anota la baja. Se llama antes de tomar el cerrojo de la lista destino
+        para no tener nunca dos cerrojos de lista a la vez.
+        """
+        if vuelo.lista_vuelos_id and vuelo.lista_vuelos_id != lista_id:
+            cls.discard_flight(vuelo.lista_vuelos_id, vuelo.id, db)
+    
+    @classmethod
+    def _assign_position(cls, db: Session, lista_id: int, memory_list: PriorityLaneList[ListEntry],
+                         vuelo_id: int) -> float:
+        """
+        Asigna al vuelo una clave de orden entre las de sus vecinos de carril
+        y la devuelve. Las claves son dispersas, así que normalmente basta con
+        el punto medio; si no quedan huecos (o algún vecino no tiene clave) se
+        renumera el carril.
+        """
+        prev_vuelo, next_vuelo = memory_list.neighbors(vuelo_id)
+        lower = prev_vuelo.orden if prev_vuelo else None
+        upper = next_vuelo.orden if next_vuelo else None
+        
+        if (prev_vuelo and lower is None) or (next_vuelo and upper is None):
+            cls._renumber_lane(db, lista_id, memory_list, memory_list.lane_name_of(vuelo_id))
+            return memory_list.find(vuelo_id).orden
         
-        print(f"Vuelo {vuelo.codigo} añadido al inicio de la lista {lista_id}")
-        print(f"Estado actual de la lista: {memory_list.visualize()}")
+        if lower is None and upper is None:
+            orden = 0.0
+        elif lower is None:
+            orden = upper - POSITION_GAP
+        elif upper is None:
+            orden = lower + POSITION_GAP
+        else:
+            orden = (lower + upper) / 2
+            if not lower < orden < upper:
+                cls._renumber_lane(db, lista_id, memory_list, memory_list.lane_name_of(vuelo_id))
+                return memory_list.find(vuelo_id).orden
         
+        entry = memory_list.find(vuelo_id)
+        if entry is not None:
+            memory_list.update_in_place(entry.replace(orden=orden))
+        return orden
+    
+    @classmethod
+    def _renumber_lane(cls, db: Session, lista_id: int, memory_list: PriorityLaneList[ListEntry], lane: str) -> None:
+        """Reasigna claves de orden equiespaciadas a todos los vuelos de un carril"""
+        positions = {}
+        for i, entry in enumerate(memory_list.lane_items(lane)):
+            positions[entry.id] = i * POSITION_GAP
+            memory_list.update_in_place(entry.replace(orden=positions[entry.id]))
+        FlightRepository(db).update_positions(positions)
+        cls._hot_flights.discard(positions)
+        cls._record(db, lista_id, {"op": "ranks", "orden": positions})
+    
+    @classmethod
+    def add_first(cls, db: Session, lista_id: int, vuelo: Vuelo) -> Vuelo:
+        """Añade un vuelo al principio del carril de su estado"""
+        cls._leave_previous_list(db, vuelo, lista_id)
+        with cls._lock_for(lista_id).write_locked():
+            cls._place(db, lista_id, vuelo, lambda lst, entry: lst.add_first(entry))
         return vuelo
 
     @classmethod
     def add_last(cls, db: Session, lista_id: int, vuelo: Vuelo) -> Vuelo:
-        """Añade un vuelo al final de la lista"""
-        # Establecer la relación en la BD
-        flight_repo = FlightRepository(db)
-        vuelo.lista_vuelos_id = lista_id
-        flight_repo.update(vuelo)
-        
-        # Añadir a la lista en memoria
-        memory_list = cls.get_list_instance(db, lista_id)
-        memory_list.add_last(vuelo)
-        
-        print(f"Vuelo {vuelo.codigo} añadido al final de la lista {lista_id}")
-        print(f"Estado actual de la lista: {memory_list.visualize()}")
-        
+        """Añade un vuelo al final del carril de su estado"""
+        cls._leave_previous_list(db, vuelo, lista_id)
+        with cls._lock_for(lista_id).write_locked():
+            cls._place(db, lista_id, vuelo, lambda lst, entry: lst.add_last(entry))
         return vuelo
     
+    @classmethod
+    def add_last_many(cls, db: Session, lista_id: int, flights: List[Dict[str, Any]]) -> List[int]:
+        """
+        Crea muchos vuelos nuevos y los añade al final de su carril en un solo
+        paso: calcula las claves de orden en memoria, los inserta con un único
+        INSERT por lotes (ya con lista y orden) y los enlaza en la lista.
+        flights son los valores de las columnas de cada vuelo salvo id,
+        lista_vuelos_id y orden. Devuelve los IDs creados en el mismo orden.
+        """
+        if not flights:
+            return []
+        with cls._lock_for(lista_id).write_locked():
+            memory_list = cls.get_list_instance(db, lista_id)
+            
+            next_orden: Dict[str, float] = {}
+            rows = []
+            for values in flights:
+                lane = lane_for_status(values["estado"])
+                if lane not in next_orden:
+                    next_orden[lane] = cls._lane_end(db, lista_id, memory_list, lane)
+                rows.append({**values, "lista_vuelos_id": lista_id, "orden": next_orden[lane]})
+                next_orden[lane] += POSITION_GAP
+            
+            flight_ids = FlightRepository(db).create_many(rows)
+            records = [FlightRecord.from_values({**values, "id": flight_id})
+                       for flight_id, values in zip(flight_ids, rows)]
+            for record in records:
+                memory_list.add_last(cls._entry_for(record))
+            
+            cls.mark_changed(db, lista_id)
+            cls._record(db, lista_id, {"op": "upserts", "vuelos": [flight_to_record(r) for r in records]})
+            # Un evento por vuelo no compensa: los suscriptores recargan la lista
+            cls._emit_reload(lista_id, db)
+            return flight_ids
+    
+    @classmethod
+    def _lane_end(cls, db: Session, lista_id: int, memory_list: PriorityLaneList[ListEntry], lane: str) -> float:
+        """Clave de orden para añadir un vuelo tras el último de un carril"""
+        last = memory_list.lane_last(lane)
+        if last is None:
+            return 0.0
+        if last.orden is None:
+            cls._renumber_lane(db, lista_id, memory_list, lane)
+            last = memory_list.lane_last(lane)
+        return last.orden + POSITION_GAP
+    
     @classmethod
     def insert_at(cls, db: Session, lista_id: int, vuelo: Vuelo, position: int) -> Vuelo:
-        """Inserta un vuelo en una posición específica"""
-        # Establecer la relación en la BD
+        """Inserta un vuelo en una posición específica, acotada a los límites del carril de su estado"""
+        cls._leave_previous_list(db, vuelo, lista_id)
+        with cls._lock_for(lista_id).write_locked():
+            cls._place(db, lista_id, vuelo, lambda lst, entry: lst.insert_at(position, entry))
+            return vuelo
+    
+    @classmethod
+    def _persist_move(cls, db: Session, lista_id: int, memory_list: PriorityLaneList[ListEntry],
+                      vuelo_id: int, from_pos: int) -> None:
+        """
+        Da al vuelo movido una clave de orden entre sus nuevos vecinos y la
+        persiste; el resto de vuelos no cambia (salvo si hay que renumerar el carril)
+        """
+        orden = cls._assign_position(db, lista_id, memory_list, vuelo_id)
+        FlightRepository(db).update_positions({vuelo_id: orden})
+        cls._hot_flights.discard([vuelo_id])
+        cls.mark_changed(db, lista_id)
+        cls._record(db, lista_id, {"op": "ranks", "orden": {vuelo_id: orden}})
+        cls._emit(db, lista_id, lambda: {"tipo": "movido", "id": vuelo_id, "desde": from_pos,
+                                         "hasta": memory_list.position_of(vuelo_id)})
+    
+    @classmethod
+    def move(cls, db: Session, lista_id: int, from_pos: int, to_pos: int) -> Optional[FlightRecord]:
+        """
+        Mueve el vuelo de una posición a otra (acotada a su carril) reenlazando
+        su nodo: sin quitarlo de la lista ni de la BD y con una única
+        actualización de su clave de orden. Devuelve el vuelo movido.
+        """
+        with cls._lock_for(lista_id).write_locked():
+            memory_list = cls.get_list_instance(db, lista_id)
+            entry = memory_list.move(from_pos, to_pos)
+            if entry is None:
+                return None
+            cls._persist_move(db, lista_id, memory_list, entry.id, from_pos)
+            entry = memory_list.find(entry.id)
+        return cls._hydrate_one(db, entry)
+    
+    @classmethod
+    def move_before(cls, db: Session, lista_id: int, vuelo_id: int,
+                    anchor_id: Optional[int]) -> Optional[FlightRecord]:
+        """
+        Mueve un vuelo justo antes de otro (al final de su carril si anchor_id
+        es None) localizando ambos por ID en O(1). Devuelve el vuelo movido o
+        None si alguno de los dos no está en la lista.
+        """
+        with cls._lock_for(lista_id).write_locked():
+            memory_list = cls.get_list_instance(db, lista_id)
+            from_pos = memory_list.position_of(vuelo_id) if cls._watched(lista_id) else -1
+            if not memory_list.move_before(vuelo_id, anchor_id):
+                return None
+            cls._persist_move(db, lista_id, memory_list, vuelo_id, from_pos)
+            entry = memory_list.find(vuelo_id)
+        return cls._hydrate_one(db, entry)
+    
+    @classmethod
+    def apply_operations(cls, db: Session, lista_id: int,
+                         operations: List[Dict[str, Any]]) -> List[Union[Vuelo, FlightRecord]]:
+        """
+        Aplica en orden varias operaciones sobre una lista bajo un único
+        cerrojo de escritura, de modo que nadie ve los pasos intermedios.
+        Cada operación es un dict con "op" (add_first, add_last, insert_at,
+        remove_at o move) y sus argumentos: "vuelo" (Vuelo de esta sesión)
+        para las de añadir, "position" para insert_at y remove_at, "from_pos"
+        y "to_pos" para move. Devuelve el vuelo afectado por cada operación.
+
+        Todo o nada: si una operación no se puede aplicar lanza
+        BatchOperationError y descarta la copia en memoria, que se recarga de
+        la BD cuando el llamador deshace la transacción. Debe llamarse dentro
+        de una unidad de trabajo para que no haya commits intermedios.
+        """
+        # Los vuelos que vienen de otra lista la dejan antes de tomar este cerrojo;
+        # si la transacción se deshace, esa lista también se recarga de la BD
+        for operation in operations:
+            vuelo = operation.get("vuelo")
+            if vuelo is not None and vuelo.lista_vuelos_id and vuelo.lista_vuelos_id != lista_id:
+                previous_id = vuelo.lista_vuelos_id
+                on_rollback(db, lambda previous_id=previous_id: cls._discard_list(previous_id))
+                cls.discard_flight(previous_id, vuelo.id, db)
+
+        results = []
+        with cls._lock_for(lista_id).write_locked():
+            on_rollback(db, lambda: cls._discard_list(lista_id))
+            try:
+                for index, operation in enumerate(operations):
+                    result = cls._apply_operation(db, lista_id, index, operation)
+                    if result is None:
+                        raise BatchOperationError(index, operation["op"], "no hay ningún vuelo en esa posición")
+                    results.append(result)
+            except Exception:
+                # Sin esperar al rollback: nadie debe leer la lista a medio aplicar
+                cls.clear_cache(lista_id)
+                raise
+        return results
+
+    @classmethod
+    def _apply_operation(cls, db: Session, lista_id: int, index: int,
+                         operation: Dict[str, Any]) -> Optional[Union[Vuelo, FlightRecord]]:
+        """Aplica la operación index de apply_operations con el cerrojo de escritura ya tomado"""
+        op = operation["op"]
+        if op == "add_first":
+            cls._place(db, lista_id, operation["vuelo"], lambda lst, entry: lst.add_first(entry))
+            return operation["vuelo"]
+        if op == "add_last":
+            cls._place(db, lista_id, operation["vuelo"], lambda lst, entry: lst.add_last(entry))
+            return operation["vuelo"]
+        if op == "insert_at":
+            position = operation["position"]
+            cls._place(db, lista_id, operation["vuelo"], lambda lst, entry: lst.insert_at(position, entry))
+            return operation["vuelo"]
+        if op == "remove_at":
+            # remove_at acota la posición al último vuelo: en un lote, fuera de rango es un error
+            position = operation["position"]
+            size = cls.get_list_instance(db, lista_id).size()
+            if not 0 <= position < size:
+                raise BatchOperationError(index, op, f"posición {position} fuera de la lista de {size} vuelos")
+            return cls.remove_at(db, lista_id, position)
+        if op == "move":
+            return cls.move(db, lista_id, operation["from_pos"], operation["to_pos"])
+        raise ValueError(f"Operación desconocida: {op}")
+
+    @classmethod
+    def _unassign(cls, db: Session, vuelo: ListEntry) -> Vuelo:
+        """Quita en la BD la relación de un vuelo con su lista y su clave de orden"""
         flight_repo = FlightRepository(db)
-        vuelo.lista_vuelos_id = lista_id
-        flight_repo.update(vuelo)
-        
-        # Insertar en la lista en memoria
-        memory_list = cls.get_list_instance(db, lista_id)
-        memory_list.insert_at(position, vuelo)
-        
-        return vuelo
+        cls._hot_flights.discard([vuelo.id])
+        # Usar la instancia de esta sesión (el nodo puede guardar solo la referencia)
+        vuelo_db = flight_repo.get_by_id(vuelo.id)
+        if vuelo_db is None:
+            return vuelo
+        vuelo_db.lista_vuelos_id = None
+        vuelo_db.orden = None
+        flight_repo.update(vuelo_db)
+        return vuelo_db
     
     @classmethod
     def remove_at(cls, db: Session, lista_id: int, position: int) -> Optional[Vuelo]:
         """Elimina un vuelo de una posición específica"""
-        memory_list = cls.get_list_instance(db, lista_id)
-        vuelo = memory_list.remove_at(position)
+        with cls._lock_for(lista_id).write_locked():
+            memory_list = cls.get_list_instance(db, lista_id)
+            # remove_at acota la posición al último vuelo
+            removed_at = min(position, memory_list.size() - 1)
+            vuelo = memory_list.remove_at(position)
         
-        if vuelo:
-            # Actualizar en la BD
-            flight_repo = FlightRepository(db)
-            vuelo.lista_vuelos_id = None
-            flight_repo.update(vuelo)
+            if vuelo:
+                # Actualizar en la BD
+                vuelo = cls._unassign(db, vuelo)
+                cls.mark_changed(db, lista_id)
+                cls._record(db, lista_id, {"op": "remove", "id": vuelo.id})
+                cls._emit(db, lista_id, lambda: {"tipo": "eliminado", "id": vuelo.id, "posicion": removed_at})
         
-        return vuelo
+            return vuelo
+    
+    @classmethod
+    def remove_flight(cls, db: Session, lista_id: int, vuelo_id: int) -> Optional[Vuelo]:
+        """Quita un vuelo concreto de la lista localizándolo por su ID en O(1)"""
+        with cls._lock_for(lista_id).write_locked():
+            memory_list = cls.get_list_instance(db, lista_id)
+            removed_at = memory_list.position_of(vuelo_id) if cls._watched(lista_id) else -1
+            vuelo = memory_list.remove(vuelo_id)
+        
+            if vuelo:
+                # Actualizar en la BD
+                vuelo = cls._unassign(db, vuelo)
+                cls.mark_changed(db, lista_id)
+                cls._record(db, lista_id, {"op": "remove", "id": vuelo.id})
+                cls._emit(db, lista_id, lambda: {"tipo": "eliminado", "id": vuelo.id, "posicion": removed_at})
+        
+            return vuelo
+    
+    @classmethod
+    def discard_flight(cls, lista_id: int, vuelo_id: int, db: Optional[Session] = None) -> None:
+        """
+        Quita un vuelo de la lista en caché sin tocar la BD.
+        Si la lista no está cargada no hay nada que hacer.
+        Con db, la baja se anota en el diario y se difunde al confirmar la transacción.
+        """
+        with cls._lock_for(lista_id).write_locked():
+            memory_list = cls._lists_cache.peek(lista_id)
+            removed_at = -1
+            if memory_list is not None:
+                if cls._watched(lista_id):
+                    removed_at = memory_list.position_of(vuelo_id)
+                memory_list.remove(vuelo_id)
+            cls._hot_flights.discard([vuelo_id])
+            if db is not None:
+                cls._record(db, lista_id, {"op": "remove", "id": vuelo_id})
+                cls._emit(db, lista_id, lambda: {"tipo": "eliminado", "id": vuelo_id, "posicion": removed_at})
+    
+    @classmethod
+    def update_flight(cls, db: Session, lista_id: int, vuelo: Vuelo, reorder: bool = True) -> None:
+        """
+        Refleja en la lista un cambio de datos (p. ej. de estado) de un vuelo.
+        Con reorder el vuelo pasa al final del carril de su nuevo estado en O(1);
+        sin reorder conserva su posición hasta la próxima priorización.
+        La nueva clave de orden queda en el vuelo; el llamador la persiste.
+        """
+        with cls._lock_for(lista_id).write_locked():
+            memory_list = cls._lists_cache.peek(lista_id)
+            if memory_list is not None and not cls._is_current(db, lista_id):
+                # Otro proceso cambió la lista: se descarta la copia
+                cls.clear_cache(lista_id)
+                memory_list = None
+            
+            previous_position = -1
+            if memory_list is not None and cls._watched(lista_id):
+                previous_position = memory_list.position_of(vuelo.id)
+            
+            if memory_list is None:
+                # Lista no cargada: basta con situarlo tras el último vuelo de su carril en la BD
+                if reorder:
+                    flight_repo = FlightRepository(db)
+                    last = flight_repo.get_max_position(lista_id, lane_statuses(lane_for(vuelo)))
+                    vuelo.orden = 0.0 if last is None else last + POSITION_GAP
+            elif reorder:
+                memory_list.relocate(cls._entry_for(vuelo))
+                vuelo.orden = cls._assign_position(db, lista_id, memory_list, vuelo.id)
+            else:
+                memory_list.update_in_place(cls._entry_for(vuelo))
+            
+            cls._hot_flights.discard([vuelo.id])
+            cls.mark_changed(db, lista_id)
+            cls._record(db, lista_id, {"op": "upsert", "vuelo": flight_to_record(vuelo)})
+            cls._emit(db, lista_id, lambda: {"tipo": "actualizado", "desde": previous_position,
+                                             "hasta": memory_list.position_of(vuelo.id),
+                                             "vuelo": flight_payload(vuelo)})
+    
+    @classmethod
+    def contains(cls, db: Session, lista_id: int, vuelo_id: int) -> bool:
+        """Indica si un vuelo está en la lista"""
+        with cls._lock_for(lista_id).read_locked():
+            memory_list = cls._list_for_read(db, lista_id)
+            return memory_list.contains(vuelo_id)
     
     @classmethod
-    def get_first(cls, db: Session, lista_id: int) -> Optional[Vuelo]:
+    def position_of(cls, db: Session, lista_id: int, vuelo_id: int) -> int:
+        """Obtiene la posición de un vuelo en la lista, o -1 si no está"""
+        with cls._lock_for(lista_id).read_locked():
+            memory_list = cls._list_for_read(db, lista_id)
+            return memory_list.position_of(vuelo_id)
+    
+    @classmethod
+    def get_first(cls, db: Session, lista_id: int) -> Optional[FlightRecord]:
         """Obtiene el primer vuelo sin eliminarlo"""
-        memory_list = cls.get_list_instance(db, lista_id)
-        return memory_list.get_first()
+        with cls._lock_for(lista_id).read_locked():
+            memory_list = cls._list_for_read(db, lista_id)
+            entry = memory_list.get_first()
+        return cls._hydrate_one(db, entry)
     
     @classmethod
-    def get_last(cls, db: Session, lista_id: int) -> Optional[Vuelo]:
+    def get_last(cls, db: Session, lista_id: int) -> Optional[FlightRecord]:
         """Obtiene el último vuelo sin eliminarlo"""
-        memory_list = cls.get_list_instance(db, lista_id)
-        return memory_list.get_last()
+        with cls._lock_for(lista_id).read_locked():
+            memory_list = cls._list_for_read(db, lista_id)
+            entry = memory_list.get_last()
+        return cls._hydrate_one(db, entry)
     
     @classmethod
-    def get_at(cls, db: Session, lista_id: int, position: int) -> Optional[Vuelo]:
+    def get_at(cls, db: Session, lista_id: int, position: int) -> Optional[FlightRecord]:
         """Obtiene un vuelo en una posición específica sin eliminarlo"""
-        memory_list = cls.get_list_instance(db, lista_id)
-        return memory_list.get_at(position)
+        with cls._lock_for(lista_id).read_locked():
+            memory_list = cls._list_for_read(db, lista_id)
+            entry = memory_list.get_at(position)
+        return cls._hydrate_one(db, entry)
     
     @classmethod
-    def get_all(cls, db: Session, lista_id: int) -> List[Vuelo]:
+    def get_all(cls, db: Session, lista_id: int) -> List[FlightRecord]:
         """Obtiene todos los vuelos de la lista"""
-        memory_list = cls.get_list_instance(db, lista_id)
-        return memory_list.get_all()
+        with cls._lock_for(lista_id).read_locked():
+            memory_list = cls._list_for_read(db, lista_id)
+            entries = memory_list.get_all()
+        return cls._hydrate(db, entries)
+    
+    @classmethod
+    def get_range(cls, db: Session, lista_id: int, offset: int, limit: int) -> List[FlightRecord]:
+        """
+        Obtiene una página de vuelos (hasta limit a partir de la posición offset).
+        Con nodos por ID solo se cargan de la BD los vuelos de la página.
+        """
+        with cls._lock_for(lista_id).read_locked():
+            memory_list = cls._list_for_read(db, lista_id)
+            entries = memory_list.get_range(offset, limit)
+        return cls._hydrate(db, entries)
+    
+    @classmethod
+    def walk(cls, db: Session, lista_id: int, cursor: Optional[Tuple[Optional[int], int]],
+             count: int, forward: bool = True) -> Optional[List[FlightRecord]]:
+        """
+        Recorre hasta count vuelos en orden (o en orden inverso si no es forward)
+        en O(count), sin contar posiciones. Sin cursor empieza por el extremo de
+        la lista; con cursor (siguiente, último) empieza en el vuelo siguiente
+        de la página anterior o, si ya no está en la lista, tras el último que
+        se devolvió. None si tampoco está el último.
+        """
+        with cls._lock_for(lista_id).read_locked():
+            memory_list = cls._list_for_read(db, lista_id)
+            if cursor is None:
+                entries = memory_list.walk(None, count, forward)
+            else:
+                next_id, last_id = cursor
+                if next_id is not None and memory_list.contains(next_id):
+                    entries = memory_list.walk(next_id, count, forward)
+                elif memory_list.contains(last_id):
+                    entries = memory_list.walk(last_id, count + 1, forward)[1:]
+                else:
+                    return None
+        return cls._hydrate(db, entries)
     
     @classmethod
     def size(cls, db: Session, lista_id: int) -> int:
         """Obtiene el tamaño de la lista"""
-        memory_list = cls.get_list_instance(db, lista_id)
-        return memory_list.size()
+        with cls._lock_for(lista_id).read_locked():
+            memory_list = cls._list_for_read(db, lista_id)
+            return memory_list.size()
+    
+    @classmethod
+    def visualize(cls, db: Session, lista_id: int) -> Tuple[str, List[FlightRecord]]:
+        """
+        Devuelve la representación visual de la lista y sus vuelos,
+        tomados de una misma versión de la lista
+        """
+        with cls._lock_for(lista_id).read_locked():
+            memory_list = cls._list_for_read(db, lista_id)
+            entries = memory_list.get_all()
+        flights = cls._hydrate(db, entries)
+        # Las referencias de los nodos por ID no llevan el código: se dibuja con los vuelos cargados
+        return visualize_flights(flights), flights
     
     @classmethod
     def prioritize(cls, db: Session, lista_id: int) -> Dict[str, int]:
@@ -186,47 +1009,24 @@ class LinkedListManager:
         3. Programado
         4. Otros
         """
-        # Obtener todos los vuelos de la lista desde la BD
-        flight_repo = FlightRepository(db)
-        vuelos = flight_repo.get_flights_by_list_id(lista_id)
-        
-        # Clasificar por estado
-        emergencias = []
-        embarques = []
-        programados = []
-        otros = []
-        
-        for v in vuelos:
-            if v.estado == EstadoVuelo.EMERGENCIA:
-                emergencias.append(v)
-            elif v.estado == EstadoVuelo.EMBARQUE:
-                embarques.append(v)
-            elif v.estado == EstadoVuelo.PROGRAMADO:
-                programados.append(v)
+        with cls._lock_for(lista_id).write_locked():
+            # Los carriles mantienen el orden por prioridad; solo se reubican
+            # los vuelos cuyo estado cambió sin reordenar la lista
+            memory_list = cls.get_list_instance(db, lista_id)
+            if not memory_list.is_prioritized():
+                counts = memory_list.prioritize()
+                for lane in counts:
+                    cls._renumber_lane(db, lista_id, memory_list, lane)
+                cls.mark_changed(db, lista_id)
+                # Cambian muchas posiciones: los suscriptores recargan la lista
+                cls._emit_reload(lista_id, db)
             else:
-                otros.append(v)
+                counts = memory_list.lane_counts()
         
-        # Recrear lista en memoria
-        cls.clear_cache(lista_id)
-        memory_list = MemoryLinkedList[Vuelo]()
-        
-        # Añadir en orden de prioridad
-        for v in emergencias:
-            memory_list.add_last(v)
-        for v in embarques:
-            memory_list.add_last(v)
-        for v in programados:
-            memory_list.add_last(v)
-        for v in otros:
-            memory_list.add_last(v)
-        
-        # Guardar en caché
-        cls._lists_cache[lista_id] = memory_list
-        
-        return {
-            "emergencias": len(emergencias),
-            "embarques": len(embarques),
-            "programados": len(programados),
-            "otros": len(otros),
-            "total": len(vuelos)
-        }
+            return {
+                "emergencias": counts["emergencia"],
+                "embarques": counts["embarque"],
+                "programados": counts["programado"],
+                "otros": counts["otros"],
+                "total": memory_list.size()
+            }
@@ -0,0 +1,190 @@
+"""
+Caché LRU acotada para las listas enlazadas en memoria
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generic, Iterable, Iterator, List, Optional, TypeVar
+
+V = TypeVar('V')
+
+# Estimación aproximada de lo que ocupa un vuelo cacheado (FlightRecord + nodo + índice)
+ESTIMATED_BYTES_PER_FLIGHT = 650
+# Ídem con nodos por ID (FlightRef + nodo + índice solo por ID)
+ESTIMATED_BYTES_PER_REF = 210
+
+EvictionCallback = Callable[[int, Any], None]
+
+class ListCache(Generic[V]):
+    """
+    Caché LRU de listas por lista_id con límite de número de listas y
+    presupuesto aproximado de memoria.
+
+    El tamaño de cada lista se estima como size() * bytes_per_flight y se
+    recalcula al insertar, por lo que el presupuesto es aproximado: una
+    lista que crece después de insertarse se contabiliza en la siguiente
+    inserción.
+
+    Las operaciones sobre la estructura de la caché están protegidas por un
+    cerrojo propio; proteger el contenido de cada lista es cosa del llamador.
+    """
+    def __init__(self, max_lists: Optional[int] = 256, max_bytes: Optional[int] = 256 * 2**20,
+                 bytes_per_flight: int = ESTIMATED_BYTES_PER_FLIGHT):
+        self._entries: "OrderedDict[int, V]" = OrderedDict()
+        self.max_lists = max_lists
+        self.max_bytes = max_bytes
+        self.bytes_per_flight = bytes_per_flight
+        self._eviction_callbacks: List[EvictionCallback] = []
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, lista_id: int) -> bool:
+        return lista_id in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[int]:
+        with self._lock:
+            return iter(list(self._entries))
+
+    def get(self, lista_id: int) -> Optional[V]:
+        """Devuelve una lista marcándola como usada recientemente (cuenta acierto/fallo)"""
+        with self._lock:
+            memory_list = self._entries.get(lista_id)
+            if memory_list is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._entries.move_to_end(lista_id)
+            return memory_list
+
+    def peek(self, lista_id: int) -> Optional[V]:
+        """Devuelve una lista sin alterar el orden LRU ni los contadores"""
+        return self._entries.get(lista_id)
+
+    def put(self, lista_id: int, memory_list: V) -> None:
+        """Guarda una lista y desaloja las menos usadas si se superan los límites"""
+        with self._lock:
+            self._entries[lista_id] = memory_list
+            self._entries.move_to_end(lista_id)
+            self._evict_if_needed(keep=lista_id)
+
+    def pop(self, lista_id: int) -> Optional[V]:
+        """Quita una lista de la caché (no cuenta como desalojo)"""
+        with self._lock:
+            return self._entries.pop(lista_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def add_eviction_callback(self, callback: EvictionCallback) -> None:
+        """Registra una función llamada con (lista_id, lista) al desalojar una lista"""
+        self._eviction_callbacks.append(callback)
+
+    def remove_eviction_callback(self, callback: EvictionCallback) -> None:
+        if callback in self._eviction_callbacks:
+            self._eviction_callbacks.remove(callback)
+
+    def estimated_bytes(self) -> int:
+        """Memoria aproximada ocupada por todas las listas cacheadas"""
+        with self._lock:
+            return sum(lst.size() for lst in self._entries.values()) * self.bytes_per_flight
+
+    def configure(self, max_lists: Optional[int] = None, max_bytes: Optional[int] = None) -> None:
+        """Cambia los límites (None los desactiva) y desaloja lo que sobre"""
+        with self._lock:
+            self.max_lists = max_lists
+            self.max_bytes = max_bytes
+            self._evict_if_needed()
+
+    def stats(self) -> Dict[str, Optional[int]]:
+        """Contadores y ocupación actual de la caché"""
+        with self._lock:
+            return {
+                "listas": len(self._entries),
+                "max_listas": self.max_lists,
+                "bytes_estimados": self.estimated_bytes(),
+                "max_bytes": self.max_bytes,
+                "aciertos": self.hits,
+                "fallos": self.misses,
+                "desalojos": self.evictions,
+            }
+
+    def _over_limits(self) -> bool:
+        if self.max_lists is not None and len(self._entries) > self.max_lists:
+            return True
+        if self.max_bytes is not None and self.estimated_bytes() > self.max_bytes:
+            return True
+        return False
+
+    def _evict_if_needed(self, keep: Optional[int] = None) -> None:
+        """Desaloja las listas menos usadas (salvo keep) hasta cumplir los límites"""
+        while self._over_limits():
+            victim = next((lid for lid in self._entries if lid != keep), None)
+            if victim is None:
+                break
+
+            memory_list = self._entries.pop(victim)
+            self.evictions += 1
+            for callback in list(self._eviction_callbacks):
+                callback(victim, memory_list)
+
+
+class FlightCache(Generic[V]):
+    """
+    Caché LRU pequeña de vuelos ya cargados por ID, para las listas con
+    nodos por ID: las páginas que se leen a menudo (la cabeza de la cola)
+    no vuelven a consultarse en la BD. Quien cambia un vuelo lo descarta.
+    """
+    def __init__(self, max_flights: int = 1024):
+        self._entries: "OrderedDict[int, V]" = OrderedDict()
+        self.max_flights = max_flights
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_many(self, flight_ids: Iterable[int]) -> Dict[int, V]:
+        """Devuelve los vuelos cacheados de entre esos IDs, marcándolos como usados"""
+        found: Dict[int, V] = {}
+        with self._lock:
+            for flight_id in flight_ids:
+                vuelo = self._entries.get(flight_id)
+                if vuelo is None:
+                    self.misses += 1
+                    continue
+                self.hits += 1
+                self._entries.move_to_end(flight_id)
+                found[flight_id] = vuelo
+        return found
+
+    def put_many(self, flights: Dict[int, V]) -> None:
+        """Guarda vuelos por ID y desaloja los menos usados que sobren"""
+        with self._lock:
+            for flight_id, vuelo in flights.items():
+                self._entries[flight_id] = vuelo
+                self._entries.move_to_end(flight_id)
+            while len(self._entries) > self.max_flights:
+                self._entries.popitem(last=False)
+
+    def discard(self, flight_ids: Iterable[int]) -> None:
+        """Descarta vuelos que han cambiado"""
+        with self._lock:
+            for flight_id in flight_ids:
+                self._entries.pop(flight_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def configure(self, max_flights: int) -> None:
+        with self._lock:
+            self.max_flights = max_flights
+            while len(self._entries) > self.max_flights:
+                self._entries.popitem(last=False)
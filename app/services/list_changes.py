@@ -0,0 +1,96 @@
+"""
+Registro acotado de los últimos cambios de cada lista (GET /listas/{id}/cambios)
+
+Guarda, para cada lista que algún cliente sincroniza, los últimos eventos
+de LinkedListManager (los mismos que difunde ListFeed) con su número de
+secuencia, en un buffer circular de tamaño fijo. Un cliente que conoce la
+lista hasta la secuencia N pide solo los cambios posteriores; si alguno ya
+salió del buffer, o entre medias hubo una recarga (altas masivas,
+priorización, transacción deshecha), tiene que resincronizarse.
+
+Las listas se registran al pedir sus cambios por primera vez: hasta
+entonces no se guarda nada de ellas ni se calculan las posiciones. Si
+nadie los pide durante TRACKING_TTL segundos la lista deja de registrarse
+(y su próximo cliente se resincroniza), para que cada escritura no siga
+calculando posiciones cuando ya no queda ningún cliente.
+"""
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from app.services.list_feed import RELOAD
+
+# Cambios que se guardan por lista
+CHANGE_LOG_SIZE = 1000
+# Segundos sin consultas tras los que una lista deja de registrarse
+TRACKING_TTL = 300.0
+
+class _ListChanges:
+    def __init__(self, floor: int, size: int):
+        self.records: Deque[Tuple[int, Dict[str, Any]]] = deque(maxlen=size)
+        # Secuencia a partir de la cual están todos los cambios (los posteriores a floor)
+        self.floor = floor
+        self.polled_at = time.monotonic()
+
+class ChangeLog:
+    """Últimos cambios de cada lista registrada, por número de secuencia"""
+    def __init__(self, size: int = CHANGE_LOG_SIZE, ttl: float = TRACKING_TTL):
+        self.size = size
+        self.ttl = ttl
+        self._lists: Dict[int, _ListChanges] = {}
+        self._guard = threading.Lock()
+
+    def is_tracked(self, lista_id: int) -> bool:
+        """Indica si se guardan los cambios de la lista; deja de hacerlo si nadie los pide desde hace ttl segundos"""
+        changes = self._lists.get(lista_id)
+        if changes is None:
+            return False
+        if time.monotonic() - changes.polled_at > self.ttl:
+            with self._guard:
+                if self._lists.get(lista_id) is changes:
+                    del self._lists[lista_id]
+            return False
+        return True
+
+    def track(self, lista_id: int, seq: int) -> None:
+        """Empieza a guardar los cambios de una lista posteriores a la secuencia seq"""
+        with self._guard:
+            changes = self._lists.get(lista_id)
+            if changes is None:
+                self._lists[lista_id] = _ListChanges(seq, self.size)
+            else:
+                changes.polled_at = time.monotonic()
+
+    def append(self, lista_id: int, seq: int, event: Dict[str, Any]) -> None:
+        """Guarda un cambio; las secuencias de una lista llegan en orden creciente"""
+        with self._guard:
+            changes = self._lists.get(lista_id)
+            if changes is None:
+                return
+            if len(changes.records) == changes.records.maxlen:
+                # El más antiguo sale del buffer: desde él ya no se puede sincronizar
+                changes.floor = changes.records[0][0]
+            changes.records.append((seq, event))
+
+    def since(self, lista_id: int, seq: int, current: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        Cambios posteriores a la secuencia seq hasta current, o None si el
+        cliente debe resincronizarse: la lista no está registrada, seq es
+        anterior a los cambios guardados o posterior a current, o hubo una recarga
+        """
+        with self._guard:
+            changes = self._lists.get(lista_id)
+            if changes is None:
+                return None
+            changes.polled_at = time.monotonic()
+            if seq < changes.floor or seq > current:
+                return None
+            events = []
+            for record_seq, event in reversed(changes.records):
+                if record_seq <= seq:
+                    break
+                if event["tipo"] == RELOAD:
+                    return None
+                events.append(event)
+        events.reverse()
+        return events
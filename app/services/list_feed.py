@@ -0,0 +1,115 @@
+"""
+Difusión de los cambios de las listas a los paneles suscritos (WebSocket)
+
+LinkedListManager describe cada cambio de una lista como un evento
+compacto (insertado, eliminado, movido, actualizado o recarga) con un
+número de secuencia por lista, lo serializa una sola vez y, al confirmarse
+la transacción, ListFeed deja el mismo texto en la cola de cada
+suscriptor. Los eventos se generan solo para las listas con suscriptores.
+
+Las escrituras se hacen en hilos del pool y los suscriptores esperan en el
+bucle de eventos, así que cada cola se alimenta con call_soon_threadsafe.
+Un suscriptor que no da abasto no frena a los demás: al llenarse su cola
+se vacía y recibe RELOAD para volver a pedir la lista completa.
+"""
+import asyncio
+import threading
+from typing import Callable, Dict, Hashable, Set, Tuple
+
+# Mensajes que no son eventos: volver a enviar la lista completa / terminar
+RELOAD = "recarga"
+CLOSED = "cerrada"
+
+# Mensajes pendientes por suscriptor antes de darlo por atrasado
+QUEUE_SIZE = 1000
+
+class Subscription:
+    """Cola de mensajes de un suscriptor, consumida desde su bucle de eventos"""
+    def __init__(self, lista_id: int, loop: asyncio.AbstractEventLoop, queue_size: int = QUEUE_SIZE):
+        self.lista_id = lista_id
+        self._loop = loop
+        self._queue: asyncio.Queue = asyncio.Queue(queue_size)
+
+    def push(self, seq: int, message: str) -> None:
+        """Encola un mensaje desde cualquier hilo"""
+        try:
+            self._loop.call_soon_threadsafe(self._put, seq, message)
+        except RuntimeError:
+            # El bucle ya se ha cerrado: el suscriptor se está yendo
+            pass
+
+    def _put(self, seq: int, message: str) -> None:
+        try:
+            self._queue.put_nowait((seq, message))
+        except asyncio.QueueFull:
+            # Atrasado: lo pendiente ya no sirve, tendrá que recargar la lista
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queue.put_nowait((seq, RELOAD))
+
+    async def get(self) -> Tuple[int, str]:
+        """
+        Espera el siguiente mensaje: (secuencia, texto), RELOAD o CLOSED.
+        Una instantánea en la secuencia de un RELOAD o posterior ya lo atiende.
+        """
+        return await self._queue.get()
+
+class ListFeed:
+    """
+    Suscriptores de cada lista y última instantánea serializada, para que
+    muchos paneles que se conectan a la vez no serialicen la lista cada uno
+    """
+    def __init__(self):
+        self._subscribers: Dict[int, Set[Subscription]] = {}
+        self._snapshots: Dict[int, Tuple[Hashable, str]] = {}
+        self._guard = threading.Lock()
+
+    def has_subscribers(self, lista_id: int) -> bool:
+        return bool(self._subscribers.get(lista_id))
+
+    def subscribe(self, lista_id: int, loop: asyncio.AbstractEventLoop) -> Subscription:
+        subscription = Subscription(lista_id, loop)
+        with self._guard:
+            self._subscribers.setdefault(lista_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._guard:
+            subscribers = self._subscribers.get(subscription.lista_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.lista_id]
+                    self._snapshots.pop(subscription.lista_id, None)
+
+    def publish(self, lista_id: int, seq: int, message: str) -> None:
+        """Entrega el mismo mensaje ya serializado a todos los suscriptores de la lista"""
+        with self._guard:
+            subscribers = list(self._subscribers.get(lista_id, ()))
+        for subscription in subscribers:
+            subscription.push(seq, message)
+
+    def reload(self, lista_id: int, seq: int) -> None:
+        """La lista cambió de forma que no se describe evento a evento: los suscriptores deben pedirla entera"""
+        with self._guard:
+            self._snapshots.pop(lista_id, None)
+        if self.has_subscribers(lista_id):
+            self.publish(lista_id, seq, RELOAD)
+
+    def close(self, subscription: Subscription) -> None:
+        """Despierta a un suscriptor para que termine (p. ej. al desconectarse el cliente)"""
+        subscription.push(0, CLOSED)
+
+    def snapshot(self, lista_id: int, key: Hashable, build: Callable[[], str]) -> str:
+        """
+        Instantánea serializada de la lista en el estado key (secuencia y
+        versión); build solo se llama si no está guardada para ese estado
+        """
+        cached = self._snapshots.get(lista_id)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        text = build()
+        with self._guard:
+            if lista_id in self._subscribers:
+                self._snapshots[lista_id] = (key, text)
+        return text
@@ -0,0 +1,224 @@
+"""
+Diario de operaciones (append-only) con instantáneas para recuperar las listas en memoria
+
+Cada lista tiene en el directorio del diario dos ficheros:
+    lista_<id>.snapshot  instantánea binaria (ver app/domain/mapped_flight_list.py)
+    lista_<id>.journal   operaciones posteriores a la instantánea, una por línea
+
+Las entradas describen el efecto de la operación (el vuelo con su clave de
+orden, el ID quitado o las nuevas claves de un carril), no la operación en
+sí, por lo que reaplicarlas es idempotente y no depende de la implementación
+de la lista. Cada entrada lleva la versión de la lista tras la operación
+para comprobar al recuperar que el diario está al día con la BD.
+
+Pensado para un único proceso escritor por directorio.
+"""
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Any, Dict, IO, Iterable, Iterator, List, Optional, Tuple, Union
+from app.models import Vuelo, EstadoVuelo
+from app.domain.flight_record import FlightRecord
+from app.domain.mapped_flight_list import MappedFlightList, write_snapshot
+from app.domain.priority_lane_list import LANES, lane_statuses
+
+SNAPSHOT_SUFFIX = ".snapshot"
+JOURNAL_SUFFIX = ".journal"
+
+# Campos de un vuelo guardados en el diario y en las instantáneas, en este orden
+RECORD_FIELDS = ("id", "codigo", "origen", "destino", "hora", "aerolinea",
+                 "puerta_embarque", "estado", "lista_vuelos_id", "orden")
+
+_STATUS_BY_VALUE = {estado.value: estado for estado in EstadoVuelo}
+
+def flight_to_record(vuelo: Union[Vuelo, FlightRecord]) -> List[Any]:
+    """Convierte un vuelo en una fila serializable (orden de RECORD_FIELDS)"""
+    return [
+        vuelo.id, vuelo.codigo, vuelo.origen, vuelo.destino,
+        vuelo.hora.isoformat() if vuelo.hora else None,
+        vuelo.aerolinea, vuelo.puerta_embarque,
+        vuelo.estado.value if isinstance(vuelo.estado, EstadoVuelo) else vuelo.estado,
+        vuelo.lista_vuelos_id, vuelo.orden,
+    ]
+
+def record_values(record: List[Any]) -> Dict[str, Any]:
+    """Convierte una fila del diario en los valores de atributo del vuelo"""
+    values = dict(zip(RECORD_FIELDS, record))
+    values["hora"] = datetime.fromisoformat(values["hora"]) if values["hora"] else None
+    values["estado"] = _STATUS_BY_VALUE[values["estado"]]
+    return values
+
+
+# Posición del carril de cada estado, para ordenar filas sin construir los vuelos
+_LANE_RANK = {estado: i for i, lane in enumerate(LANES) for estado in lane_statuses(lane)}
+
+def _row_order(values: Dict[str, Any]) -> Tuple[int, bool, float, int]:
+    orden = values["orden"]
+    return _LANE_RANK[values["estado"]], orden is None, orden or 0.0, values["id"]
+
+
+class ListJournal:
+    """
+    Diario append-only por lista con instantáneas periódicas
+
+    append() añade una entrada; cuando una lista acumula snapshot_every
+    entradas, needs_snapshot() lo indica y write_snapshot() escribe una
+    instantánea de forma atómica y vacía su diario. recover() carga la
+    última instantánea y reaplica el diario.
+    """
+    def __init__(self, directory: str, snapshot_every: int = 10_000):
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        os.makedirs(directory, exist_ok=True)
+        self._files: Dict[int, IO[str]] = {}
+        self._pending: Dict[int, int] = {}
+        # Versión de la lista según el diario (última entrada o instantánea)
+        self._versions: Dict[int, Optional[int]] = {}
+        # Un cerrojo por lista para no intercalar entradas con una instantánea
+        self._locks: Dict[int, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _path(self, lista_id: int, suffix: str) -> str:
+        return os.path.join(self.directory, f"lista_{lista_id}{suffix}")
+
+    def _lock_for(self, lista_id: int) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(lista_id, threading.Lock())
+
+    def _file_for(self, lista_id: int) -> IO[str]:
+        journal_file = self._files.get(lista_id)
+        if journal_file is None:
+            journal_file = open(self._path(lista_id, JOURNAL_SUFFIX), "a", encoding="utf-8")
+            self._files[lista_id] = journal_file
+        return journal_file
+
+    # --- Escritura ---
+
+    def append(self, lista_id: int, entry: Dict[str, Any], version: Optional[int]) -> None:
+        """Añade una entrada al diario de una lista"""
+        line = json.dumps({**entry, "v": version}, separators=(",", ":"))
+        with self._lock_for(lista_id):
+            journal_file = self._file_for(lista_id)
+            journal_file.write(line + "\n")
+            journal_file.flush()
+            self._pending[lista_id] = self._pending.get(lista_id, 0) + 1
+            self._versions[lista_id] = version
+
+    def needs_snapshot(self, lista_id: int) -> bool:
+        """Indica si el diario de una lista ha crecido lo bastante para compactarlo"""
+        return self._pending.get(lista_id, 0) >= self.snapshot_every
+
+    def version_of(self, lista_id: int) -> Optional[int]:
+        """Versión de la lista según el diario, o None si no se conoce"""
+        return self._versions.get(lista_id)
+
+    def write_snapshot(self, lista_id: int, version: Optional[int],
+                       flights: Iterable[Union[Vuelo, FlightRecord]]) -> None:
+        """
+        Escribe la instantánea de una lista (fichero temporal + os.replace)
+        y vacía su diario. Las entradas que lleguen después se aplican sobre ella.
+        """
+        with self._lock_for(lista_id):
+            self._replace_snapshot(lista_id, version, flights)
+
+    def compact(self, lista_id: int) -> bool:
+        """
+        Escribe una nueva instantánea a partir de la anterior y del diario,
+        sin necesitar la lista en memoria (p. ej. si sus nodos solo tienen IDs).
+        Devuelve False si la lista no tiene instantánea.
+        """
+        with self._lock_for(lista_id):
+            result = self.recover(lista_id)
+            if result is None:
+                return False
+            self._replace_snapshot(lista_id, *result)
+            return True
+
+    def _replace_snapshot(self, lista_id: int, version: Optional[int],
+                          flights: Iterable[Union[Vuelo, FlightRecord]]) -> None:
+        """Escribe la instantánea y vacía el diario (con el cerrojo de la lista tomado)"""
+        write_snapshot(self._path(lista_id, SNAPSHOT_SUFFIX), lista_id, version, flights)
+
+        journal_file = self._files.pop(lista_id, None)
+        if journal_file is not None:
+            journal_file.close()
+        open(self._path(lista_id, JOURNAL_SUFFIX), "w").close()
+        self._pending[lista_id] = 0
+        self._versions[lista_id] = version
+
+    def close(self) -> None:
+        for journal_file in self._files.values():
+            journal_file.close()
+        self._files.clear()
+
+    # --- Recuperación ---
+
+    def list_ids(self) -> List[int]:
+        """Listas con instantánea en el directorio"""
+        ids = []
+        for name in os.listdir(self.directory):
+            if name.startswith("lista_") and name.endswith(SNAPSHOT_SUFFIX):
+                ids.append(int(name[len("lista_"):-len(SNAPSHOT_SUFFIX)]))
+        return sorted(ids)
+
+    def snapshot_path(self, lista_id: int) -> Optional[str]:
+        """Ruta de la instantánea de una lista, o None si no hay"""
+        path = self._path(lista_id, SNAPSHOT_SUFFIX)
+        return path if os.path.exists(path) else None
+
+    def _read_lines(self, path: str) -> Iterator[Any]:
+        if not os.path.exists(path):
+            return
+        with open(path, encoding="utf-8") as source:
+            for line in source:
+                if not line.endswith("\n"):
+                    # Última línea a medio escribir (caída durante un append)
+                    break
+                yield json.loads(line)
+
+    def recover(self, lista_id: int) -> Optional[Tuple[Optional[int], List[FlightRecord]]]:
+        """
+        Carga la última instantánea de una lista y reaplica su diario.
+        Devuelve (versión, vuelos ordenados por carril y clave de orden)
+        o None si no hay instantánea.
+        """
+        path = self.snapshot_path(lista_id)
+        if path is None:
+            return None
+
+        with MappedFlightList(path) as snapshot:
+            version = snapshot.version
+            records: Dict[int, Dict[str, Any]] = {values["id"]: values for values in snapshot.rows()}
+
+        pending = 0
+        for entry in self._read_lines(self._path(lista_id, JOURNAL_SUFFIX)):
+            op = entry["op"]
+            if op == "upsert":
+                values = record_values(entry["vuelo"])
+                records[values["id"]] = values
+            elif op == "upserts":
+                for record in entry["vuelos"]:
+                    values = record_values(record)
+                    records[values["id"]] = values
+            elif op == "remove":
+                records.pop(entry["id"], None)
+            elif op == "ranks":
+                for flight_id, orden in entry["orden"].items():
+                    record = records.get(int(flight_id))
+                    if record is not None:
+                        record["orden"] = orden
+            version = entry["v"]
+            pending += 1
+
+        rows = list(records.values())
+        if pending:
+            # Mismo orden que la carga desde la BD: carril, clave de orden (sin clave al final) e ID.
+            # Sin operaciones pendientes la instantánea ya está en orden
+            rows.sort(key=_row_order)
+
+        flights = [FlightRecord.from_values(values) for values in rows]
+
+        self._pending[lista_id] = pending
+        self._versions[lista_id] = version
+        return version, flights
@@ -1,7 +1,7 @@
 """
 Servicio para gestión de listas de vuelos
 """
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from app.models import ListaVuelos, Vuelo, EstadoVuelo
 from app.services import linked_list
 
@@ -29,9 +29,15 @@ class ListService:
     
     def get_all_lists(self, skip: int = 0, limit: int = 100):
         """
-        Obtiene todas las listas de vuelos con paginación.
+        Obtiene todas las listas de vuelos con paginación. Los vuelos de todas
+        las listas se cargan con una sola consulta IN en lugar de una por lista.
         """
-        return self.db.query(ListaVuelos).offset(skip).limit(limit).all()
+        return (self.db.query(ListaVuelos)
+                .options(selectinload(ListaVuelos.vuelos))
+                .order_by(ListaVuelos.id)
+                .offset(skip)
+                .limit(limit)
+                .all())
     
     def prioritize_flights(self, lista_id: int):
         """
@@ -0,0 +1,98 @@
+"""
+Cerrojo de lectores/escritor para proteger las listas en memoria
+"""
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+class ReadWriteLock:
+    """
+    Permite muchos lectores simultáneos o un único escritor.
+
+    Da preferencia a los escritores: cuando hay uno esperando, los
+    lectores nuevos esperan, así un flujo continuo de lecturas no deja
+    sin turno a las escrituras. Es reentrante por hilo: un hilo que ya
+    tiene el cerrojo (de lectura o escritura) puede volver a leer, y el
+    escritor puede volver a escribir. Pasar de lectura a escritura no
+    está permitido porque dos hilos haciéndolo se bloquearían entre sí.
+    """
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = None
+        self._writer_depth = 0
+        self._writers_waiting = 0
+        self._local = threading.local()
+
+    def _read_depth(self) -> int:
+        return getattr(self._local, "read_depth", 0)
+
+    def acquire_read(self, blocking: bool = True) -> bool:
+        """Toma el cerrojo de lectura; sin blocking devuelve False si tendría que esperar"""
+        me = threading.get_ident()
+        depth = self._read_depth()
+        if depth or self._writer == me:
+            # Ya tiene el cerrojo: entra sin esperar
+            self._local.read_depth = depth + 1
+            return True
+
+        with self._cond:
+            while self._writer is not None or self._writers_waiting:
+                if not blocking:
+                    return False
+                self._cond.wait()
+            self._readers += 1
+        self._local.read_depth = 1
+        return True
+
+    def release_read(self) -> None:
+        depth = self._read_depth() - 1
+        self._local.read_depth = depth
+        if depth or self._writer == threading.get_ident():
+            return
+
+        with self._cond:
+            self._readers -= 1
+            if self._readers == 0:
+                self._cond.notify_all()
+
+    def acquire_write(self) -> None:
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me:
+                self._writer_depth += 1
+                return
+            if self._read_depth():
+                raise RuntimeError("No se puede pasar de lectura a escritura con el mismo cerrojo")
+
+            self._writers_waiting += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._cond.wait()
+            finally:
+                self._writers_waiting -= 1
+            self._writer = me
+            self._writer_depth = 1
+
+    def release_write(self) -> None:
+        with self._cond:
+            self._writer_depth -= 1
+            if self._writer_depth == 0:
+                self._writer = None
+                self._cond.notify_all()
+
+    @contextmanager
+    def read_locked(self) -> Iterator[None]:
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write_locked(self) -> Iterator[None]:
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
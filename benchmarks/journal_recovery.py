@@ -0,0 +1,88 @@
+"""
+Compara el arranque en caliente desde el diario con la carga desde la BD
+
+Crea una BD SQLite temporal con n vuelos en una lista, la carga desde la
+BD (como get_list_instance sin caché), escribe la instantánea y mide
+cuánto tarda recover_from_journal en reconstruir la lista, sin y con
+operaciones pendientes en el diario, y cuánto cuesta servir lecturas
+directamente desde la instantánea mapeada.
+
+Uso:
+    python benchmarks/journal_recovery.py [n]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Base, ListaVuelos, Vuelo, EstadoVuelo
+from app.services.linked_list_manager import LinkedListManager, POSITION_GAP
+
+DEFAULT_N = 100_000
+TAIL_OPERATIONS = 1_000
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_N
+    workdir = tempfile.mkdtemp()
+    engine = create_engine(f"sqlite:///{os.path.join(workdir, 'bench.db')}")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+    statuses = list(EstadoVuelo)
+
+    with Session() as db:
+        lista = ListaVuelos(nombre="Benchmark")
+        db.add(lista)
+        db.commit()
+        lista_id = lista.id
+        db.execute(insert(Vuelo), [
+            {"codigo": f"B{i}", "origen": "Madrid", "destino": "Barcelona",
+             "estado": statuses[i % len(statuses)], "lista_vuelos_id": lista_id,
+             "orden": i * POSITION_GAP}
+            for i in range(n)
+        ])
+        db.commit()
+
+    LinkedListManager.enable_journal(os.path.join(workdir, "journal"), snapshot_every=10 * TAIL_OPERATIONS)
+
+    with Session() as db:
+        # Carga desde la BD (escribe además la instantánea inicial)
+        LinkedListManager.clear_cache()
+        _, orm_seconds = timed(lambda: LinkedListManager.get_list_instance(db, lista_id))
+        print(f"{n} vuelos | carga desde la BD:                {orm_seconds:7.2f} s")
+
+        LinkedListManager.clear_cache()
+        _, snapshot_seconds = timed(lambda: LinkedListManager.recover_from_journal(db))
+        print(f"{n} vuelos | instantánea:                      {snapshot_seconds:7.2f} s")
+
+        # Réplica de solo lectura: la instantánea mapeada, sin cargarla
+        mapped, open_seconds = timed(lambda: LinkedListManager.open_snapshot(lista_id))
+        with mapped:
+            _, get_at_seconds = timed(lambda: [mapped.get_at(i) for i in range(0, n, max(n // 1000, 1))])
+            _, get_all_seconds = timed(mapped.get_all)
+        print(f"{n} vuelos | instantánea mapeada: abrir {open_seconds * 1000:.2f} ms, "
+              f"1000 get_at {get_at_seconds * 1000:.1f} ms, get_all {get_all_seconds:.2f} s")
+
+        # Operaciones posteriores a la instantánea que hay que reaplicar
+        for flight_id in range(1, TAIL_OPERATIONS + 1):
+            LinkedListManager.insert_at(db, lista_id, db.get(Vuelo, flight_id), 0)
+        LinkedListManager.clear_cache()
+        _, replay_seconds = timed(lambda: LinkedListManager.recover_from_journal(db))
+        print(f"{n} vuelos | instantánea + {TAIL_OPERATIONS} operaciones: {replay_seconds:7.2f} s")
+
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Compara la memoria de una lista cargada con vuelos completos y con nodos por ID
+
+Crea una BD SQLite temporal con n vuelos en una lista y, en cada modo,
+mide con tracemalloc lo que ocupa la lista cargada en caché (nodos,
+índice y vuelos o referencias), el tiempo de carga y el de leer páginas
+con get_range repartidas por la lista y repitiendo siempre la primera
+(que con nodos por ID se sirve desde la caché de vuelos ya cargados).
+
+Uso:
+    python benchmarks/lazy_nodes.py [n]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Base, ListaVuelos, Vuelo, EstadoVuelo
+from app.services.linked_list_manager import LinkedListManager, POSITION_GAP
+
+DEFAULT_N = 100_000
+PAGE_SIZE = 50
+PAGES = 200
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_N
+    workdir = tempfile.mkdtemp()
+    engine = create_engine(f"sqlite:///{os.path.join(workdir, 'bench.db')}")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+    statuses = list(EstadoVuelo)
+
+    with Session() as db:
+        lista = ListaVuelos(nombre="Benchmark")
+        db.add(lista)
+        db.commit()
+        lista_id = lista.id
+        db.execute(insert(Vuelo), [
+            {"codigo": f"B{i}", "origen": "Madrid", "destino": "Barcelona",
+             "aerolinea": "Iberia", "puerta_embarque": f"A{i % 40}",
+             "estado": statuses[i % len(statuses)], "lista_vuelos_id": lista_id,
+             "orden": i * POSITION_GAP}
+            for i in range(n)
+        ])
+        db.commit()
+
+    for lazy in (False, True):
+        label = "nodos por ID" if lazy else "registros"
+        LinkedListManager.use_lazy_nodes(lazy)
+        with Session() as db:
+            tracemalloc.start()
+            start = time.perf_counter()
+            LinkedListManager.get_list_instance(db, lista_id)
+            load_seconds = time.perf_counter() - start
+            used = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            print(f"{label:>13} | {n} vuelos | carga {load_seconds:5.2f} s | "
+                  f"{used / 2**20:7.1f} MiB ({used / n:6.0f} B/vuelo)")
+
+        # Cada página en una sesión nueva, como una petición: páginas repartidas
+        # por toda la lista y después siempre la primera (panel de salidas)
+        step = max((n - PAGE_SIZE) // PAGES, 1)
+        for scenario, offsets in (("repartidas", [page * step for page in range(PAGES)]),
+                                  ("primera", [0] * PAGES)):
+            start = time.perf_counter()
+            for offset in offsets:
+                with Session() as db:
+                    LinkedListManager.get_range(db, lista_id, offset, PAGE_SIZE)
+            seconds = time.perf_counter() - start
+            print(f"{label:>13} | get_range de {PAGE_SIZE}, páginas {scenario:<10}: "
+                  f"{seconds / PAGES * 1000:6.2f} ms/página")
+        LinkedListManager.clear_cache()
+
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
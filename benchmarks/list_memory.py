@@ -0,0 +1,66 @@
+"""
+Compara la memoria ocupada por las implementaciones de la lista en memoria
+
+Mide con tracemalloc solo la estructura (nodos, enlaces e índice); los
+vuelos se crean antes de empezar a medir y se comparten entre listas.
+Se muestra el total y, entre paréntesis, los bytes por vuelo sin contar
+el índice hash id/código, que es común a todas las implementaciones.
+
+Uso:
+    python benchmarks/list_memory.py [n1 n2 ...]
+"""
+import os
+import sys
+import tracemalloc
+from typing import Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.domain.memory_linked_list import MemoryLinkedList
+from app.domain.indexed_linked_list import IndexedLinkedList
+from app.domain.compact_linked_list import CompactLinkedList
+
+IMPLEMENTATIONS = (MemoryLinkedList, IndexedLinkedList, CompactLinkedList)
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+
+
+class _Flight:
+    """Vuelo mínimo: solo las claves que indexa la lista"""
+    __slots__ = ("id", "codigo")
+
+    def __init__(self, flight_id: int):
+        self.id = flight_id
+        self.codigo = f"VU{flight_id}"
+
+
+def measure(list_class, flights) -> Tuple[int, int]:
+    """Bytes asignados al construir una lista con todos los vuelos, y los del índice"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    memory_list = list_class()
+    for flight in flights:
+        memory_list.add_last(flight)
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    index_bytes = sys.getsizeof(memory_list._index)
+    del memory_list
+    return used, index_bytes
+
+
+def main() -> None:
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    header = f"{'entradas':>10} | " + " | ".join(f"{cls.__name__:>26}" for cls in IMPLEMENTATIONS)
+    print(header)
+    print("-" * len(header))
+
+    for size in sizes:
+        flights = [_Flight(i) for i in range(size)]
+        cells = []
+        for list_class in IMPLEMENTATIONS:
+            used, index_bytes = measure(list_class, flights)
+            cells.append(f"{used / 2**20:7.1f} MiB ({(used - index_bytes) / size:5.1f} B/v)")
+        print(f"{size:>10} | " + " | ".join(f"{cell:>26}" for cell in cells))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+"""
+Comprueba con EXPLAIN QUERY PLAN que las consultas frecuentes usan índices
+
+Atajo para ejecutar tests/test_query_plans.py, donde están las consultas
+(HOT_QUERIES) y la comprobación: termina con código distinto de 0 si alguna
+recorre una tabla entera (SCAN).
+
+Uso:
+    python benchmarks/query_plans.py
+"""
+import os
+import sys
+
+import pytest
+
+TESTS = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "tests", "test_query_plans.py"))
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main(["-v", TESTS]))
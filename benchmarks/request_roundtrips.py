@@ -0,0 +1,106 @@
+"""
+Cuenta las sentencias SQL y los commits de una petición típica
+con y sin unidad de trabajo
+
+Simula N peticiones "crear vuelo y añadirlo a la lista" y N cambios de
+estado sobre una BD SQLite temporal, y muestra la media por petición.
+Cada commit en SQLite implica al menos un fsync.
+
+Uso:
+    python benchmarks/request_roundtrips.py [n]
+"""
+import os
+import sys
+import tempfile
+from contextlib import nullcontext, redirect_stdout
+from typing import List, Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Base, ListaVuelos, EstadoVuelo
+from app.repositories.unit_of_work import unit_of_work
+from app.services import flight_service
+from app.services.linked_list_manager import LinkedListManager
+from app import schemas
+
+DEFAULT_N = 200
+
+
+class Counter:
+    """Cuenta sentencias y commits emitidos por un engine"""
+    def __init__(self, engine):
+        self.statements = 0
+        self.commits = 0
+        event.listen(engine, "before_cursor_execute", self._on_statement)
+        event.listen(engine, "commit", self._on_commit)
+
+    def _on_statement(self, *args) -> None:
+        self.statements += 1
+
+    def _on_commit(self, *args) -> None:
+        self.commits += 1
+
+    def reset(self) -> None:
+        self.statements = 0
+        self.commits = 0
+
+
+def run(n: int, deferred: bool) -> List[Tuple[str, float, float]]:
+    """Sentencias y commits medios por petición de cada escenario"""
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+    LinkedListManager.clear_cache()
+
+    with Session() as db:
+        lista = ListaVuelos(nombre="Benchmark")
+        db.add(lista)
+        db.commit()
+        lista_id = lista.id
+
+    counter = Counter(engine)
+    results = []
+
+    # Crear y encolar: como POST /api/vuelos
+    ids = []
+    counter.reset()
+    for i in range(n):
+        db = Session()
+        with unit_of_work(db) if deferred else nullcontext():
+            vuelo = flight_service.create_flight(db, schemas.VueloCreate(codigo=f"BM{i}", origen="A", destino="B"))
+            flight_service.add_flight_to_list(db, vuelo, lista_id)
+            db.commit()
+        ids.append(vuelo.id)
+        db.close()
+    results.append(("crear y encolar", counter.statements / n, counter.commits / n))
+
+    # Cambio de estado
+    counter.reset()
+    for flight_id in ids:
+        db = Session()
+        with unit_of_work(db) if deferred else nullcontext():
+            flight_service.update_flight_status(db, flight_id, EstadoVuelo.EMBARQUE)
+        db.close()
+    results.append(("cambio de estado", counter.statements / n, counter.commits / n))
+
+    engine.dispose()
+    return results
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_N
+    for deferred in (False, True):
+        label = "unidad de trabajo" if deferred else "commit por método"
+        # Sin la salida de depuración de LinkedListManager
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            results = run(n, deferred)
+        for scenario, statements, commits in results:
+            print(f"{label:>18} | {scenario:<16} | {statements:5.1f} sentencias | {commits:4.1f} commits")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Compara los perfiles de motor de SQLite (app/db/config.py PROFILES)
+
+Para cada perfil crea una BD SQLite temporal con n vuelos y mide:
+- commits por segundo de transacciones pequeñas (un cambio de estado cada una)
+- lecturas por segundo y latencia máxima de READERS hilos que paginan
+  vuelos mientras otro hilo confirma cambios sin parar durante SECONDS segundos
+
+Además del perfil default y throughput mide los ajustes del entorno
+(DB_PROFILE y variables SQLITE_*/DB_*) si son distintos de ambos.
+
+Uso:
+    python benchmarks/sqlite_profiles.py [n]
+"""
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import insert, update
+from sqlalchemy.orm import sessionmaker
+
+from app.db.config import PROFILES, load_settings, make_engine
+from app.models import Base, ListaVuelos, Vuelo, EstadoVuelo
+from app.repositories.flight_repository import FlightRepository
+from app.services.linked_list_manager import POSITION_GAP
+
+DEFAULT_N = 10_000
+COMMITS = 500
+READERS = 4
+SECONDS = 3.0
+
+
+def seed(Session, n: int) -> None:
+    statuses = list(EstadoVuelo)
+    with Session() as db:
+        db.add(ListaVuelos(nombre="Benchmark"))
+        db.commit()
+        db.execute(insert(Vuelo), [
+            {"codigo": f"B{i}", "origen": "Madrid", "destino": "Barcelona",
+             "estado": statuses[i % len(statuses)], "lista_vuelos_id": 1,
+             "orden": i * POSITION_GAP}
+            for i in range(n)
+        ])
+        db.commit()
+
+
+def change_status(db, flight_id: int) -> None:
+    """Una transacción pequeña: como PATCH de estado de un vuelo"""
+    estado = EstadoVuelo.EMBARQUE if flight_id % 2 else EstadoVuelo.PROGRAMADO
+    db.execute(update(Vuelo).where(Vuelo.id == flight_id).values(estado=estado))
+    db.commit()
+
+
+def commits_per_second(Session, n: int) -> float:
+    with Session() as db:
+        start = time.perf_counter()
+        for i in range(COMMITS):
+            change_status(db, 1 + i % n)
+        return COMMITS / (time.perf_counter() - start)
+
+
+def reads_under_writes(Session, n: int) -> Tuple[float, float, int, int]:
+    """Lecturas por segundo, latencia máxima (ms), commits y errores durante SECONDS segundos"""
+    stop = threading.Event()
+    reads, errors, latencies, commits = [0], [0], [0.0], [0]
+    lock = threading.Lock()
+
+    def writer():
+        with Session() as db:
+            i = 0
+            while not stop.is_set():
+                try:
+                    change_status(db, 1 + i % n)
+                    commits[0] += 1
+                except Exception:
+                    db.rollback()
+                    with lock:
+                        errors[0] += 1
+                i += 1
+
+    def reader(seed_value: int):
+        rng = random.Random(seed_value)
+        while not stop.is_set():
+            start = time.perf_counter()
+            try:
+                with Session() as db:
+                    FlightRepository(db).get_page_after(rng.randrange(n), 100)
+            except Exception:
+                with lock:
+                    errors[0] += 1
+                continue
+            elapsed = time.perf_counter() - start
+            with lock:
+                reads[0] += 1
+                latencies[0] = max(latencies[0], elapsed)
+
+    threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader, args=(i,)) for i in range(READERS)]
+    for thread in threads:
+        thread.start()
+    time.sleep(SECONDS)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return reads[0] / SECONDS, latencies[0] * 1000, commits[0], errors[0]
+
+
+def run(name: str, settings: Dict[str, Any], n: int) -> None:
+    engine = make_engine(f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}", settings)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+    seed(Session, n)
+
+    rate = commits_per_second(Session, n)
+    reads, max_latency, commits, errors = reads_under_writes(Session, n)
+    engine.dispose()
+    print(f"{name:>10} | {rate:8.0f} commits/s | con escritor: {reads:8.0f} lecturas/s, "
+          f"máx {max_latency:7.1f} ms, {commits / SECONDS:6.0f} commits/s, {errors} errores")
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_N
+    print(f"{n} vuelos, {COMMITS} commits, {READERS} lectores y un escritor durante {SECONDS:.0f} s")
+    for name, settings in PROFILES.items():
+        run(name, settings, n)
+    settings = load_settings()
+    if settings not in PROFILES.values():
+        run("entorno", settings, n)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Importa vuelos desde un fichero CSV o JSONL a una lista
+
+Uso:
+    python import_flights.py vuelos.csv [--lista 1] [--dry-run]
+
+Las filas inválidas (esquema, estado desconocido o código repetido) se
+informan y se omiten; las válidas se insertan en una única transacción.
+El servidor en marcha detecta el cambio por la versión de la lista.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from app.db import SessionLocal, create_tables
+from app.services.flight_importer import import_flights
+
+# Errores que se muestran como máximo
+MAX_ERRORS_SHOWN = 20
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Importa vuelos desde un fichero CSV o JSONL")
+    parser.add_argument("archivo", help="fichero .csv o .jsonl con los vuelos")
+    parser.add_argument("--lista", type=int, default=1, help="ID de la lista destino (por defecto: 1)")
+    parser.add_argument("--dry-run", action="store_true", help="solo validar, sin insertar")
+    args = parser.parse_args()
+
+    create_tables()
+    with SessionLocal() as db:
+        try:
+            resumen = import_flights(db, args.archivo, args.lista, dry_run=args.dry_run)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 2
+
+    for fila, motivo in resumen["errores"][:MAX_ERRORS_SHOWN]:
+        print(f"Fila {fila}: {motivo}", file=sys.stderr)
+    if len(resumen["errores"]) > MAX_ERRORS_SHOWN:
+        print(f"... y {len(resumen['errores']) - MAX_ERRORS_SHOWN} errores más", file=sys.stderr)
+
+    accion = "validadas" if args.dry_run else f"{resumen['insertados']} vuelos insertados"
+    print(f"{resumen['filas']} filas, {accion}, {len(resumen['errores'])} con errores "
+          f"en {resumen['segundos']:.2f} s ({resumen['filas_por_segundo']:.0f} filas/s)")
+    return 1 if resumen["errores"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,10 +8,18 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api import router
 from app.db import create_tables, get_db, SessionLocal
+from app.db.config import async_engine
 from app.models import ListaVuelos, Vuelo
-from app.services import flight_service, linked_list
+from app.repositories.flight_repository import FlightRepository
 from app.services.linked_list_manager import LinkedListManager
 
+# Diario de operaciones de las listas: permite recuperarlas al reiniciar sin
+# cargar todos los vuelos. Desactivado salvo que se indique LIST_JOURNAL_DIR:
+# admite un único proceso escritor por directorio (no sirve con varios workers)
+JOURNAL_DIR = os.environ.get("LIST_JOURNAL_DIR", "").strip() or None
+# Segundos que los paneles de salidas pueden leer una lista en memoria sin tocar la BD
+READ_STALENESS = 1.0
+
 app = FastAPI(
     title="Sistema de Gestión de Aeropuerto",
     description="API para gestionar vuelos utilizando una lista doblemente enlazada",
@@ -41,6 +49,10 @@ def init_db():
     db = SessionLocal()
     
     try:
+        if JOURNAL_DIR:
+            LinkedListManager.enable_journal(JOURNAL_DIR)
+        LinkedListManager.read_staleness = READ_STALENESS
+        
         # Verificar si ya hay datos
         if db.query(Vuelo).count() == 0:
             # Crear una lista de vuelos
@@ -74,24 +86,32 @@ def init_db():
             db.commit()
             print("Base de datos inicializada con datos de ejemplo")
         
+        # Recuperar las listas del diario (instantánea + operaciones); las que
+        # no estén al día con la BD se cargan desde ella
+        recuperadas = LinkedListManager.recover_from_journal(db)
+        if recuperadas:
+            print(f"{recuperadas} listas recuperadas del diario")
+        
         # Siempre sincronizar las listas al inicio
         listas = db.query(ListaVuelos).all()
         for lista in listas:
             # Asegurarse de que todos los vuelos estén relacionados con la lista
-            vuelos_sin_lista = db.query(Vuelo).filter(Vuelo.lista_vuelos_id == None).all()
+            vuelos_sin_lista = FlightRepository(db).get_unassigned()
             for vuelo in vuelos_sin_lista:
                 vuelo.lista_vuelos_id = lista.id
             db.commit()
             
-            # Forzar la reconstrucción del caché
-            LinkedListManager.clear_cache(lista.id)
+            if vuelos_sin_lista:
+                # La lista ha cambiado: forzar la reconstrucción del caché
+                LinkedListManager.clear_cache(lista.id)
+                LinkedListManager.mark_changed(db, lista.id)
             lista_en_memoria = LinkedListManager.get_list_instance(db, lista.id)
             
             # Verificar que todos los vuelos estén en la lista
-            vuelos_en_lista = linked_list.get_all_flights(lista)
-            vuelos_en_db = db.query(Vuelo).filter(Vuelo.lista_vuelos_id == lista.id).all()
+            vuelos_en_lista = lista_en_memoria.size()
+            vuelos_en_db = db.query(Vuelo).filter(Vuelo.lista_vuelos_id == lista.id).count()
             
-            print(f"Lista {lista.id} sincronizada: {len(vuelos_en_lista)} vuelos en lista, {len(vuelos_en_db)} vuelos en DB")
+            print(f"Lista {lista.id} sincronizada: {vuelos_en_lista} vuelos en lista, {vuelos_en_db} vuelos en DB")
         
     except Exception as e:
         db.rollback()
@@ -99,6 +119,16 @@ def init_db():
     finally:
         db.close()
 
+@app.on_event("shutdown")
+def save_snapshots():
+    """Guarda una instantánea de las listas en memoria para el siguiente arranque"""
+    LinkedListManager.snapshot_all()
+
+@app.on_event("shutdown")
+async def dispose_async_engine():
+    """Cierra las conexiones del pool asíncrono (cada una tiene su hilo de aiosqlite)"""
+    await async_engine.dispose()
+
 @app.get("/")
 def read_root():
     """
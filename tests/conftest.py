@@ -0,0 +1,57 @@
+"""
+Fixtures compartidas: una BD SQLite temporal por prueba y una lista de vuelos en ella
+
+LinkedListManager guarda las listas en memoria a nivel de clase, así que
+cada prueba empieza y termina con su caché vacía.
+"""
+import os
+from typing import Iterator, List
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.domain.priority_lane_list import LANES, lane_for
+from app.models import Base, ListaVuelos, Vuelo
+from app.repositories.unit_of_work import unit_of_work
+from app.services.linked_list_manager import LinkedListManager
+
+
+@pytest.fixture
+def db(tmp_path) -> Iterator[Session]:
+    engine = create_engine(f"sqlite:///{os.path.join(tmp_path, 'airport.db')}",
+                           connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    # Mismas opciones que SessionLocal
+    SessionTest = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+    LinkedListManager.clear_cache()
+    with SessionTest() as session:
+        yield session
+    LinkedListManager.clear_cache()
+    engine.dispose()
+
+
+def make_list(db: Session, estados: List[str], nombre: str = "Salidas") -> int:
+    """Crea una lista con un vuelo por estado, añadidos al final en ese orden; devuelve su ID"""
+    with unit_of_work(db):
+        lista = ListaVuelos(nombre=nombre)
+        db.add(lista)
+        db.flush()
+        for index, estado in enumerate(estados):
+            vuelo = Vuelo(codigo=f"{nombre[:2].upper()}{index}", origen="Madrid", destino="Barcelona", estado=estado)
+            db.add(vuelo)
+            db.flush()
+            LinkedListManager.add_last(db, lista.id, vuelo)
+    return lista.id
+
+
+def list_codes(db: Session, lista_id: int) -> List[str]:
+    """Códigos de la lista en memoria, en orden"""
+    return [vuelo.codigo for vuelo in LinkedListManager.get_all(db, lista_id)]
+
+
+def db_codes(db: Session, lista_id: int) -> List[str]:
+    """Códigos de los vuelos de la lista en la BD, por carril y clave de orden (como la carga _load_list)"""
+    vuelos = db.query(Vuelo).filter(Vuelo.lista_vuelos_id == lista_id).all()
+    vuelos.sort(key=lambda vuelo: (LANES.index(lane_for(vuelo)), vuelo.orden))
+    return [vuelo.codigo for vuelo in vuelos]
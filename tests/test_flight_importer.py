@@ -0,0 +1,13 @@
+from app.services.flight_importer import read_rows
+
+
+def test_csv_empty_cells_are_omitted(tmp_path):
+    path = tmp_path / "vuelos.csv"
+    path.write_text("codigo,origen,destino,hora,aerolinea,puerta_embarque,estado\n"
+                    "CSV1,Madrid, Roma ,,,,\n"
+                    "CSV2,Madrid,Roma\n", encoding="utf-8")
+
+    assert list(read_rows(str(path))) == [
+        {"codigo": "CSV1", "origen": "Madrid", "destino": "Roma"},
+        {"codigo": "CSV2", "origen": "Madrid", "destino": "Roma"},
+    ]
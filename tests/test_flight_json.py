@@ -0,0 +1,19 @@
+import json
+from datetime import datetime
+
+from app.domain.flight_record import FlightRecord
+from app.models import EstadoVuelo
+from app.services.flight_json import encode, flight_payload
+from app.services.async_flight_service import _flight_json_line
+
+
+def test_export_line_and_event_payload_match():
+    record = FlightRecord(7, "IB1", "Madrid", "Roma", datetime(2024, 5, 1, 10, 30), "Iberia", "B2",
+                          EstadoVuelo.EMBARQUE, 1, 3.0)
+    values = {field: getattr(record, field) for field in FlightRecord.__slots__}
+
+    line = json.loads(_flight_json_line(values))
+    assert line == json.loads(encode(flight_payload(record)))
+    assert line["estado"] == "embarque"
+    assert line["hora"] == "2024-05-01T10:30:00"
+    assert "orden" not in line
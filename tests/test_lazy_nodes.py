@@ -0,0 +1,62 @@
+"""
+Listas con nodos por ID (LinkedListManager.use_lazy_nodes): los nodos solo
+guardan ID, estado y clave de orden, el índice es solo por ID y los datos
+(código incluido) se cargan de la BD al leerlos
+"""
+import pytest
+
+from app.domain.flight_ref import FlightRef
+from app.models import EstadoVuelo, Vuelo
+from app.repositories.unit_of_work import unit_of_work
+from app.services import flight_service
+from app.services.linked_list_manager import LinkedListManager
+
+from conftest import db_codes, list_codes, make_list
+from test_list_implementations import IMPLEMENTATIONS
+
+
+@pytest.fixture(params=IMPLEMENTATIONS, ids=lambda c: c.__name__)
+def lazy(request):
+    previous = LinkedListManager.list_class
+    LinkedListManager.use_list_implementation(request.param)
+    LinkedListManager.use_lazy_nodes(True)
+    yield
+    LinkedListManager.use_lazy_nodes(False)
+    LinkedListManager.use_list_implementation(previous)
+
+
+def test_nodes_are_indexed_by_id_only(db, lazy):
+    lista_id = make_list(db, ["programado", "emergencia", "embarque"])
+    LinkedListManager.clear_cache(lista_id)
+    memory_list = LinkedListManager.get_list_instance(db, lista_id)
+
+    entries = memory_list.get_all()
+    assert all(type(entry) is FlightRef for entry in entries)
+    assert not hasattr(entries[0], "codigo")
+    vuelo = flight_service.get_flight_by_code(db, "SA0")
+    assert memory_list.contains(vuelo.id)
+    assert not memory_list.contains("SA0")
+
+
+def test_reads_load_codes_from_the_db(db, lazy):
+    lista_id = make_list(db, ["programado", "emergencia", "embarque", "programado"])
+
+    assert list_codes(db, lista_id) == ["SA1", "SA2", "SA0", "SA3"]
+    assert [vuelo.codigo for vuelo in LinkedListManager.get_range(db, lista_id, 1, 2)] == ["SA2", "SA0"]
+    representation, flights = LinkedListManager.visualize(db, lista_id)
+    assert "[SA1: EMERGENCIA]" in representation
+    assert [vuelo.codigo for vuelo in flights] == ["SA1", "SA2", "SA0", "SA3"]
+
+
+def test_writes_keep_memory_and_db_in_sync(db, lazy):
+    lista_id = make_list(db, ["programado", "programado", "embarque", "programado"])
+    vuelo = db.query(Vuelo).filter(Vuelo.codigo == "SA1").one()
+
+    with unit_of_work(db):
+        flight_service.update_flight_status(db, vuelo.id, EstadoVuelo.EMERGENCIA)
+        assert flight_service.move_flight(db, lista_id, 3, 2).codigo == "SA3"
+
+    codes = list_codes(db, lista_id)
+    assert codes == ["SA1", "SA2", "SA3", "SA0"]
+    db.expire_all()
+    assert db_codes(db, lista_id) == codes
@@ -0,0 +1,51 @@
+from app.services import list_changes
+from app.services.list_changes import ChangeLog
+from app.services.list_feed import RELOAD
+
+
+def event(seq, tipo="movido"):
+    return {"seq": seq, "tipo": tipo}
+
+
+def test_since_returns_changes_after_seq():
+    log = ChangeLog(size=3)
+    log.track(1, 0)
+    for seq in range(1, 6):
+        log.append(1, seq, event(seq))
+
+    assert [e["seq"] for e in log.since(1, 2, 5)] == [3, 4, 5]
+    assert log.since(1, 5, 5) == []
+    # 1 y 2 ya salieron del buffer, y 6 es posterior a la secuencia actual
+    assert log.since(1, 1, 5) is None
+    assert log.since(1, 6, 5) is None
+    assert log.since(2, 0, 0) is None
+
+
+def test_reload_requires_resync():
+    log = ChangeLog()
+    log.track(1, 0)
+    log.append(1, 1, event(1))
+    log.append(1, 2, event(2, RELOAD))
+    log.append(1, 3, event(3))
+
+    assert log.since(1, 0, 3) is None
+    assert [e["seq"] for e in log.since(1, 2, 3)] == [3]
+
+
+def test_tracking_expires_without_polls(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(list_changes.time, "monotonic", lambda: now[0])
+    log = ChangeLog(ttl=60)
+    log.track(1, 0)
+
+    now[0] += 59
+    assert log.is_tracked(1)
+    assert log.since(1, 0, 0) == []
+
+    now[0] += 59
+    assert log.is_tracked(1)
+
+    now[0] += 61
+    assert not log.is_tracked(1)
+    log.append(1, 1, event(1))
+    assert log.since(1, 0, 1) is None
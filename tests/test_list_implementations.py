@@ -0,0 +1,165 @@
+"""
+Las implementaciones de la lista en memoria (seleccionables con
+LinkedListManager.use_list_implementation) exponen la misma API y, con
+secuencias aleatorias de operaciones, se comportan como una lista de Python
+"""
+import random
+
+import pytest
+
+from app.domain.compact_linked_list import CompactLinkedList
+from app.domain.flight_record import FlightRecord
+from app.domain.indexed_linked_list import IndexedLinkedList
+from app.domain.memory_linked_list import MemoryLinkedList
+from app.domain.priority_lane_list import PriorityLaneList
+from app.models import EstadoVuelo
+
+IMPLEMENTATIONS = (MemoryLinkedList, IndexedLinkedList, CompactLinkedList)
+
+
+def record(flight_id: int, estado: EstadoVuelo = EstadoVuelo.PROGRAMADO) -> FlightRecord:
+    return FlightRecord(flight_id, f"V{flight_id}", "Madrid", "Barcelona", None, None, None,
+                        estado, 1, None)
+
+
+def ids(records):
+    return [r.id for r in records]
+
+
+@pytest.mark.parametrize("list_class", IMPLEMENTATIONS[1:], ids=lambda c: c.__name__)
+def test_exposes_memory_linked_list_api(list_class):
+    public = {name for name in dir(MemoryLinkedList) if not name.startswith("_")}
+    missing = sorted(name for name in public if not hasattr(list_class, name))
+    assert not missing
+
+
+@pytest.mark.parametrize("list_class", IMPLEMENTATIONS, ids=lambda c: c.__name__)
+def test_walk(list_class):
+    memory_list = list_class()
+    for flight_id in range(1, 6):
+        memory_list.add_last(record(flight_id))
+
+    assert ids(memory_list.walk(None, 2)) == [1, 2]
+    assert ids(memory_list.walk(None, 2, forward=False)) == [5, 4]
+    assert ids(memory_list.walk(3, 10)) == [3, 4, 5]
+    assert ids(memory_list.walk(3, 2, forward=False)) == [3, 2]
+    assert memory_list.walk(99, 2) == []
+    assert memory_list.walk(None, 0) == []
+
+    memory_list.remove(4)
+    assert ids(memory_list.walk(3, 2)) == [3, 5]
+
+
+@pytest.mark.parametrize("list_class", IMPLEMENTATIONS, ids=lambda c: c.__name__)
+def test_lane_list_walk_crosses_lanes(list_class):
+    lanes = PriorityLaneList(list_class)
+    for flight_id in range(10):
+        lanes.add_last(record(flight_id, (EstadoVuelo.PROGRAMADO, EstadoVuelo.EMBARQUE)[flight_id % 2]))
+    order = ids(lanes.get_all())
+
+    assert ids(lanes.walk(None, 10)) == order
+    assert ids(lanes.walk(None, 10, forward=False)) == order[::-1]
+    assert ids(lanes.walk(order[3], 4)) == order[3:7]
+    assert ids(lanes.walk(order[6], 4, forward=False)) == order[3:7][::-1]
+
+
+def check_treap(memory_list: IndexedLinkedList) -> None:
+    """El árbol de IndexedLinkedList: tamaños, padres, prioridades y recorrido en orden igual a la lista"""
+    in_order = []
+
+    def visit(node, parent):
+        if node is None:
+            return 0
+        assert node.parent is parent
+        for child in (node.left, node.right):
+            assert child is None or child.priority <= node.priority
+        count = visit(node.left, node) + 1
+        in_order.append(node.data.id)
+        count += visit(node.right, node)
+        assert node.count == count
+        return count
+
+    assert visit(memory_list._root, None) == memory_list.size()
+    assert in_order == ids(memory_list.get_all())
+
+
+def check_against(memory_list, expected) -> None:
+    """Compara una lista con su modelo (una lista de Python de IDs) por todos sus accesos"""
+    assert memory_list.size() == len(expected)
+    assert ids(memory_list.get_all()) == expected
+    assert ids(memory_list.walk(None, len(expected) + 1, forward=False)) == expected[::-1]
+    assert [memory_list.get_at(position).id for position in range(len(expected))] == expected
+    assert memory_list.get_at(len(expected)) is None
+    for position, flight_id in enumerate(expected):
+        assert memory_list.position_of(flight_id) == position
+        assert memory_list.position_of(f"V{flight_id}") == position
+        previous, following = memory_list.neighbors(flight_id)
+        assert (previous.id if previous else None) == (expected[position - 1] if position else None)
+        assert (following.id if following else None) == (expected[position + 1] if position + 1 < len(expected) else None)
+    if expected:
+        assert (memory_list.get_first().id, memory_list.get_last().id) == (expected[0], expected[-1])
+    if isinstance(memory_list, IndexedLinkedList):
+        check_treap(memory_list)
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("list_class", IMPLEMENTATIONS, ids=lambda c: c.__name__)
+def test_random_operations_match_python_list(list_class, seed):
+    rng = random.Random(seed)
+    memory_list = list_class()
+    expected = []
+    next_id = 1
+
+    for _ in range(400):
+        size = len(expected)
+        op = rng.choice(("add_first", "add_last", "insert_at", "remove_first", "remove_last",
+                         "remove_at", "remove", "move", "move_before", "replace"))
+        if op in ("add_first", "add_last", "insert_at"):
+            flight_id, next_id = next_id, next_id + 1
+            if op == "add_first":
+                memory_list.add_first(record(flight_id))
+                expected.insert(0, flight_id)
+            elif op == "add_last":
+                memory_list.add_last(record(flight_id))
+                expected.append(flight_id)
+            else:
+                # Fuera de la lista se acota al principio o al final
+                position = rng.randint(-2, size + 2)
+                memory_list.insert_at(position, record(flight_id))
+                expected.insert(min(max(position, 0), size), flight_id)
+        elif not expected:
+            assert memory_list.remove_first() is None and memory_list.remove_last() is None
+            continue
+        elif op == "remove_first":
+            assert memory_list.remove_first().id == expected.pop(0)
+        elif op == "remove_last":
+            assert memory_list.remove_last().id == expected.pop()
+        elif op == "remove_at":
+            position = rng.randrange(size)
+            assert memory_list.remove_at(position).id == expected.pop(position)
+        elif op == "remove":
+            flight_id = rng.choice(expected)
+            key = flight_id if rng.random() < 0.5 else f"V{flight_id}"
+            assert memory_list.remove(key).id == flight_id
+            expected.remove(flight_id)
+            assert not memory_list.contains(flight_id) and not memory_list.contains(f"V{flight_id}")
+        elif op == "move":
+            from_pos, to_pos = rng.randrange(size), rng.randint(-2, size + 2)
+            flight_id = expected.pop(from_pos)
+            expected.insert(min(max(to_pos, 0), size - 1), flight_id)
+            assert memory_list.move(from_pos, to_pos).id == flight_id
+        elif op == "move_before":
+            flight_id = rng.choice(expected)
+            anchor = rng.choice(expected + [None])
+            assert memory_list.move_before(flight_id, anchor)
+            if anchor != flight_id:
+                expected.remove(flight_id)
+                expected.insert(expected.index(anchor) if anchor is not None else len(expected), flight_id)
+        else:
+            flight_id = rng.choice(expected)
+            assert memory_list.replace(flight_id, record(flight_id, EstadoVuelo.RETRASADO))
+            assert memory_list.find(f"V{flight_id}").estado == EstadoVuelo.RETRASADO
+        check_against(memory_list, expected)
+
+    assert memory_list.move_before(next_id, None) is False
+    assert memory_list.remove(next_id) is None
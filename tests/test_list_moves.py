@@ -0,0 +1,123 @@
+"""
+Movimientos de vuelos dentro de una lista (PATCH /mover y /reordenar):
+el nodo se reenlaza y solo cambia su clave de orden, que es el punto
+medio entre sus vecinos hasta que no queda hueco y se renumera el carril.
+El orden de las claves en la BD debe seguir al de la lista en memoria.
+"""
+import pytest
+
+from app.domain.priority_lane_list import lane_for
+from app.models import Vuelo
+from app.repositories.unit_of_work import unit_of_work
+from app.services import flight_service
+from app.services.linked_list_manager import LinkedListManager, POSITION_GAP
+
+from conftest import db_codes, list_codes, make_list
+from test_list_implementations import IMPLEMENTATIONS
+
+
+@pytest.fixture(params=IMPLEMENTATIONS, ids=lambda c: c.__name__)
+def list_class(request):
+    previous = LinkedListManager.list_class
+    LinkedListManager.use_list_implementation(request.param)
+    yield request.param
+    LinkedListManager.use_list_implementation(previous)
+
+
+@pytest.fixture
+def renumbered(monkeypatch):
+    """Carriles renumerados por _renumber_lane durante la prueba"""
+    lanes = []
+    renumber = LinkedListManager._renumber_lane
+
+    def spy(cls, db, lista_id, memory_list, lane):
+        lanes.append(lane)
+        renumber(db, lista_id, memory_list, lane)
+
+    monkeypatch.setattr(LinkedListManager, "_renumber_lane", classmethod(spy))
+    return lanes
+
+
+def ids_of(db, codes):
+    by_code = {vuelo.codigo: vuelo.id for vuelo in db.query(Vuelo).filter(Vuelo.codigo.in_(codes))}
+    return [by_code[code] for code in codes]
+
+
+def assert_orden_matches_list(db, lista_id):
+    """Claves de la BD estrictamente crecientes en cada carril y en el orden de la lista en memoria"""
+    codes = list_codes(db, lista_id)
+    db.expire_all()
+    assert db_codes(db, lista_id) == codes
+    vuelos = {vuelo.codigo: vuelo for vuelo in db.query(Vuelo).filter(Vuelo.lista_vuelos_id == lista_id)}
+    previous = {}
+    for code in codes:
+        vuelo = vuelos[code]
+        lane = lane_for(vuelo)
+        assert vuelo.orden is not None
+        assert previous.get(lane, float("-inf")) < vuelo.orden
+        previous[lane] = vuelo.orden
+    # La memoria guarda las mismas claves que la BD
+    for entry in LinkedListManager.get_all(db, lista_id):
+        assert entry.orden == vuelos[entry.codigo].orden
+
+
+def test_move_before_relinks_and_keeps_orden(db, list_class, renumbered):
+    lista_id = make_list(db, ["programado"] * 5)
+    a, b, c, d, e = ids_of(db, ["SA0", "SA1", "SA2", "SA3", "SA4"])
+
+    with unit_of_work(db):
+        assert flight_service.move_flight_before(db, lista_id, e, b).codigo == "SA4"
+        assert flight_service.move_flight_before(db, lista_id, a, None).codigo == "SA0"
+        assert flight_service.move_flight_before(db, lista_id, c, c).codigo == "SA2"
+
+    assert list_codes(db, lista_id) == ["SA4", "SA1", "SA2", "SA3", "SA0"]
+    assert LinkedListManager.position_of(db, lista_id, e) == 0
+    assert_orden_matches_list(db, lista_id)
+    # Con hueco entre vecinos no se renumera: SA4 queda en el punto medio
+    assert renumbered == []
+    vuelo = db.get(Vuelo, e)
+    assert vuelo.orden == POSITION_GAP / 2
+
+    with unit_of_work(db):
+        assert flight_service.move_flight_before(db, lista_id, 999, b) is None
+        assert flight_service.move_flight_before(db, lista_id, b, 999) is None
+    assert list_codes(db, lista_id) == ["SA4", "SA1", "SA2", "SA3", "SA0"]
+
+
+def test_exhausted_gap_renumbers_the_lane(db, list_class, renumbered):
+    lista_id = make_list(db, ["programado"] * 4)
+    last = ids_of(db, ["SA3"])[0]
+
+    # Cada vuelta lleva el segundo vuelo del carril justo antes del último:
+    # su clave es el punto medio con la del último y el hueco se reduce a la mitad
+    for _ in range(80):
+        moving = LinkedListManager.get_at(db, lista_id, 1).id
+        with unit_of_work(db):
+            flight_service.move_flight_before(db, lista_id, moving, last)
+        assert list_codes(db, lista_id)[-1] == "SA3"
+        if renumbered:
+            break
+
+    assert renumbered == ["programado"]
+    assert_orden_matches_list(db, lista_id)
+    db.expire_all()
+    ordenes = sorted(vuelo.orden for vuelo in db.query(Vuelo).filter(Vuelo.lista_vuelos_id == lista_id))
+    assert ordenes == [i * POSITION_GAP for i in range(4)]
+
+    # Tras renumerar, una lista cargada de nuevo desde la BD queda igual
+    codes = list_codes(db, lista_id)
+    LinkedListManager.clear_cache(lista_id)
+    assert list_codes(db, lista_id) == codes
+
+
+def test_reorder_by_position_keeps_orden(db, list_class):
+    lista_id = make_list(db, ["programado"] * 6 + ["embarque"] * 2)
+
+    with unit_of_work(db):
+        for from_pos, to_pos in [(7, 2), (2, 7), (3, 5), (5, 3), (2, 99), (4, -1)]:
+            assert flight_service.move_flight(db, lista_id, from_pos, to_pos) is not None
+
+    codes = list_codes(db, lista_id)
+    # Los embarques siguen delante de los programados
+    assert sorted(codes[:2]) == ["SA6", "SA7"]
+    assert_orden_matches_list(db, lista_id)
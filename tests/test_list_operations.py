@@ -0,0 +1,64 @@
+"""
+Lotes de operaciones de LinkedListManager.apply_operations: todos o ninguno
+"""
+import pytest
+
+from app.models import Vuelo
+from app.repositories.unit_of_work import unit_of_work
+from app.services import flight_service
+from app.services.linked_list_manager import BatchOperationError
+
+from conftest import db_codes, list_codes, make_list
+
+
+def apply(db, lista_id, operations):
+    """Aplica un lote como POST /listas/{id}/operaciones: en una unidad de trabajo"""
+    with unit_of_work(db):
+        return flight_service.apply_list_operations(db, lista_id, operations)
+
+
+@pytest.mark.parametrize("position", [3, 99, -1])
+def test_remove_at_out_of_range_fails_the_batch(db, position):
+    lista_id = make_list(db, ["programado", "programado", "programado"])
+    before = list_codes(db, lista_id)
+
+    with pytest.raises(BatchOperationError) as error:
+        apply(db, lista_id, [{"op": "remove_at", "position": 0},
+                             {"op": "remove_at", "position": position}])
+
+    assert error.value.index == 1
+    assert error.value.op == "remove_at"
+    # Ni la BD ni la lista en memoria conservan la primera operación
+    db.expire_all()
+    assert db_codes(db, lista_id) == before
+    assert list_codes(db, lista_id) == before
+
+
+def test_remove_at_last_position_is_applied(db):
+    lista_id = make_list(db, ["programado", "programado", "programado"])
+    before = list_codes(db, lista_id)
+
+    removed = apply(db, lista_id, [{"op": "remove_at", "position": 2}])
+
+    assert [vuelo.codigo for vuelo in removed] == before[2:]
+    assert db_codes(db, lista_id) == before[:2]
+    assert list_codes(db, lista_id) == before[:2]
+
+
+def test_failed_batch_rolls_back_added_flights(db):
+    lista_id = make_list(db, ["programado", "embarque"])
+    before = list_codes(db, lista_id)
+    with unit_of_work(db):
+        nuevo = Vuelo(codigo="NEW1", origen="Madrid", destino="Roma", estado="emergencia")
+        db.add(nuevo)
+    nuevo_id = nuevo.id
+
+    with pytest.raises(BatchOperationError):
+        apply(db, lista_id, [{"op": "add_first", "vuelo_id": nuevo_id},
+                             {"op": "remove_at", "position": 99}])
+
+    db.expire_all()
+    vuelo = db.get(Vuelo, nuevo_id)
+    assert vuelo.lista_vuelos_id is None and vuelo.orden is None
+    assert db_codes(db, lista_id) == before
+    assert list_codes(db, lista_id) == before
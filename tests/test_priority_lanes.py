@@ -0,0 +1,127 @@
+"""
+La lista por carriles queda siempre ordenada por prioridad: add_first,
+insert_at, move y los cambios de estado colocan el vuelo dentro del carril
+de su estado, en memoria (PriorityLaneList) y en la BD (LinkedListManager)
+"""
+import random
+
+import pytest
+
+from app.domain.priority_lane_list import LANES, PriorityLaneList, lane_for
+from app.models import EstadoVuelo, Vuelo
+from app.repositories.unit_of_work import unit_of_work
+from app.services import flight_service
+from app.services.linked_list_manager import LinkedListManager
+
+from conftest import db_codes, list_codes, make_list
+from test_list_implementations import IMPLEMENTATIONS, record
+
+
+def lane_ranks(flights):
+    return [LANES.index(lane_for(vuelo)) for vuelo in flights]
+
+
+def assert_lane_order(flights):
+    ranks = lane_ranks(flights)
+    assert ranks == sorted(ranks), [(vuelo.codigo, vuelo.estado.value) for vuelo in flights]
+
+
+@pytest.mark.parametrize("list_class", IMPLEMENTATIONS, ids=lambda c: c.__name__)
+def test_lane_list_keeps_lane_order(list_class):
+    rng = random.Random(7)
+    lanes = PriorityLaneList(list_class)
+    estados = list(EstadoVuelo)
+
+    for flight_id in range(300):
+        size = lanes.size()
+        op = rng.choice(("add_first", "add_last", "insert_at", "move", "move_before", "relocate"))
+        if op in ("add_first", "add_last", "insert_at") or size == 0:
+            vuelo = record(flight_id, rng.choice(estados))
+            if op == "add_first":
+                lanes.add_first(vuelo)
+                assert lanes.position_of(vuelo.id) == lanes._offset_of(lane_for(vuelo))
+            elif op == "insert_at":
+                lanes.insert_at(rng.randint(-1, size + 1), vuelo)
+            else:
+                lanes.add_last(vuelo)
+        elif op == "move":
+            lanes.move(rng.randrange(size), rng.randint(-1, size + 1))
+        elif op == "move_before":
+            flights = lanes.get_all()
+            anchor = rng.choice(flights + [None])
+            assert lanes.move_before(rng.choice(flights).id, anchor.id if anchor else None)
+        else:
+            vuelo = rng.choice(lanes.get_all())
+            lanes.relocate(record(vuelo.id, rng.choice(estados)))
+        assert_lane_order(lanes.get_all())
+
+
+@pytest.fixture
+def lista_id(db):
+    # Orden inicial: la emergencia, luego el embarque y los programados
+    return make_list(db, ["programado", "emergencia", "programado", "embarque"])
+
+
+def assert_list_consistent(db, lista_id):
+    """Lista en memoria ordenada por carriles e igual al orden guardado en la BD"""
+    assert_lane_order(LinkedListManager.get_all(db, lista_id))
+    db.expire_all()
+    codes = list_codes(db, lista_id)
+    assert codes == db_codes(db, lista_id)
+    # Una lista cargada de nuevo desde la BD queda igual
+    LinkedListManager.clear_cache(lista_id)
+    assert list_codes(db, lista_id) == codes
+
+
+def new_flight(db, codigo: str, estado: str) -> Vuelo:
+    with unit_of_work(db):
+        vuelo = Vuelo(codigo=codigo, origen="Madrid", destino="Roma", estado=estado)
+        db.add(vuelo)
+    return vuelo
+
+
+def test_add_first_stays_in_its_lane(db, lista_id):
+    vuelo = new_flight(db, "NEW1", "programado")
+    with unit_of_work(db):
+        LinkedListManager.add_first(db, lista_id, vuelo)
+
+    # Detrás de la emergencia y el embarque, delante de los programados
+    assert list_codes(db, lista_id)[:3] == ["SA1", "SA3", "NEW1"]
+    assert_list_consistent(db, lista_id)
+
+
+def test_insert_at_is_bounded_to_its_lane(db, lista_id):
+    emergencia = new_flight(db, "NEW1", "emergencia")
+    programado = new_flight(db, "NEW2", "programado")
+    with unit_of_work(db):
+        LinkedListManager.insert_at(db, lista_id, emergencia, 3)
+        LinkedListManager.insert_at(db, lista_id, programado, 0)
+
+    assert list_codes(db, lista_id) == ["SA1", "NEW1", "SA3", "NEW2", "SA0", "SA2"]
+    assert_list_consistent(db, lista_id)
+
+
+def test_move_is_bounded_to_its_lane(db, lista_id):
+    with unit_of_work(db):
+        # El último programado no puede pasar por delante del embarque
+        moved = LinkedListManager.move(db, lista_id, 3, 0)
+
+    assert moved.codigo == "SA2"
+    assert list_codes(db, lista_id) == ["SA1", "SA3", "SA2", "SA0"]
+    assert_list_consistent(db, lista_id)
+
+
+def test_status_change_moves_to_the_new_lane(db, lista_id):
+    vuelo = db.query(Vuelo).filter(Vuelo.codigo == "SA2").one()
+    with unit_of_work(db):
+        flight_service.update_flight_status(db, vuelo.id, EstadoVuelo.EMERGENCIA)
+
+    # Al final del carril de emergencias
+    assert list_codes(db, lista_id) == ["SA1", "SA2", "SA3", "SA0"]
+    assert_list_consistent(db, lista_id)
+
+    with unit_of_work(db):
+        flight_service.update_flight_status(db, vuelo.id, EstadoVuelo.CANCELADO)
+
+    assert list_codes(db, lista_id) == ["SA1", "SA3", "SA0", "SA2"]
+    assert_list_consistent(db, lista_id)
@@ -0,0 +1,93 @@
+"""
+Comprueba con EXPLAIN QUERY PLAN que las consultas frecuentes usan índices
+
+Crea una BD SQLite temporal con vuelos, ejecuta cada método de los
+repositorios de HOT_QUERIES capturando sus sentencias SQL y pide a SQLite
+el plan de cada una. Falla si alguna recorre una tabla entera (SCAN), así
+que detecta los cambios de modelos, índices o consultas que pierden un índice.
+"""
+import os
+from typing import Any, Callable, List, Tuple
+
+import pytest
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.models import Base, ListaVuelos, Vuelo, EstadoVuelo
+from app.repositories.flight_repository import FlightRepository
+from app.repositories.list_repository import ListRepository
+from app.services.linked_list_manager import POSITION_GAP
+
+# Vuelos de la BD de prueba: sin ANALYZE, SQLite elige el plan por los índices, no por el tamaño
+FLIGHTS = 1000
+
+# Consultas que se ejecutan en cada petición o en cada carga de una lista.
+# Quedan fuera las que recorren la tabla a propósito (get_all con OFFSET, la exportación completa)
+HOT_QUERIES: List[Tuple[str, Callable[[Session], Any]]] = [
+    ("FlightRepository.get_by_id", lambda db: FlightRepository(db).get_by_id(1)),
+    ("FlightRepository.get_by_code", lambda db: FlightRepository(db).get_by_code("B1")),
+    ("FlightRepository.get_page_after", lambda db: FlightRepository(db).get_page_after(500, 100)),
+    ("FlightRepository.get_unassigned", lambda db: FlightRepository(db).get_unassigned()),
+    ("FlightRepository.get_flights_by_list_id", lambda db: FlightRepository(db).get_flights_by_list_id(1)),
+    ("FlightRepository.get_flight_keys_by_list_id", lambda db: FlightRepository(db).get_flight_keys_by_list_id(1)),
+    ("FlightRepository.get_values_by_list_id", lambda db: FlightRepository(db).get_values_by_list_id(1)),
+    ("FlightRepository.get_values_by_ids", lambda db: FlightRepository(db).get_values_by_ids([1, 2, 3])),
+    ("FlightRepository.get_existing_codes", lambda db: FlightRepository(db).get_existing_codes(["B1", "B2"])),
+    ("FlightRepository.get_max_position",
+     lambda db: FlightRepository(db).get_max_position(1, [EstadoVuelo.PROGRAMADO, EstadoVuelo.RETRASADO])),
+    ("FlightRepository.get_flights_by_status",
+     lambda db: FlightRepository(db).get_flights_by_status(EstadoVuelo.EMERGENCIA)),
+    ("FlightRepository.update_positions", lambda db: FlightRepository(db).update_positions({1: 0.0})),
+    ("ListRepository.get_by_id", lambda db: ListRepository(db).get_by_id(1)),
+    ("ListRepository.get_version", lambda db: ListRepository(db).get_version(1)),
+    ("ListRepository.bump_version", lambda db: ListRepository(db).bump_version(1, expected=0)),
+]
+
+
+def capture(engine, db: Session, call: Callable[[Session], Any]) -> List[Tuple[str, Any]]:
+    """Ejecuta una llamada y devuelve las sentencias (SQL, parámetros) que emitió"""
+    statements: List[Tuple[str, Any]] = []
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters[0] if executemany else parameters))
+
+    event.listen(engine, "before_cursor_execute", on_execute)
+    try:
+        call(db)
+    finally:
+        event.remove(engine, "before_cursor_execute", on_execute)
+    return statements
+
+
+@pytest.fixture(scope="module")
+def engine(tmp_path_factory):
+    engine = create_engine(f"sqlite:///{os.path.join(tmp_path_factory.mktemp('plans'), 'plans.db')}")
+    Base.metadata.create_all(bind=engine)
+    statuses = list(EstadoVuelo)
+    with Session(engine) as db:
+        for nombre in ("Salidas", "Llegadas"):
+            db.add(ListaVuelos(nombre=nombre))
+        db.commit()
+        db.execute(insert(Vuelo), [
+            {"codigo": f"B{i}", "origen": "Madrid", "destino": "Barcelona",
+             "estado": statuses[i % len(statuses)],
+             "lista_vuelos_id": None if i % 10 == 0 else 1 + i % 2,
+             "orden": i * POSITION_GAP}
+            for i in range(FLIGHTS)
+        ])
+        db.commit()
+    yield engine
+    engine.dispose()
+
+
+@pytest.mark.parametrize("name, call", HOT_QUERIES, ids=[name for name, _ in HOT_QUERIES])
+def test_hot_query_uses_index(engine, name, call):
+    Session_ = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+    with Session_() as db, engine.connect() as conn:
+        statements = capture(engine, db, call)
+        db.rollback()
+        assert statements, f"{name} no ejecutó ninguna sentencia"
+        for statement, parameters in statements:
+            plan = [row[3] for row in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)]
+            scans = [detail for detail in plan if detail.startswith("SCAN")]
+            assert not scans, f"{name} recorre una tabla entera: {' | '.join(plan)}\n{' '.join(statement.split())}"
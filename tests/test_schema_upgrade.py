@@ -0,0 +1,116 @@
+"""
+Arranque de la aplicación sobre una BD creada por la primera versión
+
+Esa BD no tiene las columnas añadidas después (vuelos.orden,
+listas_vuelos.version): create_tables debe añadirlas antes de crear los
+índices que las usan, y los vuelos sin clave de orden deben cargarse en la
+lista. La aplicación se arranca en un proceso aparte porque el motor de la
+BD se crea al importar app.db con la DATABASE_URL del entorno.
+"""
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Esquema que creaba create_tables antes de las columnas orden y version
+BASELINE_SCHEMA = """
+CREATE TABLE listas_vuelos (
+    id INTEGER NOT NULL,
+    nombre VARCHAR(50),
+    PRIMARY KEY (id)
+);
+CREATE INDEX ix_listas_vuelos_id ON listas_vuelos (id);
+CREATE TABLE vuelos (
+    id INTEGER NOT NULL,
+    codigo VARCHAR(10),
+    origen VARCHAR(50),
+    destino VARCHAR(50),
+    hora DATETIME,
+    aerolinea VARCHAR(50),
+    puerta_embarque VARCHAR(10),
+    estado VARCHAR(10),
+    lista_vuelos_id INTEGER,
+    PRIMARY KEY (id),
+    FOREIGN KEY(lista_vuelos_id) REFERENCES listas_vuelos (id)
+);
+CREATE INDEX ix_vuelos_id ON vuelos (id);
+CREATE UNIQUE INDEX ix_vuelos_codigo ON vuelos (codigo);
+INSERT INTO listas_vuelos (id, nombre) VALUES (1, 'Vuelos programados');
+INSERT INTO vuelos (id, codigo, origen, destino, hora, estado, lista_vuelos_id) VALUES
+    (1, 'IB3456', 'Madrid', 'Barcelona', '2024-01-01 10:00:00', 'PROGRAMADO', 1),
+    (2, 'FR1234', 'París', 'Madrid', '2024-01-01 11:00:00', 'EMBARQUE', 1),
+    (3, 'BA7890', 'Londres', 'Madrid', '2024-01-01 12:00:00', 'EMERGENCIA', 1);
+"""
+
+# Solo crea las tablas, como import_flights.py antes de importar
+CREATE_TABLES_SCRIPT = """
+from app.db import create_tables
+create_tables()
+"""
+
+# Arranca la aplicación (eventos de startup incluidos), lee la lista, quita un vuelo y la vuelve a leer
+BOOT_SCRIPT = """
+import json
+from fastapi.testclient import TestClient
+import main
+
+with TestClient(main.app) as client:
+    before = client.get("/api/listas/1/vuelos")
+    removed = client.delete("/api/listas/1/vuelos/2")
+    after = client.get("/api/listas/1/vuelos")
+print(json.dumps({
+    "status": [before.status_code, removed.status_code, after.status_code],
+    "before": [vuelo["codigo"] for vuelo in before.json()["vuelos"]],
+    "after": [vuelo["codigo"] for vuelo in after.json()["vuelos"]],
+}))
+"""
+
+
+def run_on_baseline(tmp_path, script: str):
+    """Crea una BD con el esquema de la primera versión y ejecuta script contra ella"""
+    path = tmp_path / "airport.db"
+    with sqlite3.connect(path) as conn:
+        conn.executescript(BASELINE_SCHEMA)
+
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{path}", LIST_JOURNAL_DIR="")
+    result = subprocess.run([sys.executable, "-c", script], cwd=ROOT, env=env,
+                            capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    return path, result.stdout
+
+
+def test_create_tables_adds_missing_columns(tmp_path):
+    path, _ = run_on_baseline(tmp_path, CREATE_TABLES_SCRIPT)
+
+    with sqlite3.connect(path) as conn:
+        vuelos = {row[1] for row in conn.execute("PRAGMA table_info(vuelos)")}
+        indexes = {row[1] for row in conn.execute("PRAGMA index_list(vuelos)")}
+        ordenes = [row[0] for row in conn.execute("SELECT orden FROM vuelos")]
+        versiones = [row[0] for row in conn.execute("SELECT version FROM listas_vuelos")]
+    assert "orden" in vuelos
+    assert versiones == [0]
+    assert {"ix_vuelos_lista_orden", "ix_vuelos_lista_estado"} <= indexes
+    # Los vuelos existentes quedan sin clave de orden hasta que se carga su lista
+    assert ordenes == [None, None, None]
+
+
+def test_app_boots_on_baseline_database(tmp_path):
+    path, stdout = run_on_baseline(tmp_path, BOOT_SCRIPT)
+
+    report = json.loads(stdout.strip().splitlines()[-1])
+    assert report["status"] == [200, 200, 200]
+    assert sorted(report["before"]) == ["BA7890", "FR1234", "IB3456"]
+    assert report["after"] == [codigo for codigo in report["before"] if codigo != "FR1234"]
+
+    with sqlite3.connect(path) as conn:
+        listas = {row[1]: row for row in conn.execute("PRAGMA table_info(listas_vuelos)")}
+        version = conn.execute("SELECT version FROM listas_vuelos WHERE id = 1").fetchone()[0]
+        ordenes = [row[0] for row in conn.execute(
+            "SELECT orden FROM vuelos WHERE lista_vuelos_id = 1 ORDER BY orden")]
+    assert listas["version"][3] == 1  # NOT NULL
+    assert version > 0
+    # Al cargar la lista los vuelos heredados recibieron su clave de orden
+    assert None not in ordenes